@@ -6,6 +6,7 @@ from typing import Any
 
 from eb_sqs.auto_tasks.exceptions import RetryableTaskException
 from eb_sqs.decorators import task
+from eb_sqs.worker.rate_limits import register_task_limits
 from eb_sqs.worker.worker_exceptions import MaxRetriesReachedException
 
 logger = logging.getLogger(__name__)
@@ -68,14 +69,35 @@ def _auto_task_wrapper(module_name, class_name, func_name, *args, **kwargs):
                 )
 
 
+def _get_auto_task_limit_name(
+    module_name: str, class_name: str, func_name: str, *args: Any, **kwargs: Any
+) -> str:
+    return f"{module_name}.{class_name}.{func_name}"
+
+
+_auto_task_wrapper.get_limit_name = _get_auto_task_limit_name
+
+
 class AutoTaskService:
     def register_task(
-        self, method: Any, queue_name: str | None = None, max_retries: int | None = None
+        self,
+        method: Any,
+        queue_name: str | None = None,
+        max_retries: int | None = None,
+        rate_limit: str | None = None,
+        max_concurrency: int | None = None,
     ) -> None:
         instance = method.__self__
         class_ = instance.__class__
         func_name = method.__name__
 
+        if rate_limit or max_concurrency:
+            register_task_limits(
+                _get_auto_task_limit_name(class_.__module__, class_.__name__, func_name),
+                rate_limit,
+                max_concurrency,
+            )
+
         def _auto_task_wrapper_invoker(*args, **kwargs) -> None:
             if queue_name is not None:
                 kwargs["queue_name"] = queue_name
@@ -96,7 +118,12 @@ class _AutoTaskExecutorService(AutoTaskService):
         self._executor_func_name = ""
 
     def register_task(
-        self, method: Any, queue_name: str | None = None, max_retries: int | None = None
+        self,
+        method: Any,
+        queue_name: str | None = None,
+        max_retries: int | None = None,
+        rate_limit: str | None = None,
+        max_concurrency: int | None = None,
     ) -> None:
         if self._func_name == method.__name__:
             # circuit breaker to allow actually executing the method once
@@ -107,7 +134,9 @@ class _AutoTaskExecutorService(AutoTaskService):
                 instance, self._executor_func_name, getattr(instance, self._func_name)
             )
 
-        super().register_task(method, queue_name, max_retries)
+        super().register_task(
+            method, queue_name, max_retries, rate_limit, max_concurrency
+        )
 
     def get_executor_func_name(self) -> str:
         return self._executor_func_name
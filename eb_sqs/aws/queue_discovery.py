@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
+
+from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
+
+if TYPE_CHECKING:
+    from mypy_boto3_sqs.service_resource import Queue
+
+    from eb_sqs.worker.sharding import QueueSharder
+
+logger = logging.getLogger(__name__)
+
+
+class QueueDiscovery:
+    PREFIX_STR = "prefix:"
+
+    _REGISTRY_FILE_STR = "file:"
+    _REGISTRY_CACHE_STR = "cache:"
+    # deleted queues may still be listed for up to a minute
+    _REMOVED_QUEUE_TTL_S = 60
+
+    def __init__(
+        self,
+        queue_names: list,
+        connection: SqsConnection | None = None,
+        sharder: QueueSharder | None = None,
+    ) -> None:
+        self._connection = connection or SqsConnection.default()
+        self._sharder = sharder
+
+        prefixes = [qn for qn in queue_names if qn.startswith(self.PREFIX_STR)]
+        self._static_queue_names = list(set(queue_names) - set(prefixes))
+        self._queue_prefixes = [prefix[len(self.PREFIX_STR) :] for prefix in prefixes]
+
+        self._static_queues: list[Queue] | None = None
+        self._discovered_queues: dict[str, Queue] = {}
+        self._removed_queues: dict[str, float] = {}
+        self._last_refresh_time: float | None = None
+        self._registry_mtime: float | None = None
+
+        self._assigned_queues: list[Queue] = []
+        self._assigned_version: tuple[int, int] | None = None
+        self._version = 0
+        # refreshed by the worker loop while execution lanes read the queues
+        self._lock = threading.RLock()
+
+    @property
+    def static_queues(self) -> list[Queue]:
+        with self._lock:
+            if self._static_queues is None:
+                self._static_queues = [
+                    self._connection.get_queue(queue_name)
+                    for queue_name in self._static_queue_names
+                ]
+            return self._static_queues
+
+    @property
+    def queues(self) -> list[Queue]:
+        with self._lock:
+            return self.static_queues + self.assigned_queues
+
+    @property
+    def assigned_queues(self) -> list[Queue]:
+        with self._lock:
+            if self._sharder is None:
+                return list(self._discovered_queues.values())
+
+            version = (self._version, self._sharder.version)
+            if version != self._assigned_version:
+                self._assigned_queues = [
+                    queue
+                    for queue_url, queue in self._discovered_queues.items()
+                    if self._sharder.is_assigned(
+                        SqsConnection.get_queue_name(queue_url)
+                    )
+                ]
+                self._assigned_version = version
+
+            return self._assigned_queues
+
+    def refresh(self, force: bool = False) -> bool:
+        if not self._queue_prefixes or not (
+            force
+            or self._last_refresh_time is None
+            or monotonic() - self._last_refresh_time >= settings.REFRESH_PREFIX_QUEUES_S
+        ):
+            return False
+
+        self._last_refresh_time = monotonic()
+
+        try:
+            queue_urls = self._discover_queue_urls()
+        except Exception as exc:
+            logger.warning(
+                "[django-eb-sqs] Error discovering queues: %s", exc, exc_info=True
+            )
+            return False
+
+        if queue_urls is None:
+            return False
+
+        with self._lock:
+            self._removed_queues = {
+                queue_url: removed_time
+                for queue_url, removed_time in self._removed_queues.items()
+                if monotonic() - removed_time < self._REMOVED_QUEUE_TTL_S
+            }
+            queue_urls -= self._removed_queues.keys()
+
+            added = queue_urls - self._discovered_queues.keys()
+            removed = self._discovered_queues.keys() - queue_urls
+
+            for queue_url in removed:
+                del self._discovered_queues[queue_url]
+
+            for queue_url in sorted(added):
+                self._connection.cache_queue_url(queue_url)
+                self._discovered_queues[queue_url] = self._connection.sqs.Queue(
+                    queue_url
+                )
+
+            if added or removed:
+                self._version += 1
+
+        if added or removed:
+            logger.debug(
+                "[django-eb-sqs] Discovered queues added: %s, removed: %s",
+                ", ".join(sorted(added)),
+                ", ".join(sorted(removed)),
+            )
+
+        return bool(added or removed)
+
+    def remove(self, queue: Queue) -> bool:
+        with self._lock:
+            if self._discovered_queues.pop(queue.url, None) is None:
+                return False
+
+            self._version += 1
+            self._removed_queues[queue.url] = monotonic()
+            return True
+
+    def _discover_queue_urls(self) -> set[str] | None:
+        if settings.QUEUE_REGISTRY:
+            return self._read_registry()
+
+        return self._list_queue_urls()
+
+    def _list_queue_urls(self) -> set[str]:
+        paginator = self._connection.sqs.meta.client.get_paginator("list_queues")
+
+        queue_urls: set[str] = set()
+        for prefix in self._queue_prefixes:
+            for page in paginator.paginate(
+                QueueNamePrefix=prefix,
+                PaginationConfig={"PageSize": settings.LIST_QUEUES_PAGE_SIZE},
+            ):
+                queue_urls.update(page.get("QueueUrls", []))
+
+        return queue_urls
+
+    def _read_registry(self) -> set[str] | None:
+        registry: str | None = settings.QUEUE_REGISTRY
+        if not registry:
+            return None
+
+        mtime = None
+        if registry.startswith(self._REGISTRY_FILE_STR):
+            file_name = registry[len(self._REGISTRY_FILE_STR) :]
+
+            mtime = os.stat(file_name).st_mtime
+            if mtime == self._registry_mtime:
+                return None
+
+            with open(file_name) as file:
+                entries = [line.strip() for line in file]
+        elif registry.startswith(self._REGISTRY_CACHE_STR):
+            entries = cache.get(registry[len(self._REGISTRY_CACHE_STR) :]) or []
+        else:
+            raise ValueError(f"Invalid queue registry: {registry}")
+
+        queue_urls: set[str] = set()
+        for entry in filter(None, entries):
+            queue_name = SqsConnection.get_queue_name(entry)
+            if any(queue_name.startswith(prefix) for prefix in self._queue_prefixes):
+                queue_urls.add(
+                    entry if "/" in entry else self._connection.get_queue_url(entry)
+                )
+
+        # only skip unchanged files once their entries were resolved
+        if mtime is not None:
+            self._registry_mtime = mtime
+
+        return queue_urls
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import math
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from eb_sqs.aws.queue_discovery import QueueDiscovery
+from eb_sqs.aws.sqs_connection import SqsConnection
+
+if TYPE_CHECKING:
+    from mypy_boto3_sqs.service_resource import Queue
+
+
+class QueueStats:
+    def __init__(
+        self,
+        name: str,
+        visible: int,
+        in_flight: int,
+        delayed: int,
+    ) -> None:
+        self.name = name
+        self.visible = visible
+        self.in_flight = in_flight
+        self.delayed = delayed
+
+
+class MessageSample:
+    def __init__(self) -> None:
+        self.messages = 0
+        self.funcs: Counter[str] = Counter()
+        self.func_bytes: Counter[str] = Counter()
+        self.sizes: Counter[int] = Counter()
+
+    def add(self, body: str) -> None:
+        try:
+            task = json.loads(body)
+            func = task.get("func", "<unknown>") if isinstance(task, dict) else None
+        except ValueError:
+            func = None
+        func = func or "<invalid>"
+
+        size = len(body.encode())
+        self.messages += 1
+        self.funcs[func] += 1
+        self.func_bytes[func] += size
+        self.sizes[self.get_size_bucket(size)] += 1
+
+    @staticmethod
+    def get_size_bucket(size: int) -> int:
+        # upper bound of the power of two bucket, starting at 1 KB
+        bucket = 1024
+        while bucket < size:
+            bucket *= 2
+        return bucket
+
+
+class QueueInspector:
+    _ATTRIBUTES = {
+        "ApproximateNumberOfMessages": "visible",
+        "ApproximateNumberOfMessagesNotVisible": "in_flight",
+        "ApproximateNumberOfMessagesDelayed": "delayed",
+    }
+    _SAMPLE_RECEIVE_FACTOR = 3
+    # sampling increases receive counts, which may move messages to the dead letter queue
+    MIN_SAMPLE_MAX_RECEIVE_COUNT = 10
+
+    def __init__(
+        self, queue_names: list, connection: SqsConnection | None = None
+    ) -> None:
+        self._connection = connection or SqsConnection.default()
+        self._queue_discovery = QueueDiscovery(queue_names, self._connection)
+        self._queues: list[Queue] | None = None
+
+    @property
+    def queues(self) -> list[Queue]:
+        if self._queues is None:
+            self._queue_discovery.refresh(force=True)
+            self._queues = self._queue_discovery.queues
+        return self._queues
+
+    @staticmethod
+    def get_max_receive_count(queue: Queue) -> int | None:
+        redrive_policy = queue.attributes.get("RedrivePolicy")
+        if not redrive_policy:
+            return None
+        return int(json.loads(redrive_policy)["maxReceiveCount"])
+
+    def can_sample(self, queue: Queue) -> bool:
+        max_receive_count = self.get_max_receive_count(queue)
+        return (
+            max_receive_count is None
+            or max_receive_count >= self.MIN_SAMPLE_MAX_RECEIVE_COUNT
+        )
+
+    def get_stats(self, threads: int = 10) -> list[QueueStats]:
+        queue_urls = sorted(queue.url for queue in self.queues)
+        if not queue_urls:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(threads, len(queue_urls))) as executor:
+            return list(executor.map(self._get_queue_stats, queue_urls))
+
+    def sample(self, queue: Queue, max_messages: int) -> MessageSample:
+        # messages are received with a visibility timeout of 0, so they stay available
+        # but may be returned again, thus receive a few more times than needed
+        sample = MessageSample()
+        seen: set[str] = set()
+
+        for _ in range(math.ceil(max_messages / 10) * self._SAMPLE_RECEIVE_FACTOR):
+            if len(seen) >= max_messages:
+                break
+
+            for msg in queue.receive_messages(
+                MaxNumberOfMessages=min(10, max_messages - len(seen)),
+                VisibilityTimeout=0,
+                WaitTimeSeconds=0,
+            ):
+                if msg.message_id not in seen:
+                    seen.add(msg.message_id)
+                    sample.add(msg.body)
+
+        return sample
+
+    def _get_queue_stats(self, queue_url: str) -> QueueStats:
+        attributes = self._connection.sqs.meta.client.get_queue_attributes(
+            QueueUrl=queue_url,
+            AttributeNames=list(self._ATTRIBUTES),
+        )["Attributes"]
+
+        return QueueStats(
+            SqsConnection.get_queue_name(queue_url),
+            **{
+                field: int(attributes.get(attribute, 0))
+                for attribute, field in self._ATTRIBUTES.items()
+            },
+        )
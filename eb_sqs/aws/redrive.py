@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from time import monotonic, sleep, time
+from typing import TYPE_CHECKING
+
+from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
+from eb_sqs.worker.worker_task import WorkerTask
+
+if TYPE_CHECKING:
+    from mypy_boto3_sqs.service_resource import Message, Queue
+
+logger = logging.getLogger(__name__)
+
+
+class RedriveFilter:
+    def __init__(
+        self,
+        func_patterns: list[str] | None = None,
+        min_age_s: float | None = None,
+        max_age_s: float | None = None,
+        min_receive_count: int | None = None,
+        max_receive_count: int | None = None,
+    ) -> None:
+        self.func_patterns = func_patterns
+        self.min_age_s = min_age_s
+        self.max_age_s = max_age_s
+        self.min_receive_count = min_receive_count
+        self.max_receive_count = max_receive_count
+
+    def matches(self, task: dict | None, attributes: dict) -> bool:
+        if self.func_patterns:
+            func = task.get("func") if task else None
+            if not isinstance(func, str) or not any(
+                fnmatchcase(func, pattern) for pattern in self.func_patterns
+            ):
+                return False
+
+        if self.min_age_s is not None or self.max_age_s is not None:
+            age_s = time() - int(attributes["SentTimestamp"]) / 1000
+            if self.min_age_s is not None and age_s < self.min_age_s:
+                return False
+            if self.max_age_s is not None and age_s > self.max_age_s:
+                return False
+
+        receive_count = int(attributes.get("ApproximateReceiveCount", 0))
+        if self.min_receive_count is not None and receive_count < self.min_receive_count:
+            return False
+
+        return self.max_receive_count is None or receive_count <= self.max_receive_count
+
+
+class RedriveStats:
+    def __init__(self) -> None:
+        self.received = 0
+        self.matched = 0
+        self.redriven = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def add(self, received: int, matched: int, redriven: int, failed: int) -> None:
+        with self._lock:
+            self.received += received
+            self.matched += matched
+            self.redriven += redriven
+            self.failed += failed
+
+
+class RedriveService:
+    _BATCH_SIZE = 10
+    _ATTRIBUTES = ["SentTimestamp", "ApproximateReceiveCount"]
+
+    def __init__(
+        self,
+        queue_name: str,
+        target_queue_name: str | None = None,
+        connection: SqsConnection | None = None,
+    ) -> None:
+        self._connection = connection or SqsConnection.default()
+        self._queue_url = self._connection.get_queue_url(queue_name)
+        self._target_queue_name = target_queue_name
+
+        self._lock = threading.Lock()
+        self._next_send_time = 0.0
+        self._remaining: int | None = None
+        self._seen_message_ids: set[str] = set()
+        self._held_messages: list[Message] = []
+
+    def redrive(
+        self,
+        redrive_filter: RedriveFilter | None = None,
+        reset_retries: bool = True,
+        rate: float | None = None,
+        limit: int | None = None,
+        threads: int = 1,
+        visibility_timeout: int = 600,
+        dry_run: bool = False,
+    ) -> RedriveStats:
+        # skipped messages are released after their batch, as the number of in-flight
+        # messages of a queue is limited, while messages which are received again stay
+        # invisible until all threads are done, so every message is looked at once
+        redrive_filter = redrive_filter or RedriveFilter()
+        stats = RedriveStats()
+        self._remaining = limit
+        self._next_send_time = monotonic()
+        self._seen_message_ids = set()
+        self._held_messages = []
+
+        try:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                for future in [
+                    executor.submit(
+                        self._redrive_batches,
+                        redrive_filter,
+                        reset_retries,
+                        rate,
+                        visibility_timeout,
+                        dry_run,
+                        stats,
+                    )
+                    for _ in range(threads)
+                ]:
+                    future.result()
+        finally:
+            queue = self._connection.sqs.Queue(self._queue_url)
+            for i in range(0, len(self._held_messages), self._BATCH_SIZE):
+                self._release_messages(
+                    queue, self._held_messages[i : i + self._BATCH_SIZE]
+                )
+            self._held_messages = []
+
+        return stats
+
+    def _redrive_batches(
+        self,
+        redrive_filter: RedriveFilter,
+        reset_retries: bool,
+        rate: float | None,
+        visibility_timeout: int,
+        dry_run: bool,
+        stats: RedriveStats,
+    ) -> None:
+        queue = self._connection.sqs.Queue(self._queue_url)
+
+        while True:
+            max_messages = self._reserve(self._BATCH_SIZE)
+            if max_messages == 0:
+                return
+
+            messages = queue.receive_messages(
+                MaxNumberOfMessages=max_messages,
+                WaitTimeSeconds=1,
+                VisibilityTimeout=visibility_timeout,
+                AttributeNames=self._ATTRIBUTES,
+                MessageAttributeNames=["All"],
+            )
+
+            if not messages:
+                return
+
+            new_messages = self._hold_seen_messages(messages)
+            batches, skipped_messages = self._get_batches(
+                new_messages, redrive_filter, reset_retries
+            )
+            matched = len(new_messages) - len(skipped_messages)
+            self._release(max_messages - matched)
+
+            try:
+                if dry_run:
+                    stats.add(len(new_messages), matched, 0, 0)
+                    continue
+
+                redriven = 0
+                for target_queue_name, batch in batches.items():
+                    self._pace(len(batch), rate)
+                    redriven += self._send_batch(queue, target_queue_name, batch)
+
+                stats.add(len(new_messages), matched, redriven, matched - redriven)
+            finally:
+                self._release_messages(
+                    queue, new_messages if dry_run else skipped_messages
+                )
+
+    def _hold_seen_messages(self, messages: list[Message]) -> list[Message]:
+        new_messages = []
+        with self._lock:
+            for msg in messages:
+                if msg.message_id in self._seen_message_ids:
+                    self._held_messages.append(msg)
+                else:
+                    self._seen_message_ids.add(msg.message_id)
+                    new_messages.append(msg)
+
+        return new_messages
+
+    def _get_batches(
+        self,
+        messages: list[Message],
+        redrive_filter: RedriveFilter,
+        reset_retries: bool,
+    ) -> tuple[dict[str, list[tuple[Message, dict]]], list[Message]]:
+        batches: dict[str, list[tuple[Message, dict]]] = {}
+        skipped_messages = []
+        for msg in messages:
+            task = self._parse_task(msg.body)
+            if not redrive_filter.matches(task, msg.attributes):
+                skipped_messages.append(msg)
+                continue
+
+            target_queue_name = self._get_target_queue_name(task)
+            if target_queue_name is None:
+                logger.warning(
+                    "[django-eb-sqs] Skipping message %s without target queue",
+                    msg.message_id,
+                )
+                skipped_messages.append(msg)
+                continue
+
+            batches.setdefault(target_queue_name, []).append(
+                (msg, self._get_entry(msg, task, reset_retries))
+            )
+
+        return batches, skipped_messages
+
+    def _send_batch(
+        self, queue: Queue, target_queue_name: str, batch: list[tuple[Message, dict]]
+    ) -> int:
+        target_queue = self._connection.get_queue(target_queue_name)
+        response = target_queue.send_messages(Entries=[entry for _, entry in batch])
+
+        for failure in response.get("Failed", []):
+            logger.warning(
+                "[django-eb-sqs] Failed redriving message %s: %s",
+                failure["Id"],
+                failure.get("Message"),
+            )
+
+        sent_ids = {success["Id"] for success in response.get("Successful", [])}
+        sent = [msg for msg, entry in batch if entry["Id"] in sent_ids]
+        if sent:
+            queue.delete_messages(
+                Entries=[
+                    {"Id": msg.message_id, "ReceiptHandle": msg.receipt_handle}
+                    for msg in sent
+                ]
+            )
+
+        return len(sent)
+
+    @staticmethod
+    def _release_messages(queue: Queue, messages: list[Message]) -> None:
+        if not messages:
+            return
+
+        try:
+            response = queue.change_message_visibility_batch(
+                Entries=[
+                    {
+                        "Id": msg.message_id,
+                        "ReceiptHandle": msg.receipt_handle,
+                        "VisibilityTimeout": 0,
+                    }
+                    for msg in messages
+                ]
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("[django-eb-sqs] Failed releasing skipped messages: %s", exc)
+            return
+
+        for failure in response.get("Failed", []):
+            logger.warning(
+                "[django-eb-sqs] Failed releasing message %s: %s",
+                failure["Id"],
+                failure.get("Message"),
+            )
+
+    def _get_target_queue_name(self, task: dict | None) -> str | None:
+        if self._target_queue_name:
+            return self._target_queue_name
+
+        if task and task.get("queue"):
+            return f"{settings.QUEUE_PREFIX}{task['queue']}"
+
+        return None
+
+    @staticmethod
+    def _get_entry(msg: Message, task: dict | None, reset_retries: bool) -> dict:
+        body = msg.body
+        attributes = msg.message_attributes
+        if task is not None and reset_retries and task.get("retry"):
+            task["retry"] = 0
+            body = json.dumps(task)
+            if attributes and WorkerTask.RETRY_ATTRIBUTE in attributes:
+                attributes = {
+                    **attributes,
+                    WorkerTask.RETRY_ATTRIBUTE: {
+                        "DataType": "Number",
+                        "StringValue": "0",
+                    },
+                }
+
+        entry: dict = {"Id": msg.message_id, "MessageBody": body}
+        if attributes:
+            entry["MessageAttributes"] = attributes
+        return entry
+
+    @staticmethod
+    def _parse_task(body: str) -> dict | None:
+        try:
+            task = json.loads(body)
+        except ValueError:
+            return None
+        return task if isinstance(task, dict) else None
+
+    def _reserve(self, count: int) -> int:
+        with self._lock:
+            if self._remaining is None:
+                return count
+
+            count = min(count, self._remaining)
+            self._remaining -= count
+            return count
+
+    def _release(self, count: int) -> None:
+        with self._lock:
+            if self._remaining is not None:
+                self._remaining += count
+
+    def _pace(self, count: int, rate: float | None) -> None:
+        if not rate:
+            return
+
+        with self._lock:
+            send_time = max(self._next_send_time, monotonic())
+            self._next_send_time = send_time + count / rate
+
+        sleep(max(0.0, send_time - monotonic()))
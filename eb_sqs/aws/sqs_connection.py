@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import threading
+from time import monotonic
+from typing import TYPE_CHECKING
+
+import boto3
+from botocore.config import Config
+
+from eb_sqs import settings
+
+if TYPE_CHECKING:
+    from mypy_boto3_sqs import SQSServiceResource
+    from mypy_boto3_sqs.service_resource import Queue
+
+
+class SqsConnection:
+    _CONNECTION: SqsConnection | None = None
+    _LOCK = threading.Lock()
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self._local = threading.local()
+        self._queue_urls: dict[str, tuple[str, float]] = {}
+
+    @staticmethod
+    def default() -> SqsConnection:
+        connection = SqsConnection._CONNECTION
+        # sockets of a parent process must not be used after a fork
+        if not connection or connection.pid != os.getpid():
+            with SqsConnection._LOCK:
+                connection = SqsConnection._CONNECTION
+                if not connection or connection.pid != os.getpid():
+                    connection = SqsConnection._CONNECTION = SqsConnection()
+        return connection
+
+    @staticmethod
+    def reset_default() -> None:
+        SqsConnection._CONNECTION = None
+
+    @property
+    def sqs(self) -> SQSServiceResource:
+        # boto3 resources are not thread safe, thus one per thread
+        sqs = getattr(self._local, "sqs", None)
+        if sqs is None:
+            sqs = self._local.sqs = boto3.session.Session().resource(  # pyright: ignore
+                "sqs",
+                region_name=settings.AWS_REGION,
+                config=Config(
+                    retries={"max_attempts": settings.AWS_MAX_RETRIES},
+                    max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+                ),
+            )
+        return sqs
+
+    def get_queue(self, queue_name: str, use_cache: bool = True) -> Queue:
+        return self.sqs.Queue(self.get_queue_url(queue_name, use_cache))
+
+    def get_queue_url(self, queue_name: str, use_cache: bool = True) -> str:
+        if use_cache:
+            if settings.AWS_ACCOUNT_ID:
+                return self.build_queue_url(queue_name)
+
+            cached = self._queue_urls.get(queue_name)
+            if cached and monotonic() - cached[1] < settings.QUEUE_URL_CACHE_TTL_S:
+                return cached[0]
+
+        queue_url = self.sqs.meta.client.get_queue_url(QueueName=queue_name)[
+            "QueueUrl"
+        ]
+        self.cache_queue_url(queue_url)
+        return queue_url
+
+    def cache_queue_url(self, queue_url: str) -> None:
+        self._queue_urls[self.get_queue_name(queue_url)] = (queue_url, monotonic())
+
+    def invalidate_queue_url(self, queue_name: str) -> None:
+        self._queue_urls.pop(queue_name, None)
+
+    @staticmethod
+    def build_queue_url(queue_name: str) -> str:
+        return f"https://sqs.{settings.AWS_REGION}.amazonaws.com/{settings.AWS_ACCOUNT_ID}/{queue_name}"
+
+    @staticmethod
+    def get_queue_name(queue_url: str) -> str:
+        return queue_url.rsplit("/", 1)[-1]
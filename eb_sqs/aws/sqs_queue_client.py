@@ -1,12 +1,12 @@
 from __future__ import annotations
 
+import logging
 from typing import TYPE_CHECKING, Any
 
-import boto3
-from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
 from eb_sqs.worker.queue_client import (
     QueueClient,
     QueueClientException,
@@ -15,17 +15,20 @@ from eb_sqs.worker.queue_client import (
 
 if TYPE_CHECKING:
     from mypy_boto3_sqs import SQSServiceResource
-    from mypy_boto3_sqs.service_resource import Queue
+
+logger = logging.getLogger(__name__)
 
 
 class SqsQueueClient(QueueClient):
-    def __init__(self) -> None:
-        self.sqs: SQSServiceResource = boto3.resource(  # pyright: ignore
-            "sqs",
-            region_name=settings.AWS_REGION,
-            config=Config(retries={"max_attempts": settings.AWS_MAX_RETRIES}),
-        )
-        self.queue_cache: dict[str, Queue] = {}
+    _MAX_BATCH_MESSAGES = 10
+    _MAX_BATCH_BYTES = 256 * 1024
+
+    def __init__(self, connection: SqsConnection | None = None) -> None:
+        self.connection = connection or SqsConnection.default()
+
+    @property
+    def sqs(self) -> SQSServiceResource:
+        return self.connection.sqs
 
     def _get_queue(self, queue_name: str, use_cache: bool = True) -> Any:
         full_queue_name = f"{settings.QUEUE_PREFIX}{queue_name}"
@@ -37,16 +40,12 @@ class SqsQueueClient(QueueClient):
         return queue
 
     def _get_sqs_queue(self, queue_name: str, use_cache: bool) -> Any:
-        if use_cache and self.queue_cache.get(queue_name):
-            return self.queue_cache[queue_name]
-
         try:
-            queue = self.sqs.get_queue_by_name(QueueName=queue_name)
-            self.queue_cache[queue_name] = queue
-            return queue
+            return self.connection.get_queue(queue_name, use_cache)
         except ClientError as ex:
             error_code = ex.response.get("Error", {}).get("Code", None)
             if error_code == "AWS.SimpleQueueService.NonExistentQueue":
+                self.connection.invalidate_queue_url(queue_name)
                 return None
             else:
                 raise ex
@@ -60,26 +59,133 @@ class SqsQueueClient(QueueClient):
                     "VisibilityTimeout": settings.QUEUE_VISIBILITY_TIMEOUT,
                 },
             )
-            self.queue_cache[queue_name] = queue
+            self.connection.cache_queue_url(queue.url)
             return queue
         else:
             raise QueueDoesNotExistException(queue_name)
 
-    def add_message(self, queue_name: str, msg: str, delay: int) -> None:
+    def add_message(
+        self,
+        queue_name: str,
+        msg: str,
+        delay: int,
+        attributes: dict[str, str | int | float] | None = None,
+    ) -> None:
+        message: dict[str, Any] = {"MessageBody": msg, "DelaySeconds": delay}
+        if attributes:
+            message["MessageAttributes"] = self._get_message_attributes(attributes)
+
         try:
             queue = self._get_queue(queue_name)
             try:
-                queue.send_message(MessageBody=msg, DelaySeconds=delay)
+                queue.send_message(**message)
             except ClientError as ex:
                 if (
                     ex.response.get("Error", {}).get("Code", None)
                     == "AWS.SimpleQueueService.NonExistentQueue"
                 ):
                     queue = self._get_queue(queue_name, use_cache=False)
-                    queue.send_message(MessageBody=msg, DelaySeconds=delay)
+                    queue.send_message(**message)
                 else:
                     raise ex
         except QueueDoesNotExistException:
             raise
         except Exception as ex:
             raise QueueClientException(ex) from ex
+
+    def add_messages(
+        self,
+        queue_name: str,
+        msgs: list[str],
+        delay: int,
+        attributes: list[dict[str, str | int | float]] | None = None,
+    ) -> list[int]:
+        try:
+            queue = self._get_queue(queue_name)
+        except QueueDoesNotExistException:
+            raise
+        except Exception as ex:
+            raise QueueClientException(ex) from ex
+
+        failed: list[int] = []
+        for batch in self._get_batches(msgs, attributes):
+            entries: list[dict[str, Any]] = [
+                {"Id": str(index), "MessageBody": msgs[index], "DelaySeconds": delay}
+                for index in batch
+            ]
+            if attributes:
+                for entry, index in zip(entries, batch):
+                    entry["MessageAttributes"] = self._get_message_attributes(
+                        attributes[index]
+                    )
+            try:
+                try:
+                    response = queue.send_messages(Entries=entries)
+                except ClientError as ex:
+                    if (
+                        ex.response.get("Error", {}).get("Code", None)
+                        == "AWS.SimpleQueueService.NonExistentQueue"
+                    ):
+                        queue = self._get_queue(queue_name, use_cache=False)
+                        response = queue.send_messages(Entries=entries)
+                    else:
+                        raise ex
+            except QueueDoesNotExistException:
+                raise
+            except Exception as ex:  # noqa: BLE001
+                # a failed batch must not fail the batches which were already sent
+                logger.warning(
+                    "[django-eb-sqs] Failed sending %s messages to %s: %s",
+                    len(batch),
+                    queue_name,
+                    ex,
+                )
+                failed.extend(batch)
+                continue
+
+            failed.extend(int(entry["Id"]) for entry in response.get("Failed", []))
+
+        return sorted(failed)
+
+    @staticmethod
+    def _get_message_attributes(attributes: dict[str, str | int | float]) -> dict:
+        return {
+            name: (
+                {"DataType": "String", "StringValue": value}
+                if isinstance(value, str)
+                else {"DataType": "Number", "StringValue": str(value)}
+            )
+            for name, value in attributes.items()
+        }
+
+    @classmethod
+    def _get_batches(
+        cls,
+        msgs: list[str],
+        attributes: list[dict[str, str | int | float]] | None = None,
+    ) -> list[list[int]]:
+        # SQS limits batches to 10 messages and 256 KB in total, including attributes
+        batches: list[list[int]] = []
+        batch: list[int] = []
+        batch_bytes = 0
+        for index, msg in enumerate(msgs):
+            msg_bytes = len(msg.encode())
+            if attributes:
+                msg_bytes += sum(
+                    len(name.encode()) + len("String") + len(str(value).encode())
+                    for name, value in attributes[index].items()
+                )
+            if batch and (
+                len(batch) == cls._MAX_BATCH_MESSAGES
+                or batch_bytes + msg_bytes > cls._MAX_BATCH_BYTES
+            ):
+                batches.append(batch)
+                batch = []
+                batch_bytes = 0
+
+            batch.append(index)
+            batch_bytes += msg_bytes
+
+        if batch:
+            batches.append(batch)
+        return batches
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
 
 from typing_extensions import ParamSpec
 
 from eb_sqs import settings
+from eb_sqs.worker.rate_limits import register_task_limits
+from eb_sqs.worker.routing import TaskRoute, get_task_router
+from eb_sqs.worker.worker import TaskMapResult
 from eb_sqs.worker.worker_factory import WorkerFactory
 from eb_sqs.worker.worker_task import WorkerTask
 
@@ -13,6 +16,13 @@ def _get_kwarg_val(kwargs: dict, key: str, default: Any) -> Any:
     return kwargs.pop(key, default) if kwargs else default
 
 
+def _get_route(func: Callable[..., Any], kwargs: dict) -> TaskRoute | None:
+    # a queue passed with the call overrides the routing table
+    if kwargs and kwargs.get("queue_name"):
+        return None
+    return get_task_router().get_route(f"{func.__module__}.{func.__name__}")
+
+
 PS = ParamSpec("PS")
 
 
@@ -20,9 +30,12 @@ def func_delay_decorator(
     func: Callable[PS, Any], queue_name: str | None, max_retries_count: int | None
 ) -> Callable[PS, Any]:
     def wrapper(*args: PS.args, **kwargs: PS.kwargs) -> Any:
+        route = _get_route(func, kwargs)
         queue = _get_kwarg_val(
             kwargs, "queue_name", queue_name if queue_name else settings.DEFAULT_QUEUE
         )
+        if route:
+            queue = route.get_queue()
         max_retries = _get_kwarg_val(
             kwargs,
             "max_retries",
@@ -50,6 +63,59 @@ def func_delay_decorator(
     return wrapper
 
 
+def func_map_decorator(
+    func: Callable[..., Any],
+    queue_name: str | None,
+    max_retries_count: int | None,
+    unpack: bool,
+) -> Callable[..., Any]:
+    def wrapper(iterable: Iterable, **kwargs: Any) -> TaskMapResult:
+        route = _get_route(func, kwargs)
+        queue = _get_kwarg_val(
+            kwargs, "queue_name", queue_name or settings.DEFAULT_QUEUE
+        )
+        if route:
+            queue = route.get_queue()
+        max_retries = _get_kwarg_val(
+            kwargs,
+            "max_retries",
+            max_retries_count or settings.DEFAULT_MAX_RETRIES,
+        )
+
+        execute_inline = (
+            _get_kwarg_val(kwargs, "execute_inline", False) or settings.EXECUTE_INLINE
+        )
+        delay = _get_kwarg_val(kwargs, "delay", settings.DEFAULT_DELAY)
+        group_id = _get_kwarg_val(kwargs, "group_id", None)
+        chunk_size = _get_kwarg_val(kwargs, "chunk_size", 10)
+        max_in_flight = _get_kwarg_val(kwargs, "max_in_flight", 10)
+        progress = _get_kwarg_val(kwargs, "progress", None)
+        bulk_size = _get_kwarg_val(kwargs, "bulk_size", 1)
+
+        args_iterable = (
+            (tuple(args) for args in iterable) if unpack else ((arg,) for arg in iterable)
+        )
+
+        worker = WorkerFactory.default().create()
+        return worker.delay_many(
+            group_id,
+            queue,
+            func,
+            args_iterable,
+            kwargs,
+            max_retries,
+            delay,
+            execute_inline,
+            chunk_size,
+            max_in_flight,
+            progress,
+            bulk_size,
+            route,
+        )
+
+    return wrapper
+
+
 def func_retry_decorator(worker_task: WorkerTask) -> Callable[..., Any]:
     def wrapper(*args, **kwargs) -> Any:
         execute_inline = (
@@ -66,16 +132,59 @@ def func_retry_decorator(worker_task: WorkerTask) -> Callable[..., Any]:
     return wrapper
 
 
+def func_executing_retry_decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+    # retries the task executed by the current thread
+    def wrapper(*args, **kwargs) -> Any:
+        worker_task = WorkerTask.get_executing(func)
+        if worker_task is None:
+            raise RuntimeError(f"Task {func.__name__} is not being executed")
+        return func_retry_decorator(worker_task)(*args, **kwargs)
+
+    return wrapper
+
+
+def func_retry_num_decorator(func: Callable[..., Any]) -> Callable[[], int]:
+    def wrapper() -> int:
+        worker_task = WorkerTask.get_executing(func)
+        return worker_task.retry if worker_task else 0
+
+    return wrapper
+
+
 class task:  # noqa: N801
     def __init__(
         self,
         queue_name: str | None = None,
         max_retries: int | None = None,
+        rate_limit: str | None = None,
+        max_concurrency: int | None = None,
+        batch: bool = False,
+        soft_time_limit: float | None = None,
+        hard_time_limit: float | None = None,
     ) -> None:
         self.queue_name = queue_name
         self.max_retries = max_retries
+        self.rate_limit = rate_limit
+        self.max_concurrency = max_concurrency
+        self.batch = batch
+        self.soft_time_limit = soft_time_limit
+        self.hard_time_limit = hard_time_limit
 
     def __call__(self, func: Callable[PS, Any], *args: Any, **kwargs: Any) -> Any:
+        register_task_limits(
+            f"{func.__module__}.{func.__name__}", self.rate_limit, self.max_concurrency
+        )
+
         func.retry_num = 0  # type: ignore [attr-defined]
+        # retry state is kept per thread, the function is shared by execution lanes
+        func.retry = func_executing_retry_decorator(func)  # type: ignore [attr-defined]
+        func.get_retry_num = func_retry_num_decorator(func)  # type: ignore [attr-defined]
+        # batch functions are called once with a list of TaskCall
+        func.batch = self.batch  # type: ignore [attr-defined]
+        # seconds after which the worker interrupts the task or, if stuck, exits
+        func.soft_time_limit = self.soft_time_limit  # type: ignore [attr-defined]
+        func.hard_time_limit = self.hard_time_limit  # type: ignore [attr-defined]
         func.delay = func_delay_decorator(func, self.queue_name, self.max_retries)  # type: ignore [attr-defined]
+        func.map = func_map_decorator(func, self.queue_name, self.max_retries, False)  # type: ignore [attr-defined]
+        func.starmap = func_map_decorator(func, self.queue_name, self.max_retries, True)  # type: ignore [attr-defined]
         return func
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import json
 import logging
 import sys
-from datetime import timedelta
+from time import time
+from typing import NoReturn
 
 from django.core.management import BaseCommand
-from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
 from eb_sqs import settings
+from eb_sqs.worker.health import get_health_file_names
 
 logger = logging.getLogger(__name__)
 
@@ -17,20 +19,61 @@ class Command(BaseCommand):
     help = "Checks the SQS worker is healthy, and if not returns a failure code"
 
     def handle(self, *args, **options) -> None:
-        try:
-            with open(settings.HEALTHCHECK_FILE_NAME) as file:
-                last_healthcheck_date = parse_datetime(file.readlines()[0])
-
-                if (
-                    not last_healthcheck_date
-                ) or last_healthcheck_date < timezone.now() - timedelta(
-                    seconds=settings.HEALTHCHECK_UNHEALTHY_PERIOD_S
-                ):
-                    self._return_failure()
-        except Exception:  # noqa: BLE001
-            self._return_failure()
+        # a supervisor's worker processes each write their own file, all must be healthy
+        checked = False
+        for file_name in get_health_file_names():
+            try:
+                with open(file_name) as file:
+                    content = file.read()
+            except FileNotFoundError:
+                # removed after its worker process exited
+                continue
+
+            checked = True
+            try:
+                error = self._get_error(self._parse_status(content), time())
+            except Exception:  # noqa: BLE001
+                error = "invalid healthcheck file"
+
+            if error:
+                self._return_failure(f"{file_name}: {error}")
+
+        if not checked:
+            self._return_failure("no healthcheck file")
+
+    @staticmethod
+    def _parse_status(content: str) -> dict:
+        if content.startswith("{"):
+            return json.loads(content)
+
+        # files written by older versions only contain the time of the last write
+        updated = parse_datetime(content.splitlines()[0])
+        if not updated:
+            raise ValueError(content)
+        return {"updated": updated.timestamp()}
+
+    @staticmethod
+    def _get_error(status: dict, now: float) -> str | None:
+        unhealthy_period_s = settings.HEALTHCHECK_UNHEALTHY_PERIOD_S
+        if now - status["updated"] > unhealthy_period_s:
+            return f"not updated for {now - status['updated']:.0f} seconds"
+
+        # a worker busy with a task doesn't poll, which is healthy up to HEALTHCHECK_MAX_TASK_S
+        if status.get("current_task"):
+            task_time_s = now - status["task_started"]
+            if settings.HEALTHCHECK_MAX_TASK_S and (
+                task_time_s > settings.HEALTHCHECK_MAX_TASK_S
+            ):
+                return (
+                    f"stuck in task {status['current_task']}"
+                    f" for {task_time_s:.0f} seconds"
+                )
+        elif "last_loop" in status and now - status["last_loop"] > unhealthy_period_s:
+            return f"not polling for {now - status['last_loop']:.0f} seconds"
+
+        return None
 
     @staticmethod
-    def _return_failure() -> None:
-        logger.warning("[django-eb-sqs] Health check failed")
+    def _return_failure(error: str) -> NoReturn:
+        logger.warning("[django-eb-sqs] Health check failed: %s", error)
         sys.exit(1)
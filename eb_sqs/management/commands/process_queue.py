@@ -4,7 +4,9 @@ from argparse import ArgumentParser
 
 from django.core.management import BaseCommand, CommandError
 
+from eb_sqs.worker.autoscaler import QueueDepthAutoscaler
 from eb_sqs.worker.service import WorkerService
+from eb_sqs.worker.supervisor import WorkerSupervisor
 
 
 class Command(BaseCommand):
@@ -17,13 +19,76 @@ class Command(BaseCommand):
             dest="queue_names",
             help="Name of queues to process, separated by commas",
         )
+        parser.add_argument(
+            "--processes",
+            "-p",
+            dest="processes",
+            type=int,
+            default=1,
+            help="Number of worker processes to fork from a supervisor process",
+        )
+        parser.add_argument(
+            "--autoscale",
+            dest="autoscale",
+            help="Minimum and maximum number of worker processes, separated by a comma, scaled by queue depth",
+        )
+        parser.add_argument(
+            "--max-tasks-per-child",
+            dest="max_tasks_per_child",
+            type=int,
+            default=None,
+            help="Number of tasks after which a worker process is recycled",
+        )
+        parser.add_argument(
+            "--max-memory-per-child",
+            dest="max_memory_per_child",
+            type=int,
+            default=None,
+            help="Resident memory (MB) above which a worker process is recycled, checked between batches",
+        )
 
     def handle(self, *args, **options) -> None:
         if not options["queue_names"]:
             raise CommandError("Queue names (--queues) not specified")
 
+        if options["processes"] < 1:
+            raise CommandError("Number of processes (--processes) must be positive")
+
         queue_names = [
             queue_name.rstrip() for queue_name in options["queue_names"].split(",")
         ]
 
-        WorkerService().process_queues(queue_names)
+        processes = options["processes"]
+        autoscaler = None
+        if options["autoscale"]:
+            try:
+                min_processes, max_processes = (
+                    int(value) for value in options["autoscale"].split(",")
+                )
+            except ValueError as ex:
+                raise CommandError(
+                    "Autoscale (--autoscale) must be specified as MIN,MAX"
+                ) from ex
+
+            if not 1 <= min_processes <= max_processes:
+                raise CommandError(
+                    "Autoscale (--autoscale) requires 1 <= MIN <= MAX processes"
+                )
+
+            processes = min_processes
+            autoscaler = QueueDepthAutoscaler(queue_names, min_processes, max_processes)
+
+        if processes > 1 or autoscaler:
+            WorkerSupervisor(
+                queue_names,
+                processes,
+                options["max_tasks_per_child"],
+                options["max_memory_per_child"],
+                autoscaler=autoscaler,
+            ).run()
+        else:
+            # a single worker exits for recycling and relies on its process manager
+            WorkerService(
+                max_tasks=options["max_tasks_per_child"],
+                max_memory_mb=options["max_memory_per_child"],
+            ).process_queues(queue_names)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from typing import TYPE_CHECKING
+
+from django.core.management import BaseCommand, CommandError
+
+from eb_sqs.aws.queue_stats import QueueInspector
+from eb_sqs.aws.sqs_connection import SqsConnection
+
+if TYPE_CHECKING:
+    from mypy_boto3_sqs.service_resource import Queue
+
+
+class Command(BaseCommand):
+    help = "Command to show the number of messages in one or more SQS queues"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--queues",
+            "-q",
+            dest="queue_names",
+            help="Name of queues to inspect, separated by commas",
+        )
+        parser.add_argument(
+            "--sample",
+            dest="sample",
+            type=int,
+            default=0,
+            help="Number of messages per queue to peek at and group by task function and size."
+            " Peeking increases the receive count of messages, so queues with a low"
+            " maxReceiveCount are skipped",
+        )
+        parser.add_argument(
+            "--threads",
+            dest="threads",
+            type=int,
+            default=10,
+            help="Number of queues to read concurrently",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not options["queue_names"]:
+            raise CommandError("Queue names (--queues) not specified")
+
+        if options["threads"] < 1:
+            raise CommandError("Number of threads (--threads) must be positive")
+
+        queue_names = [
+            queue_name.rstrip() for queue_name in options["queue_names"].split(",")
+        ]
+        inspector = QueueInspector(queue_names)
+
+        stats = inspector.get_stats(options["threads"])
+        width = max([len(queue_stats.name) for queue_stats in stats] + [5])
+
+        self.stdout.write(
+            f"{'Queue':<{width}} {'Visible':>10} {'In flight':>10} {'Delayed':>10}"
+        )
+        for queue_stats in stats:
+            self.stdout.write(
+                f"{queue_stats.name:<{width}} {queue_stats.visible:>10}"
+                f" {queue_stats.in_flight:>10} {queue_stats.delayed:>10}"
+            )
+        self.stdout.write(
+            f"{'Total':<{width}} {sum(s.visible for s in stats):>10}"
+            f" {sum(s.in_flight for s in stats):>10} {sum(s.delayed for s in stats):>10}"
+        )
+
+        if options["sample"] > 0:
+            for queue in inspector.queues:
+                self._write_sample(inspector, queue, options["sample"])
+
+    def _write_sample(
+        self, inspector: QueueInspector, queue: Queue, max_messages: int
+    ) -> None:
+        self.stdout.write("")
+        if not inspector.can_sample(queue):
+            self.stdout.write(
+                f"{SqsConnection.get_queue_name(queue.url)}: not sampled, maxReceiveCount"
+                f" {inspector.get_max_receive_count(queue)} is below"
+                f" {inspector.MIN_SAMPLE_MAX_RECEIVE_COUNT}"
+            )
+            return
+
+        sample = inspector.sample(queue, max_messages)
+
+        self.stdout.write(
+            f"{SqsConnection.get_queue_name(queue.url)}: {sample.messages} messages sampled"
+        )
+        if not sample.messages:
+            return
+
+        width = max(len(func) for func in sample.funcs)
+        for func, count in sample.funcs.most_common():
+            self.stdout.write(
+                f"  {func:<{width}} {count:>6} {100 * count / sample.messages:>5.1f}%"
+                f" {sample.func_bytes[func] // count:>8} B avg"
+            )
+        for size, count in sorted(sample.sizes.items()):
+            self.stdout.write(f"  <= {size // 1024:>4} KB {count:>6}")
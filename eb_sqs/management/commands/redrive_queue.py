@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+
+from django.core.management import BaseCommand, CommandError
+
+from eb_sqs.aws.redrive import RedriveFilter, RedriveService
+
+
+class Command(BaseCommand):
+    help = "Command to move messages from a dead letter queue back to their queues"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--queue",
+            "-q",
+            dest="queue_name",
+            help="Name of the dead letter queue to redrive",
+        )
+        parser.add_argument(
+            "--target-queue",
+            dest="target_queue_name",
+            default=None,
+            help="Name of the queue to send messages to, defaults to the queue of each task",
+        )
+        parser.add_argument(
+            "--func",
+            dest="func_patterns",
+            default=None,
+            help="Task function names to redrive (wildcards allowed), separated by commas",
+        )
+        parser.add_argument(
+            "--min-age",
+            dest="min_age_s",
+            type=float,
+            default=None,
+            help="Only redrive messages sent at least this many seconds ago",
+        )
+        parser.add_argument(
+            "--max-age",
+            dest="max_age_s",
+            type=float,
+            default=None,
+            help="Only redrive messages sent at most this many seconds ago",
+        )
+        parser.add_argument(
+            "--min-receive-count",
+            dest="min_receive_count",
+            type=int,
+            default=None,
+            help="Only redrive messages received at least this many times",
+        )
+        parser.add_argument(
+            "--max-receive-count",
+            dest="max_receive_count",
+            type=int,
+            default=None,
+            help="Only redrive messages received at most this many times",
+        )
+        parser.add_argument(
+            "--keep-retries",
+            dest="keep_retries",
+            action="store_true",
+            help="Keep the retry counter of tasks instead of resetting it",
+        )
+        parser.add_argument(
+            "--rate",
+            dest="rate",
+            type=float,
+            default=None,
+            help="Maximum number of messages redriven per second",
+        )
+        parser.add_argument(
+            "--limit",
+            dest="limit",
+            type=int,
+            default=None,
+            help="Maximum number of messages to redrive",
+        )
+        parser.add_argument(
+            "--threads",
+            dest="threads",
+            type=int,
+            default=1,
+            help="Number of threads redriving batches concurrently",
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            dest="visibility_timeout",
+            type=int,
+            default=600,
+            help="Time (seconds) skipped messages stay invisible, should exceed the duration of the run",
+        )
+        parser.add_argument(
+            "--dry-run",
+            dest="dry_run",
+            action="store_true",
+            help="Only count the matching messages",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not options["queue_name"]:
+            raise CommandError("Queue name (--queue) not specified")
+
+        if options["threads"] < 1:
+            raise CommandError("Number of threads (--threads) must be positive")
+
+        func_patterns = (
+            [pattern.strip() for pattern in options["func_patterns"].split(",")]
+            if options["func_patterns"]
+            else None
+        )
+
+        stats = RedriveService(
+            options["queue_name"], options["target_queue_name"]
+        ).redrive(
+            RedriveFilter(
+                func_patterns,
+                options["min_age_s"],
+                options["max_age_s"],
+                options["min_receive_count"],
+                options["max_receive_count"],
+            ),
+            reset_retries=not options["keep_retries"],
+            rate=options["rate"],
+            limit=options["limit"],
+            threads=options["threads"],
+            visibility_timeout=options["visibility_timeout"],
+            dry_run=options["dry_run"],
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"{stats.matched} of {stats.received} messages would be redriven"
+            )
+        else:
+            self.stdout.write(
+                f"Redrove {stats.redriven} of {stats.received} messages"
+                f" ({stats.failed} failed)"
+            )
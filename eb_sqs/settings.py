@@ -5,10 +5,15 @@ AWS_REGION = getattr(settings, "EB_AWS_REGION", "us-east-1")  # type: str
 MAX_NUMBER_OF_MESSAGES = getattr(settings, "EB_SQS_MAX_NUMBER_OF_MESSAGES", 10)  # type: int
 WAIT_TIME_S = getattr(settings, "EB_SQS_WAIT_TIME_S", 2)  # type: int
 NO_QUEUES_WAIT_TIME_S = getattr(settings, "NO_QUEUES_WAIT_TIME_S", 5)  # type: int
+IDLE_BACKOFF_MAX_S = getattr(settings, "EB_SQS_IDLE_BACKOFF_MAX_S", 0)  # type: int
+POLL_STATS_INTERVAL_S = getattr(settings, "EB_SQS_POLL_STATS_INTERVAL_S", 300)  # type: int
+BATCH_LINGER_S = getattr(settings, "EB_SQS_BATCH_LINGER_S", 0)  # type: float
+BATCH_MAX_MESSAGES = getattr(settings, "EB_SQS_BATCH_MAX_MESSAGES", 100)  # type: int
 
 AUTO_ADD_QUEUE = getattr(settings, "EB_SQS_AUTO_ADD_QUEUE", False)  # type: bool
 QUEUE_PREFIX = getattr(settings, "EB_SQS_QUEUE_PREFIX", "")  # type: str
 DEFAULT_QUEUE = getattr(settings, "EB_SQS_DEFAULT_QUEUE", "eb-sqs-default")  # type: str
+TASK_ROUTES = getattr(settings, "EB_SQS_TASK_ROUTES", [])  # type: list
 
 EXECUTE_INLINE = getattr(settings, "EB_SQS_EXECUTE_INLINE", False)  # type: bool
 FORCE_SERIALIZATION = getattr(settings, "EB_SQS_FORCE_SERIALIZATION", False)  # type: bool
@@ -20,10 +25,55 @@ DEFAULT_COUNT_RETRIES = getattr(settings, "EB_SQS_DEFAULT_COUNT_RETRIES", True)
 WORKER_FACTORY = getattr(settings, "EB_SQS_WORKER_FACTORY", None)
 
 DEAD_LETTER_MODE = getattr(settings, "EB_SQS_DEAD_LETTER_MODE", False)  # type: bool
+SOFT_TIME_LIMIT_S = getattr(settings, "EB_SQS_SOFT_TIME_LIMIT_S", None)  # type: float | None
+HARD_TIME_LIMIT_S = getattr(settings, "EB_SQS_HARD_TIME_LIMIT_S", None)  # type: float | None
+
+LAZY_PAYLOAD = getattr(settings, "EB_SQS_LAZY_PAYLOAD", False)  # type: bool
+MESSAGE_ATTRIBUTES = getattr(settings, "EB_SQS_MESSAGE_ATTRIBUTES", True)  # type: bool
+
+RESULT_BACKEND = getattr(settings, "EB_SQS_RESULT_BACKEND", None)
+RESULT_TTL_S = getattr(settings, "EB_SQS_RESULT_TTL_S", 86400)  # type: int
+
+DB_CONNECTION_LIFECYCLE = getattr(
+    settings, "EB_SQS_DB_CONNECTION_LIFECYCLE", "message"
+)  # type: str
+DB_CONNECTION_CHECK_INTERVAL_S = getattr(
+    settings, "EB_SQS_DB_CONNECTION_CHECK_INTERVAL_S", 10
+)  # type: int
+
+EVENTS_ASYNC = getattr(settings, "EB_SQS_EVENTS_ASYNC", False)  # type: bool
+EVENTS_QUEUE_SIZE = getattr(settings, "EB_SQS_EVENTS_QUEUE_SIZE", 10000)  # type: int
+
+RATE_LIMIT_BACKEND = getattr(settings, "EB_SQS_RATE_LIMIT_BACKEND", None)
+RATE_LIMIT_RETRY_DELAY_S = getattr(settings, "EB_SQS_RATE_LIMIT_RETRY_DELAY_S", 1)  # type: int
+
+CIRCUIT_BREAKER_FAILURE_RATE = getattr(
+    settings, "EB_SQS_CIRCUIT_BREAKER_FAILURE_RATE", None
+)  # type: float | None
+CIRCUIT_BREAKER_MIN_CALLS = getattr(settings, "EB_SQS_CIRCUIT_BREAKER_MIN_CALLS", 20)  # type: int
+CIRCUIT_BREAKER_WINDOW_S = getattr(settings, "EB_SQS_CIRCUIT_BREAKER_WINDOW_S", 60)  # type: float
+CIRCUIT_BREAKER_COOLDOWN_S = getattr(settings, "EB_SQS_CIRCUIT_BREAKER_COOLDOWN_S", 30)  # type: float
+CIRCUIT_BREAKER_PROBES = getattr(settings, "EB_SQS_CIRCUIT_BREAKER_PROBES", 1)  # type: int
 
 AWS_MAX_RETRIES = getattr(settings, "EB_SQS_AWS_MAX_RETRIES", 30)  # type: int
+AWS_MAX_POOL_CONNECTIONS = getattr(
+    settings, "EB_SQS_AWS_MAX_POOL_CONNECTIONS", 50
+)  # type: int
+AWS_ACCOUNT_ID = getattr(settings, "EB_SQS_AWS_ACCOUNT_ID", None)  # type: str | None
+
+QUEUE_URL_CACHE_TTL_S = getattr(settings, "EB_SQS_QUEUE_URL_CACHE_TTL_S", 3600)  # type: int
 
 REFRESH_PREFIX_QUEUES_S = getattr(settings, "EB_SQS_REFRESH_PREFIX_QUEUES_S", 10)  # type: int
+LIST_QUEUES_PAGE_SIZE = getattr(settings, "EB_SQS_LIST_QUEUES_PAGE_SIZE", 1000)  # type: int
+QUEUE_REGISTRY = getattr(settings, "EB_SQS_QUEUE_REGISTRY", None)  # type: str | None
+
+SHARD_REPLICAS = getattr(settings, "EB_SQS_SHARD_REPLICAS", None)  # type: int | None
+SHARD_MEMBERSHIP_BACKEND = getattr(settings, "EB_SQS_SHARD_MEMBERSHIP_BACKEND", None)
+SHARD_HEARTBEAT_INTERVAL_S = getattr(
+    settings, "EB_SQS_SHARD_HEARTBEAT_INTERVAL_S", 10
+)  # type: int
+SHARD_MEMBER_TTL_S = getattr(settings, "EB_SQS_SHARD_MEMBER_TTL_S", 30)  # type: int
+SHARD_VIRTUAL_NODES = getattr(settings, "EB_SQS_SHARD_VIRTUAL_NODES", 100)  # type: int
 
 QUEUE_MESSAGE_RETENTION = getattr(settings, "EB_SQS_QUEUE_MESSAGE_RETENTION", "1209600")  # type: str
 QUEUE_VISIBILITY_TIMEOUT = getattr(settings, "EB_SQS_QUEUE_VISIBILITY_TIMEOUT", "300")  # type: str
@@ -37,3 +87,28 @@ HEALTHCHECK_UNHEALTHY_PERIOD_S = getattr(
 HEALTHCHECK_FILE_NAME = getattr(
     settings, "EB_SQS_HEALTHCHECK_FILE_NAME", "healthcheck.txt"
 )  # type: str
+HEALTHCHECK_MAX_TASK_S = getattr(
+    settings,
+    "EB_SQS_HEALTHCHECK_MAX_TASK_S",
+    max(HEALTHCHECK_UNHEALTHY_PERIOD_S, HARD_TIME_LIMIT_S or 0),
+)  # type: float
+
+SHUTDOWN_TIMEOUT_S = getattr(settings, "EB_SQS_SHUTDOWN_TIMEOUT_S", 10)  # type: float
+
+PRIORITY_QUEUES = getattr(settings, "EB_SQS_PRIORITY_QUEUES", [])  # type: list
+PRIORITY_SLOTS = getattr(settings, "EB_SQS_PRIORITY_SLOTS", 1)  # type: int
+
+SUPERVISOR_POLL_INTERVAL_S = getattr(
+    settings, "EB_SQS_SUPERVISOR_POLL_INTERVAL_S", 1
+)  # type: float
+SUPERVISOR_RESTART_BACKOFF_S = getattr(
+    settings, "EB_SQS_SUPERVISOR_RESTART_BACKOFF_S", 5
+)  # type: float
+SUPERVISOR_SHUTDOWN_TIMEOUT_S = getattr(
+    settings, "EB_SQS_SUPERVISOR_SHUTDOWN_TIMEOUT_S", 60
+)  # type: float
+
+AUTOSCALE_INTERVAL_S = getattr(settings, "EB_SQS_AUTOSCALE_INTERVAL_S", 10)  # type: float
+AUTOSCALE_MESSAGES_PER_PROCESS = getattr(
+    settings, "EB_SQS_AUTOSCALE_MESSAGES_PER_PROCESS", 10
+)  # type: int
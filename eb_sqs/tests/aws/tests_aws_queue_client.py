@@ -7,6 +7,7 @@ from botocore.exceptions import ClientError
 from moto import mock_aws
 
 from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
 from eb_sqs.aws.sqs_queue_client import SqsQueueClient
 from eb_sqs.worker.queue_client import QueueDoesNotExistException
 
@@ -14,6 +15,7 @@ from eb_sqs.worker.queue_client import QueueDoesNotExistException
 class AwsQueueClientTest(TestCase):
     def setUp(self):
         settings.QUEUE_PREFIX = "eb-sqs-"
+        SqsConnection.reset_default()
 
     @mock_aws()
     def test_add_message(self):
@@ -27,6 +29,22 @@ class AwsQueueClientTest(TestCase):
         queue.reload()
         self.assertEqual(queue.attributes["ApproximateNumberOfMessages"], "1")
 
+    @mock_aws()
+    def test_add_message_with_attributes(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+
+        SqsQueueClient().add_message("default", "msg", 0, {"func": "a.b", "retry": 2})
+
+        msg = queue.receive_messages(MessageAttributeNames=["All"])[0]
+        self.assertEqual(
+            msg.message_attributes,
+            {
+                "func": {"DataType": "String", "StringValue": "a.b"},
+                "retry": {"DataType": "Number", "StringValue": "2"},
+            },
+        )
+
     @mock_aws()
     def test_add_message_delayed(self):
         delay = 1
@@ -74,12 +92,19 @@ class AwsQueueClientTest(TestCase):
         queue.delete()
 
         # moto throws exception inconsistent with boto, thus the patching
-        with patch.object(
-            queue_client.queue_cache[full_queue_name], "send_message"
-        ) as send_message_fn:
-            send_message_fn.side_effect = ClientError(
-                {"Error": {"Code": "AWS.SimpleQueueService.NonExistentQueue"}}, None
-            )
+        sqs_client = queue_client.sqs.meta.client
+        send_message = sqs_client.send_message
+
+        def send_message_once_deleted(**kwargs):
+            if send_message_fn.call_count == 1:
+                raise ClientError(
+                    {"Error": {"Code": "AWS.SimpleQueueService.NonExistentQueue"}},
+                    "SendMessage",
+                )
+            return send_message(**kwargs)
+
+        with patch.object(sqs_client, "send_message") as send_message_fn:
+            send_message_fn.side_effect = send_message_once_deleted
 
             queue_client.add_message(queue_name, "msg", 0)
 
@@ -88,3 +113,57 @@ class AwsQueueClientTest(TestCase):
         self.assertEqual(queue.attributes["ApproximateNumberOfMessages"], "1")
 
         settings.AUTO_ADD_QUEUE = False
+
+    @mock_aws()
+    def test_add_messages(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        queue_client = SqsQueueClient()
+
+        msgs = [f"msg-{i}" for i in range(14)] + ["x" * 200 * 1024] * 2
+        with patch.object(
+            queue_client.sqs.meta.client,
+            "send_message_batch",
+            wraps=queue_client.sqs.meta.client.send_message_batch,
+        ) as send_message_batch_fn:
+            failed = queue_client.add_messages("default", msgs, 0)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(send_message_batch_fn.call_count, 3)
+        queue.reload()
+        self.assertEqual(queue.attributes["ApproximateNumberOfMessages"], "16")
+
+    @mock_aws()
+    def test_queue_url_cached(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        sqs.create_queue(QueueName="eb-sqs-default")
+        queue_client = SqsQueueClient()
+
+        with patch.object(
+            queue_client.sqs.meta.client,
+            "get_queue_url",
+            wraps=queue_client.sqs.meta.client.get_queue_url,
+        ) as get_queue_url_fn:
+            queue_client.add_message("default", "msg", 0)
+            SqsQueueClient().add_message("default", "msg", 0)
+
+        get_queue_url_fn.assert_called_once()
+
+    @mock_aws()
+    def test_queue_url_from_account_id(self):
+        settings.AWS_ACCOUNT_ID = "123456789012"
+
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        queue_client = SqsQueueClient()
+
+        with patch.object(
+            queue_client.sqs.meta.client, "get_queue_url"
+        ) as get_queue_url_fn:
+            queue_client.add_message("default", "msg", 0)
+
+        settings.AWS_ACCOUNT_ID = None
+
+        get_queue_url_fn.assert_not_called()
+        queue.reload()
+        self.assertEqual(queue.attributes["ApproximateNumberOfMessages"], "1")
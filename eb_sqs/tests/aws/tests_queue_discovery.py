@@ -0,0 +1,167 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import boto3
+from django.core.cache import cache
+from moto import mock_aws
+
+from eb_sqs import settings
+from eb_sqs.aws.queue_discovery import QueueDiscovery
+from eb_sqs.aws.sqs_connection import SqsConnection
+from eb_sqs.worker.sharding import InMemoryMembershipBackend, QueueSharder
+
+
+class QueueDiscoveryTest(TestCase):
+    def setUp(self):
+        SqsConnection.reset_default()
+
+    def _queue_names(self, discovery: QueueDiscovery) -> list:
+        return sorted(SqsConnection.get_queue_name(q.url) for q in discovery.queues)
+
+    @mock_aws()
+    def test_discover_prefix_queues(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        sqs.create_queue(QueueName="static")
+        sqs.create_queue(QueueName="pr1-a")
+        sqs.create_queue(QueueName="other")
+
+        discovery = QueueDiscovery(["static", "prefix:pr1-"])
+
+        self.assertTrue(discovery.refresh())
+        self.assertEqual(self._queue_names(discovery), ["pr1-a", "static"])
+
+    @mock_aws()
+    def test_refresh_diffs_queues(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue_a = sqs.create_queue(QueueName="pr1-a")
+
+        discovery = QueueDiscovery(["prefix:pr1-"])
+        discovery.refresh()
+        known_queue = discovery.queues[0]
+
+        self.assertFalse(discovery.refresh(force=True))
+
+        sqs.create_queue(QueueName="pr1-b")
+        queue_a.delete()
+
+        self.assertTrue(discovery.refresh(force=True))
+        self.assertEqual(self._queue_names(discovery), ["pr1-b"])
+        self.assertNotIn(known_queue, discovery.queues)
+
+    @mock_aws()
+    def test_refresh_interval(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        sqs.create_queue(QueueName="pr1-a")
+
+        discovery = QueueDiscovery(["prefix:pr1-"])
+        discovery.refresh()
+
+        sqs.create_queue(QueueName="pr1-b")
+
+        self.assertFalse(discovery.refresh())
+        self.assertEqual(self._queue_names(discovery), ["pr1-a"])
+
+    @mock_aws()
+    def test_remove_queue(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        sqs.create_queue(QueueName="pr1-a")
+        sqs.create_queue(QueueName="static")
+
+        discovery = QueueDiscovery(["static", "prefix:pr1-"])
+        discovery.refresh()
+
+        self.assertFalse(discovery.remove(discovery.static_queues[0]))
+        self.assertTrue(discovery.remove(discovery.queues[1]))
+        self.assertEqual(self._queue_names(discovery), ["static"])
+
+        # still listed by SQS for a while after deletion
+        discovery.refresh(force=True)
+        self.assertEqual(self._queue_names(discovery), ["static"])
+
+    @mock_aws()
+    def test_registry_file(self):
+        with tempfile.NamedTemporaryFile("w", delete=False) as file:
+            file.write(
+                "pr1-a\nhttps://sqs.us-east-1.amazonaws.com/123456789012/pr1-b\nother\n"
+            )
+        settings.AWS_ACCOUNT_ID = "123456789012"
+        settings.QUEUE_REGISTRY = f"file:{file.name}"
+
+        try:
+            discovery = QueueDiscovery(["prefix:pr1-"])
+
+            self.assertTrue(discovery.refresh())
+            self.assertEqual(self._queue_names(discovery), ["pr1-a", "pr1-b"])
+
+            # unchanged registry file is not read again
+            self.assertFalse(discovery.refresh(force=True))
+        finally:
+            settings.AWS_ACCOUNT_ID = None
+            settings.QUEUE_REGISTRY = None
+            os.remove(file.name)
+
+    @mock_aws()
+    def test_registry_file_retried_after_error(self):
+        with tempfile.NamedTemporaryFile("w", delete=False) as file:
+            file.write("pr1-a\n")
+        settings.QUEUE_REGISTRY = f"file:{file.name}"
+
+        try:
+            discovery = QueueDiscovery(["prefix:pr1-"])
+
+            # queue url cannot be resolved yet
+            self.assertFalse(discovery.refresh())
+
+            sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+            sqs.create_queue(QueueName="pr1-a")
+
+            self.assertTrue(discovery.refresh(force=True))
+            self.assertEqual(self._queue_names(discovery), ["pr1-a"])
+        finally:
+            settings.QUEUE_REGISTRY = None
+            os.remove(file.name)
+
+    @mock_aws()
+    def test_registry_cache(self):
+        settings.AWS_ACCOUNT_ID = "123456789012"
+        settings.QUEUE_REGISTRY = "cache:eb-sqs-queues"
+        cache.set("eb-sqs-queues", ["pr1-a", "other"])
+
+        try:
+            discovery = QueueDiscovery(["prefix:pr1-"])
+
+            self.assertTrue(discovery.refresh())
+            self.assertEqual(self._queue_names(discovery), ["pr1-a"])
+        finally:
+            settings.AWS_ACCOUNT_ID = None
+            settings.QUEUE_REGISTRY = None
+            cache.delete("eb-sqs-queues")
+
+    @mock_aws()
+    def test_sharded_queues(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        sqs.create_queue(QueueName="static")
+        for i in range(10):
+            sqs.create_queue(QueueName=f"pr1-{i}")
+
+        backend = InMemoryMembershipBackend()
+        sharders = [QueueSharder("group", 1, backend, member_id=f"w{i}") for i in range(2)]
+        for sharder in sharders + sharders:
+            sharder.heartbeat(force=True)
+
+        discoveries = [
+            QueueDiscovery(["static", "prefix:pr1-"], sharder=sharder)
+            for sharder in sharders
+        ]
+        for discovery in discoveries:
+            discovery.refresh()
+
+        assigned = [self._queue_names(discovery) for discovery in discoveries]
+
+        self.assertTrue(all("static" in queue_names for queue_names in assigned))
+        self.assertEqual(
+            sorted(set(assigned[0] + assigned[1]) - {"static"}),
+            sorted(f"pr1-{i}" for i in range(10)),
+        )
+        self.assertEqual(len(assigned[0]) + len(assigned[1]), 12)
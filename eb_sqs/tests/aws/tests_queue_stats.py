@@ -0,0 +1,82 @@
+import json
+from unittest import TestCase
+
+import boto3
+from moto import mock_aws
+
+from eb_sqs import settings
+from eb_sqs.aws.queue_stats import MessageSample, QueueInspector
+from eb_sqs.aws.sqs_connection import SqsConnection
+
+
+class QueueInspectorTest(TestCase):
+    def setUp(self):
+        SqsConnection.reset_default()
+
+    @mock_aws()
+    def test_get_stats(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="pr1-a")
+        sqs.create_queue(QueueName="pr1-b")
+        sqs.create_queue(QueueName="other")
+
+        queue.send_message(MessageBody="msg-1")
+        queue.send_message(MessageBody="msg-2")
+        queue.send_message(MessageBody="msg-3", DelaySeconds=60)
+        queue.receive_messages(MaxNumberOfMessages=1)
+
+        stats = QueueInspector(["prefix:pr1-"]).get_stats()
+
+        self.assertEqual([queue_stats.name for queue_stats in stats], ["pr1-a", "pr1-b"])
+        self.assertEqual(
+            (stats[0].visible, stats[0].in_flight, stats[0].delayed), (1, 1, 1)
+        )
+        self.assertEqual((stats[1].visible, stats[1].in_flight), (0, 0))
+
+    @mock_aws()
+    def test_sample(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="queue")
+        for func in ["app.tasks.a", "app.tasks.a", "app.tasks.b"]:
+            queue.send_message(MessageBody=json.dumps({"func": func, "args": []}))
+        queue.send_message(MessageBody="x" * 2000)
+
+        sample = QueueInspector(["queue"]).sample(queue, 10)
+
+        self.assertEqual(sample.messages, 4)
+        self.assertEqual(sample.funcs["app.tasks.a"], 2)
+        self.assertEqual(sample.funcs["<invalid>"], 1)
+        self.assertEqual(sample.sizes, {1024: 3, 2048: 1})
+
+        queue.reload()
+        self.assertEqual(queue.attributes["ApproximateNumberOfMessages"], "4")
+
+    @mock_aws()
+    def test_can_sample(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        dead_letter_queue = sqs.create_queue(QueueName="dead-letter")
+        queue = sqs.create_queue(QueueName="queue")
+        inspector = QueueInspector(["queue"])
+
+        self.assertTrue(inspector.can_sample(queue))
+
+        for max_receive_count, can_sample in [(3, False), (10, True)]:
+            queue.set_attributes(
+                Attributes={
+                    "RedrivePolicy": json.dumps(
+                        {
+                            "deadLetterTargetArn": dead_letter_queue.attributes[
+                                "QueueArn"
+                            ],
+                            "maxReceiveCount": max_receive_count,
+                        }
+                    )
+                }
+            )
+            queue.reload()
+            self.assertEqual(inspector.can_sample(queue), can_sample)
+
+    def test_size_bucket(self):
+        self.assertEqual(MessageSample.get_size_bucket(10), 1024)
+        self.assertEqual(MessageSample.get_size_bucket(1025), 2048)
+        self.assertEqual(MessageSample.get_size_bucket(200 * 1024), 256 * 1024)
@@ -0,0 +1,123 @@
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+
+from eb_sqs import settings
+from eb_sqs.aws.redrive import RedriveFilter, RedriveService
+from eb_sqs.aws.sqs_connection import SqsConnection
+
+
+class RedriveServiceTest(TestCase):
+    def setUp(self):
+        settings.QUEUE_PREFIX = ""
+        SqsConnection.reset_default()
+
+    def _create_queues(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        dead_letter_queue = sqs.create_queue(QueueName="dead-letter")
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        other_queue = sqs.create_queue(QueueName="other")
+
+        for i, func in enumerate(["app.tasks.a", "app.tasks.b", "other.c"]):
+            dead_letter_queue.send_message(
+                MessageBody=json.dumps(
+                    {
+                        "id": f"id-{i}",
+                        "queue": "other" if func == "other.c" else "eb-sqs-default",
+                        "func": func,
+                        "args": [],
+                        "kwargs": {},
+                        "maxRetries": 3,
+                        "retry": 3,
+                    }
+                ),
+                MessageAttributes={
+                    "trace": {"DataType": "String", "StringValue": f"trace-{i}"}
+                },
+            )
+        dead_letter_queue.send_message(MessageBody="invalid")
+
+        return dead_letter_queue, queue, other_queue
+
+    def _receive(self, queue) -> list:  # noqa: ANN001
+        return queue.receive_messages(
+            MaxNumberOfMessages=10, MessageAttributeNames=["All"]
+        )
+
+    @mock_aws()
+    def test_redrive_to_task_queues(self):
+        dead_letter_queue, queue, other_queue = self._create_queues()
+
+        stats = RedriveService("dead-letter").redrive()
+
+        self.assertEqual((stats.received, stats.matched, stats.redriven), (4, 3, 3))
+
+        messages = self._receive(queue)
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(json.loads(messages[0].body)["retry"], 0)
+        self.assertEqual(
+            messages[0].message_attributes["trace"]["StringValue"][:6], "trace-"
+        )
+        self.assertEqual(len(self._receive(other_queue)), 1)
+
+        # the invalid message is released after its batch
+        dead_letter_queue.reload()
+        self.assertEqual(dead_letter_queue.attributes["ApproximateNumberOfMessages"], "1")
+        self.assertEqual(
+            dead_letter_queue.attributes["ApproximateNumberOfMessagesNotVisible"], "0"
+        )
+
+    @mock_aws()
+    def test_redrive_filtered(self):
+        _, queue, other_queue = self._create_queues()
+
+        stats = RedriveService("dead-letter", "other").redrive(
+            RedriveFilter(func_patterns=["app.tasks.*"]), reset_retries=False, limit=1
+        )
+
+        self.assertEqual((stats.matched, stats.redriven), (1, 1))
+        messages = self._receive(other_queue)
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(json.loads(messages[0].body)["retry"], 3)
+        self.assertEqual(len(self._receive(queue)), 0)
+
+    @mock_aws()
+    def test_dry_run(self):
+        dead_letter_queue, queue, _ = self._create_queues()
+
+        stats = RedriveService("dead-letter").redrive(
+            RedriveFilter(min_age_s=3600), dry_run=True
+        )
+
+        self.assertEqual((stats.received, stats.matched, stats.redriven), (4, 0, 0))
+        self.assertEqual(len(self._receive(queue)), 0)
+
+        dead_letter_queue.reload()
+        self.assertEqual(dead_letter_queue.attributes["ApproximateNumberOfMessages"], "4")
+
+    @mock_aws()
+    def test_skipped_messages_released_per_batch(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        dead_letter_queue = sqs.create_queue(QueueName="dead-letter")
+        for i in range(25):
+            dead_letter_queue.send_message(MessageBody=f"invalid-{i}")
+
+        with patch.object(
+            RedriveService,
+            "_release_messages",
+            wraps=RedriveService._release_messages,
+        ) as release_mock:
+            stats = RedriveService("dead-letter").redrive()
+
+        self.assertEqual((stats.received, stats.matched), (25, 0))
+        self.assertGreaterEqual(release_mock.call_count, 3)
+        for call in release_mock.call_args_list:
+            self.assertLessEqual(len(call.args[1]), 10)
+
+        dead_letter_queue.reload()
+        self.assertEqual(
+            dead_letter_queue.attributes["ApproximateNumberOfMessagesNotVisible"], "0"
+        )
@@ -0,0 +1,49 @@
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from eb_sqs.aws.sqs_connection import SqsConnection
+
+
+class SqsConnectionTest(TestCase):
+    def setUp(self):
+        SqsConnection.reset_default()
+
+    def test_default_connection_shared(self):
+        self.assertIs(SqsConnection.default(), SqsConnection.default())
+
+    def test_default_connection_rebuilt_after_fork(self):
+        connection = SqsConnection.default()
+
+        with patch("eb_sqs.aws.sqs_connection.os.getpid", return_value=-1):
+            forked_connection = SqsConnection.default()
+
+        self.assertIsNot(connection, forked_connection)
+
+    def test_resource_per_thread(self):
+        connection = SqsConnection.default()
+        resources = []
+
+        thread = threading.Thread(target=lambda: resources.append(connection.sqs))
+        thread.start()
+        thread.join()
+
+        self.assertIs(connection.sqs, connection.sqs)
+        self.assertIsNot(connection.sqs, resources[0])
+
+    def test_queue_url_cache_shared_between_threads(self):
+        connection = SqsConnection.default()
+        connection.cache_queue_url(
+            "https://sqs.us-east-1.amazonaws.com/123456789012/queue"
+        )
+
+        urls = []
+        thread = threading.Thread(
+            target=lambda: urls.append(connection.get_queue_url("queue"))
+        )
+        thread.start()
+        thread.join()
+
+        self.assertEqual(
+            urls, ["https://sqs.us-east-1.amazonaws.com/123456789012/queue"]
+        )
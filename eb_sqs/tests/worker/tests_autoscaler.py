@@ -0,0 +1,42 @@
+from unittest import TestCase
+
+import boto3
+from moto import mock_aws
+
+from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
+from eb_sqs.worker.autoscaler import QueueDepthAutoscaler
+
+
+class QueueDepthAutoscalerTest(TestCase):
+    def setUp(self):
+        SqsConnection.reset_default()
+        self.autoscaler = QueueDepthAutoscaler(["queue1"], 1, 5)
+
+    def test_grow_at_once(self):
+        self.assertEqual(self.autoscaler.calculate_processes(1, 45), 5)
+
+    def test_grow_up_to_max(self):
+        self.assertEqual(self.autoscaler.calculate_processes(1, 1000), 5)
+
+    def test_shrink_one_at_a_time(self):
+        self.assertEqual(self.autoscaler.calculate_processes(5, 0), 4)
+
+    def test_shrink_down_to_min(self):
+        self.assertEqual(self.autoscaler.calculate_processes(1, 0), 1)
+
+    @mock_aws()
+    def test_number_of_messages(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue1 = sqs.create_queue(QueueName="queue1")
+        queue2 = sqs.create_queue(QueueName="pr1-queue2")
+        sqs.create_queue(QueueName="other")
+
+        for _ in range(3):
+            queue1.send_message(MessageBody="msg")
+        queue2.send_message(MessageBody="msg")
+        queue2.receive_messages()
+
+        autoscaler = QueueDepthAutoscaler(["queue1", "prefix:pr1-"], 1, 5)
+
+        self.assertEqual(autoscaler.get_number_of_messages(), 4)
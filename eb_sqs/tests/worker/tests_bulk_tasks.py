@@ -0,0 +1,262 @@
+import json
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import boto3
+from moto import mock_aws
+
+from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
+from eb_sqs.decorators import task
+from eb_sqs.worker.queue_client import QueueClient
+from eb_sqs.worker.service import WorkerService
+from eb_sqs.worker.worker import Worker
+from eb_sqs.worker.worker_exceptions import (
+    ExecutionFailedException,
+    PartialBatchFailureException,
+)
+from eb_sqs.worker.worker_factory import WorkerFactory
+from eb_sqs.worker.worker_task import TaskCall, WorkerTask
+
+
+@task(max_retries=2)
+def square_task(value: int):
+    if value < 0:
+        raise ValueError("negative")
+    return value * value
+
+
+@task(batch=True)
+def sum_task(calls: list):
+    if any(call.args[0] < 0 for call in calls):
+        raise PartialBatchFailureException(
+            [index for index, call in enumerate(calls) if call.args[0] < 0]
+        )
+    return sum(call.args[0] for call in calls)
+
+
+batch_sizes: list = []
+
+
+@task(batch=True)
+def recording_batch_task(calls: list):
+    batch_sizes.append(len(calls))
+
+
+class BulkTaskTest(TestCase):
+    def setUp(self):
+        settings.DEAD_LETTER_MODE = False
+        settings.EXECUTE_INLINE = False
+
+        self.queue_mock = Mock(autospec=QueueClient)
+        self.queue_mock.add_messages.return_value = []
+        self.worker = Worker(self.queue_mock)
+
+        factory_mock = Mock(autospec=WorkerFactory)
+        factory_mock.create.return_value = self.worker
+        settings.WORKER_FACTORY = factory_mock
+
+    def _create_msg(self, func, values: list, retry: int = 0) -> str:  # noqa: ANN001
+        return WorkerTask(
+            "id-1",
+            None,
+            "default",
+            func,
+            (),
+            {},
+            2,
+            retry,
+            None,
+            [TaskCall([value], {}) for value in values],
+        ).serialize()
+
+    def test_serialize_calls(self):
+        worker_task = WorkerTask.deserialize(self._create_msg(square_task, [1, 2]))
+
+        calls = worker_task.calls or []
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[1].args, [2])
+        self.assertEqual(calls[1].kwargs, {})
+
+    def test_execute_bulk_task(self):
+        result = self.worker.execute(self._create_msg(square_task, [1, 2, 3]))
+
+        self.assertEqual(result, [1, 4, 9])
+
+    def test_retry_failed_calls(self):
+        self.worker.execute(self._create_msg(square_task, [1, -2, 3, -4]))
+
+        self.queue_mock.add_message.assert_called_once()
+        retried = WorkerTask.deserialize(self.queue_mock.add_message.call_args[0][1])
+        self.assertEqual([call.args for call in retried.calls or []], [[-2], [-4]])
+        self.assertEqual(retried.retry, 1)
+
+    def test_failed_calls_max_retries(self):
+        with self.assertRaises(ExecutionFailedException) as context:
+            self.worker.execute(self._create_msg(square_task, [1, -2], retry=1))
+
+        self.assertIsInstance(context.exception.caught, PartialBatchFailureException)
+        self.queue_mock.add_message.assert_not_called()
+
+    def test_batch_task(self):
+        self.assertEqual(self.worker.execute(self._create_msg(sum_task, [1, 2, 3])), 6)
+
+        self.worker.execute(self._create_msg(sum_task, [1, -2, 3]))
+
+        retried = WorkerTask.deserialize(self.queue_mock.add_message.call_args[0][1])
+        self.assertEqual([call.args for call in retried.calls or []], [[-2]])
+
+    def test_batch_task_delay_inline(self):
+        self.assertEqual(sum_task.delay(5, execute_inline=True), 5)
+
+    def test_map_bulk(self):
+        self.queue_mock.add_messages.side_effect = lambda queue_name, msgs, delay, attributes: [1]
+
+        result = square_task.map(range(7), bulk_size=3)
+
+        msgs = self.queue_mock.add_messages.call_args[0][1]
+        self.assertEqual(len(msgs), 3)
+        self.assertEqual(len(json.loads(msgs[2])["calls"]), 1)
+        self.assertEqual(result.sent, 4)
+        self.assertEqual(result.failed, [3, 4, 5])
+
+    def test_execute_batch(self):
+        outcomes = self.worker.execute_batch(
+            [
+                self._create_msg(sum_task, [1]),
+                self._create_msg(sum_task, [2, -3]),
+                self._create_msg(sum_task, [-4], retry=1),
+            ]
+        )
+
+        self.assertEqual(outcomes[0], None)
+        self.assertEqual(outcomes[1], None)
+        self.assertIsInstance(outcomes[2], ExecutionFailedException)
+
+        # the calls of the second message are retried with its own retry count
+        retried = WorkerTask.deserialize(self.queue_mock.add_message.call_args[0][1])
+        self.assertEqual([call.args for call in retried.calls or []], [[-3]])
+        self.assertEqual(retried.retry, 1)
+
+    def test_execute_batch_with_invalid_message(self):
+        batch_sizes.clear()
+
+        outcomes = self.worker.execute_batch(
+            [
+                self._create_msg(recording_batch_task, [1]),
+                "invalid",
+                self._create_msg(recording_batch_task, [2]),
+            ]
+        )
+
+        self.assertEqual(batch_sizes, [2])
+        self.assertEqual(outcomes[0], None)
+        self.assertIsInstance(outcomes[1], ExecutionFailedException)
+        self.assertEqual(outcomes[2], None)
+
+    def test_get_batch_name(self):
+        self.assertEqual(
+            self.worker.get_batch_name(self._create_msg(sum_task, [1])),
+            "eb_sqs.tests.worker.tests_bulk_tasks.sum_task",
+        )
+        self.assertIsNone(self.worker.get_batch_name(self._create_msg(square_task, [1])))
+        self.assertIsNone(self.worker.get_batch_name("invalid"))
+
+    def test_get_batch_name_from_attributes(self):
+        self.assertEqual(
+            self.worker.get_batch_name(
+                "invalid", {"func": "eb_sqs.tests.worker.tests_bulk_tasks.sum_task"}
+            ),
+            "eb_sqs.tests.worker.tests_bulk_tasks.sum_task",
+        )
+
+    @mock_aws()
+    def test_service_groups_batch_messages(self):
+        SqsConnection.reset_default()
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        for value in range(3):
+            queue.send_message(MessageBody=self._create_msg(recording_batch_task, [value]))
+        queue.send_message(MessageBody=self._create_msg(square_task, [2]))
+
+        batch_sizes.clear()
+        WorkerService().process_messages([queue], self.worker, [queue])
+
+        self.assertEqual(batch_sizes, [3])
+        queue.reload()
+        self.assertEqual(queue.attributes["ApproximateNumberOfMessages"], "0")
+        self.assertEqual(queue.attributes["ApproximateNumberOfMessagesNotVisible"], "0")
+
+    @mock_aws()
+    def test_service_executes_batch_with_invalid_message(self):
+        SqsConnection.reset_default()
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        for value in range(3):
+            queue.send_message(MessageBody=self._create_msg(recording_batch_task, [value]))
+        queue.send_message(
+            MessageBody="invalid",
+            MessageAttributes={
+                "func": {
+                    "DataType": "String",
+                    "StringValue": "eb_sqs.tests.worker.tests_bulk_tasks.recording_batch_task",
+                }
+            },
+        )
+
+        batch_sizes.clear()
+        WorkerService().process_messages([queue], self.worker, [queue])
+
+        self.assertEqual(batch_sizes, [3])
+
+    @mock_aws()
+    def test_linger_messages(self):
+        SqsConnection.reset_default()
+        settings.BATCH_LINGER_S = 0.5
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        for value in range(25):
+            queue.send_message(MessageBody=self._create_msg(recording_batch_task, [value]))
+
+        batch_sizes.clear()
+        try:
+            WorkerService().process_messages([queue], self.worker, [queue])
+        finally:
+            settings.BATCH_LINGER_S = 0
+
+        self.assertEqual(batch_sizes, [25])
+
+    @mock_aws()
+    def test_messages_parsed_once(self):
+        SqsConnection.reset_default()
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        for value in range(2):
+            queue.send_message(MessageBody=self._create_msg(recording_batch_task, [value]))
+        queue.send_message(MessageBody=self._create_msg(square_task, [2]))
+
+        batch_sizes.clear()
+        with patch.object(
+            WorkerTask, "deserialize", wraps=WorkerTask.deserialize
+        ) as deserialize_mock:
+            WorkerService().process_messages([queue], self.worker, [queue])
+
+        self.assertEqual(batch_sizes, [2])
+        self.assertEqual(deserialize_mock.call_count, 3)
+
+    @mock_aws()
+    def test_no_linger_without_batch_tasks(self):
+        SqsConnection.reset_default()
+        settings.BATCH_LINGER_S = 0.5
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        for value in range(10):
+            queue.send_message(MessageBody=self._create_msg(square_task, [value]))
+
+        try:
+            with patch.object(WorkerService, "linger_messages") as linger_mock:
+                WorkerService().process_messages([queue], self.worker, [queue])
+        finally:
+            settings.BATCH_LINGER_S = 0
+
+        linger_mock.assert_not_called()
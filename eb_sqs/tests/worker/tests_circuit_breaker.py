@@ -0,0 +1,151 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import boto3
+from moto import mock_aws
+
+from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
+from eb_sqs.decorators import task
+from eb_sqs.worker.circuit_breaker import CircuitBreaker
+from eb_sqs.worker.queue_client import QueueClient
+from eb_sqs.worker.service import WorkerService
+from eb_sqs.worker.worker import Worker
+from eb_sqs.worker.worker_exceptions import (
+    ExecutionFailedException,
+    TaskCircuitOpenException,
+)
+
+
+@task()
+def failing_task():
+    raise RuntimeError("unavailable")
+
+
+class CircuitBreakerTestCase(TestCase):
+    def setUp(self):
+        settings.CIRCUIT_BREAKER_FAILURE_RATE = 0.5
+        settings.CIRCUIT_BREAKER_MIN_CALLS = 4
+        settings.CIRCUIT_BREAKER_COOLDOWN_S = 60
+        settings.CIRCUIT_BREAKER_PROBES = 2
+
+    def tearDown(self):
+        settings.CIRCUIT_BREAKER_FAILURE_RATE = None
+        settings.CIRCUIT_BREAKER_MIN_CALLS = 20
+        settings.CIRCUIT_BREAKER_COOLDOWN_S = 30
+        settings.CIRCUIT_BREAKER_PROBES = 1
+
+
+class CircuitBreakerTest(CircuitBreakerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.breaker = CircuitBreaker("test")
+
+    def test_opens_at_failure_rate(self):
+        for success in [True, False, True]:
+            self.breaker.record(success)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.acquire(10), 0)
+        self.assertGreater(self.breaker.retry_after, 1)
+
+    def test_stays_closed_below_failure_rate(self):
+        for success in [True, True, True, False, True, False]:
+            self.breaker.record(success)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.acquire(10), 10)
+
+    def test_probes_close_breaker(self):
+        self.breaker._open()
+        settings.CIRCUIT_BREAKER_COOLDOWN_S = 0
+
+        self.assertEqual(self.breaker.acquire(10), 2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(self.breaker.acquire(), 0)
+
+        self.breaker.record(True)
+        self.breaker.release()
+        self.assertEqual(self.breaker.acquire(), 1)
+
+        self.breaker.record(True)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_probe_reopens_breaker(self):
+        self.breaker._open()
+        settings.CIRCUIT_BREAKER_COOLDOWN_S = 0
+        self.breaker.acquire()
+        settings.CIRCUIT_BREAKER_COOLDOWN_S = 60
+
+        self.breaker.record(False)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.acquire(), 0)
+
+
+class TaskCircuitBreakerTest(CircuitBreakerTestCase):
+    def test_worker_defers_failing_task(self):
+        worker = Worker(Mock(autospec=QueueClient))
+        msg = '{"id": "id-1", "retry": 0, "queue": "default", "maxRetries": 0, "args": [], "func": "eb_sqs.tests.worker.tests_circuit_breaker.failing_task", "kwargs": {}}'
+
+        for _ in range(4):
+            with self.assertRaises(ExecutionFailedException):
+                worker.execute(msg)
+
+        with self.assertRaises(TaskCircuitOpenException) as context:
+            worker.execute(msg)
+
+        self.assertEqual(
+            context.exception.task_name,
+            "eb_sqs.tests.worker.tests_circuit_breaker.failing_task",
+        )
+        self.assertGreater(context.exception.retry_after, 0)
+
+
+class QueueCircuitBreakerTest(CircuitBreakerTestCase):
+    def setUp(self):
+        super().setUp()
+        SqsConnection.reset_default()
+
+        self.service = WorkerService()
+        self.worker_mock = Mock(autospec=Worker)
+        self.worker_mock.parse_batch_name.return_value = (None, None)
+        self.worker_mock.execute.side_effect = ExecutionFailedException(
+            "task", RuntimeError()
+        )
+
+    @mock_aws()
+    def test_open_breaker_pauses_queue(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        for i in range(6):
+            queue.send_message(MessageBody=f"msg-{i}")
+
+        with patch.object(
+            self.service, "poll_messages", wraps=self.service.poll_messages
+        ) as poll_mock:
+            self.service.process_messages([queue], self.worker_mock, [queue])
+            self.service.process_messages([queue], self.worker_mock, [queue])
+
+        self.assertEqual(poll_mock.call_count, 1)
+        self.assertGreater(self.service._get_time_until_due([queue]), 0)
+
+    @mock_aws()
+    def test_half_open_breaker_polls_probes(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        for i in range(6):
+            queue.send_message(MessageBody=f"msg-{i}")
+
+        self.service._circuit_breakers.get(queue.url)._open()
+        settings.CIRCUIT_BREAKER_COOLDOWN_S = 0
+        self.worker_mock.execute.side_effect = None
+
+        self.service.process_messages([queue], self.worker_mock, [queue])
+
+        self.assertEqual(self.worker_mock.execute.call_count, 2)
+        self.assertEqual(
+            self.service._circuit_breakers.get(queue.url).state, CircuitBreaker.CLOSED
+        )
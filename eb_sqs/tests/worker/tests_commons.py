@@ -0,0 +1,62 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from eb_sqs import settings
+from eb_sqs.worker.commons import DbConnectionLifecycle, close_unusable_connections
+
+
+@patch("eb_sqs.worker.commons.close_old_connections")
+class DbConnectionLifecycleTest(TestCase):
+    def tearDown(self):
+        settings.DB_CONNECTION_CHECK_INTERVAL_S = 10
+
+    def _process_batch(self, lifecycle: DbConnectionLifecycle, num_messages: int):
+        lifecycle.start_batch()
+        for _ in range(num_messages):
+            with lifecycle.message():
+                pass
+        lifecycle.finish_batch()
+
+    def test_message_lifecycle(self, close_mock: Mock):
+        self._process_batch(DbConnectionLifecycle("message"), 3)
+
+        self.assertEqual(close_mock.call_count, 6)
+
+    def test_batch_lifecycle(self, close_mock: Mock):
+        self._process_batch(DbConnectionLifecycle("batch"), 3)
+
+        self.assertEqual(close_mock.call_count, 2)
+
+    def test_interval_lifecycle(self, close_mock: Mock):
+        lifecycle = DbConnectionLifecycle("interval")
+
+        self._process_batch(lifecycle, 3)
+        self.assertEqual(close_mock.call_count, 0)
+
+        settings.DB_CONNECTION_CHECK_INTERVAL_S = 0
+        self._process_batch(lifecycle, 3)
+        self.assertEqual(close_mock.call_count, 2)
+
+    def test_invalid_lifecycle(self, close_mock: Mock):
+        with self.assertRaises(ValueError):
+            DbConnectionLifecycle("request")
+
+
+class CloseUnusableConnectionsTest(TestCase):
+    def _connection(self, errors_occurred: bool, usable: bool):
+        conn = Mock(errors_occurred=errors_occurred, in_atomic_block=False)
+        conn.is_usable.return_value = usable
+        return conn
+
+    def test_closes_broken_connections_only(self):
+        healthy = self._connection(False, True)
+        failed = self._connection(True, True)
+        broken = self._connection(True, False)
+
+        with patch("eb_sqs.worker.commons.connections") as connections_mock:
+            connections_mock.all.return_value = [healthy, failed, broken]
+            close_unusable_connections()
+
+        healthy.is_usable.assert_not_called()
+        failed.close.assert_not_called()
+        broken.close.assert_called_once()
@@ -0,0 +1,117 @@
+import threading
+from unittest import TestCase
+from unittest.mock import Mock
+
+import boto3
+import django.dispatch
+from moto import mock_aws
+
+from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
+from eb_sqs.decorators import task
+from eb_sqs.worker.events import BatchEvent, EventDispatcher, MessageOutcome
+from eb_sqs.worker.queue_client import QueueClient
+from eb_sqs.worker.service import BATCH_PROCESSED, WorkerService
+from eb_sqs.worker.worker import Worker
+
+
+@task()
+def succeeding_task():
+    pass
+
+
+@task()
+def failing_task():
+    raise RuntimeError("broken")
+
+
+class BatchEventTest(TestCase):
+    def setUp(self):
+        SqsConnection.reset_default()
+        self.events = []
+        BATCH_PROCESSED.connect(self._receive, sender=WorkerService)
+
+    def tearDown(self):
+        BATCH_PROCESSED.disconnect(self._receive, sender=WorkerService)
+
+    def _receive(self, sender: type, event: BatchEvent, **kwargs):
+        self.events.append(event)
+
+    def _msg(self, task_id: str, func: str):
+        return (
+            f'{{"id": "{task_id}", "retry": 0, "queue": "default", "maxRetries": 0, "args": [],'
+            f' "func": "eb_sqs.tests.worker.tests_events.{func}", "kwargs": {{}}}}'
+        )
+
+    @mock_aws()
+    def test_batch_processed(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        queue.send_message(MessageBody=self._msg("id-1", "succeeding_task"))
+        queue.send_message(MessageBody=self._msg("id-2", "failing_task"))
+
+        WorkerService().process_messages(
+            [queue], Worker(Mock(autospec=QueueClient)), [queue]
+        )
+
+        self.assertEqual(len(self.events), 1)
+        event = self.events[0]
+        self.assertEqual(event.queue_name, "eb-sqs-default")
+        self.assertEqual((event.succeeded, event.failed), (1, 1))
+
+        messages = {message.task_id: message for message in event.messages}
+        self.assertEqual(
+            messages["id-1"].func_name,
+            "eb_sqs.tests.worker.tests_events.succeeding_task",
+        )
+        self.assertEqual(messages["id-1"].outcome, MessageOutcome.SUCCEEDED)
+        self.assertEqual(messages["id-2"].outcome, MessageOutcome.FAILED)
+        self.assertIsInstance(messages["id-2"].error.caught, RuntimeError)
+
+
+class EventDispatcherTest(TestCase):
+    def setUp(self):
+        self.signal = django.dispatch.Signal()
+
+    def test_sync_dispatch_isolates_listener_errors(self):
+        received = []
+
+        def failing_listener(sender: None, **kwargs):
+            raise RuntimeError()
+
+        self.signal.connect(failing_listener, weak=False)
+        self.signal.connect(lambda sender, **kwargs: received.append(kwargs), weak=False)
+
+        EventDispatcher(asynchronous=False).dispatch(self.signal, sender=None, value=1)
+
+        self.assertEqual(received, [{"signal": self.signal, "value": 1}])
+
+    def test_async_dispatch(self):
+        threads = []
+        self.signal.connect(
+            lambda sender, **kwargs: threads.append(threading.current_thread()),
+            weak=False,
+        )
+        dispatcher = EventDispatcher(asynchronous=True)
+
+        for _ in range(3):
+            dispatcher.dispatch(self.signal, sender=None)
+        dispatcher.close(5)
+
+        self.assertEqual(len(threads), 3)
+        self.assertNotEqual(threads[0], threading.current_thread())
+
+    def test_async_dispatch_drops_events_when_full(self):
+        settings.EVENTS_QUEUE_SIZE = 1
+        release = threading.Event()
+        self.signal.connect(lambda sender, **kwargs: release.wait(5), weak=False)
+        try:
+            dispatcher = EventDispatcher(asynchronous=True)
+            for _ in range(5):
+                dispatcher.dispatch(self.signal, sender=None)
+        finally:
+            settings.EVENTS_QUEUE_SIZE = 10000
+            release.set()
+        dispatcher.close(5)
+
+        self.assertGreaterEqual(dispatcher.dropped, 3)
@@ -0,0 +1,153 @@
+import json
+import os
+import tempfile
+from time import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+import boto3
+from django.core.management import call_command
+from moto import mock_aws
+
+from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
+from eb_sqs.worker.health import WorkerHealth, get_child_health_file_name
+from eb_sqs.worker.service import WorkerService
+from eb_sqs.worker.worker import Worker
+from eb_sqs.worker.worker_exceptions import ExecutionFailedException
+
+
+class WorkerHealthTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "healthcheck.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write(self):
+        health = WorkerHealth()
+        health.record_poll("queue1", 3)
+        health.task_started_now("app.tasks.task")
+        health.task_finished(2, 1)
+
+        health.write(self.file_name)
+
+        with open(self.file_name) as file:
+            status = json.load(file)
+        self.assertIn("queue1", status["last_polls"])
+        self.assertIsNone(status["current_task"])
+        self.assertIsNotNone(status["last_task_duration_s"])
+        self.assertEqual(status["backlog"], 1)
+        self.assertEqual(status["error_rate"], 0.5)
+        self.assertEqual(os.listdir(self.directory.name), ["healthcheck.txt"])
+
+    @mock_aws()
+    def test_service_records_progress(self):
+        settings.SHUTDOWN_TIMEOUT_S = 0
+        SqsConnection.reset_default()
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="eb-sqs-default")
+        for i in range(3):
+            queue.send_message(MessageBody=f"msg-{i}")
+        worker_mock = Mock(autospec=Worker)
+        worker_mock.parse_batch_name.return_value = (None, None)
+        worker_mock.execute.side_effect = [
+            None,
+            ExecutionFailedException("task", Exception()),
+            None,
+        ]
+        service = WorkerService()
+
+        service.process_messages([queue], worker_mock, [queue])
+
+        self.assertIn("eb-sqs-default", service.health.last_polls)
+        self.assertIsNone(service.health.current_task)
+        self.assertEqual(service.health.backlog, 0)
+        self.assertEqual(service.health.processed, 3)
+        self.assertEqual(service.health.failed, 1)
+
+
+class HealthcheckCommandTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        settings.HEALTHCHECK_FILE_NAME = os.path.join(
+            self.directory.name, "healthcheck.txt"
+        )
+        self.unhealthy_period_s = settings.HEALTHCHECK_UNHEALTHY_PERIOD_S
+        settings.HEALTHCHECK_UNHEALTHY_PERIOD_S = 60
+        self.max_task_s = settings.HEALTHCHECK_MAX_TASK_S
+        settings.HEALTHCHECK_MAX_TASK_S = 60
+
+    def tearDown(self):
+        settings.HEALTHCHECK_UNHEALTHY_PERIOD_S = self.unhealthy_period_s
+        settings.HEALTHCHECK_FILE_NAME = "healthcheck.txt"
+        settings.HEALTHCHECK_MAX_TASK_S = self.max_task_s
+        self.directory.cleanup()
+
+    def _write(self, file_name=None, **status):  # noqa: ANN001
+        with open(file_name or settings.HEALTHCHECK_FILE_NAME, "w") as file:
+            json.dump({"updated": time(), "last_loop": time(), **status}, file)
+
+    def _is_healthy(self) -> bool:
+        try:
+            call_command("healthcheck")
+        except SystemExit:
+            return False
+        return True
+
+    def test_healthy(self):
+        self._write()
+
+        self.assertTrue(self._is_healthy())
+
+    def test_missing_file(self):
+        self.assertFalse(self._is_healthy())
+
+    def test_not_updated(self):
+        self._write(updated=time() - 120)
+
+        self.assertFalse(self._is_healthy())
+
+    def test_not_polling(self):
+        self._write(last_loop=time() - 120)
+
+        self.assertFalse(self._is_healthy())
+
+    def test_busy_with_long_task(self):
+        self._write(
+            last_loop=time() - 30,
+            current_task="app.tasks.task",
+            task_started=time() - 30,
+        )
+
+        self.assertTrue(self._is_healthy())
+
+        self._write(
+            last_loop=time() - 120,
+            current_task="app.tasks.task",
+            task_started=time() - 120,
+        )
+
+        self.assertFalse(self._is_healthy())
+
+        settings.HEALTHCHECK_MAX_TASK_S = 0
+
+        self.assertTrue(self._is_healthy())
+
+    def test_child_files(self):
+        self._write(get_child_health_file_name(1))
+        with open(get_child_health_file_name(2) + ".2.tmp", "w") as file:
+            file.write("partial")
+
+        self.assertTrue(self._is_healthy())
+
+        self._write(get_child_health_file_name(2), last_loop=time() - 120)
+
+        self.assertFalse(self._is_healthy())
+
+    def test_legacy_file(self):
+        with open(settings.HEALTHCHECK_FILE_NAME, "w") as file:
+            file.write("2020-01-01T00:00:00+00:00")
+
+        self.assertFalse(self._is_healthy())
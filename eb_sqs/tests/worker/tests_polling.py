@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+from eb_sqs import settings
+from eb_sqs.worker.polling import IdleBackoff, PollStats
+
+
+class IdleBackoffTest(TestCase):
+    def setUp(self):
+        settings.IDLE_BACKOFF_MAX_S = 20
+        settings.WAIT_TIME_S = 2
+
+        self.backoff = IdleBackoff()
+
+    def tearDown(self):
+        settings.IDLE_BACKOFF_MAX_S = 0
+
+    def test_backoff_grows_up_to_max(self):
+        backoffs = []
+        for _ in range(6):
+            self.backoff.record("queue", 0, False)
+            backoffs.append(self.backoff.get_backoff_s("queue"))
+
+        self.assertEqual(backoffs, [2, 4, 8, 16, 20, 20])
+        self.assertFalse(self.backoff.is_due("queue"))
+
+    def test_backoff_reset_on_messages(self):
+        self.backoff.record("queue", 0, False)
+        self.backoff.record("queue", 3, False)
+
+        self.assertEqual(self.backoff.get_backoff_s("queue"), 0)
+        self.assertTrue(self.backoff.is_due("queue"))
+
+    def test_exclusive_queue_long_polls(self):
+        for _ in range(3):
+            self.backoff.record("queue", 0, True)
+
+        self.assertTrue(self.backoff.is_due("queue"))
+        self.assertEqual(self.backoff.get_wait_time_s("queue", True), 8)
+        self.assertEqual(self.backoff.get_wait_time_s("queue", False), 2)
+
+    def test_time_until_due(self):
+        self.backoff.record("queue1", 0, False)
+        self.backoff.record("queue1", 0, False)
+        self.backoff.record("queue2", 0, False)
+
+        self.assertAlmostEqual(
+            self.backoff.get_time_until_due(["queue1", "queue2"]), 2, delta=0.5
+        )
+        self.assertEqual(self.backoff.get_time_until_due(["queue1", "queue3"]), 0)
+
+    def test_disabled(self):
+        settings.IDLE_BACKOFF_MAX_S = 0
+
+        self.backoff.record("queue", 0, False)
+
+        self.assertTrue(self.backoff.is_due("queue"))
+        self.assertEqual(self.backoff.get_wait_time_s("queue", True), 2)
+
+
+class PollStatsTest(TestCase):
+    def test_empty_receive_rate(self):
+        stats = PollStats()
+
+        stats.record(0)
+        stats.record(5)
+        stats.record(0)
+        stats.record(0)
+
+        self.assertEqual(stats.receives, 4)
+        self.assertEqual(stats.empty_receives, 3)
+        self.assertEqual(stats.empty_receive_rate, 0.75)
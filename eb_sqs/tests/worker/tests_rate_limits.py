@@ -0,0 +1,91 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from django.core.cache import cache
+
+from eb_sqs.decorators import task
+from eb_sqs.worker.queue_client import QueueClient
+from eb_sqs.worker.rate_limits import (
+    CacheRateLimitBackend,
+    LocalRateLimitBackend,
+    TaskLimiter,
+    TaskLimits,
+    register_task_limits,
+)
+from eb_sqs.worker.worker import Worker
+from eb_sqs.worker.worker_exceptions import TaskRateLimitedException
+
+
+@task(rate_limit="2/h")
+def rate_limited_task():
+    return "done"
+
+
+class TaskLimitsTest(TestCase):
+    def test_parse_rate(self):
+        self.assertEqual(TaskLimits.parse_rate("100/s"), (100, 1))
+        self.assertEqual(TaskLimits.parse_rate("10/m"), (10, 60))
+        self.assertEqual(TaskLimits.parse_rate("5/h"), (5, 3600))
+
+    def test_parse_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TaskLimits.parse_rate("100/d")
+
+        with self.assertRaises(ValueError):
+            TaskLimits("fast", None)
+
+
+class RateLimitBackendTest(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    def _test_backend(self, backend):  # noqa: ANN001
+        self.assertEqual(backend.acquire_rate("task", 2, 60), 0)
+        self.assertEqual(backend.acquire_rate("task", 2, 60), 0)
+        self.assertGreater(backend.acquire_rate("task", 2, 60), 0)
+        self.assertEqual(backend.acquire_rate("other", 2, 60), 0)
+
+        self.assertTrue(backend.acquire_slot("task", 2))
+        self.assertTrue(backend.acquire_slot("task", 2))
+        self.assertFalse(backend.acquire_slot("task", 2))
+        backend.release_slot("task")
+        self.assertTrue(backend.acquire_slot("task", 2))
+
+    def test_local_backend(self):
+        self._test_backend(LocalRateLimitBackend())
+
+    def test_cache_backend(self):
+        self._test_backend(CacheRateLimitBackend())
+
+
+class TaskLimiterTest(TestCase):
+    def setUp(self):
+        self.limiter = TaskLimiter(LocalRateLimitBackend())
+
+    def test_max_concurrency(self):
+        register_task_limits("limited", None, 1)
+
+        with self.limiter.limit("limited"), self.assertRaises(
+            TaskRateLimitedException
+        ), self.limiter.limit("limited"):
+            pass
+
+        with self.limiter.limit("limited"):
+            pass
+
+    def test_unlimited(self):
+        for _ in range(100):
+            with self.limiter.limit("unlimited"):
+                pass
+
+    def test_worker_defers_rate_limited_task(self):
+        worker = Worker(Mock(autospec=QueueClient))
+        worker.task_limiter = self.limiter
+        msg = '{"id": "id-1", "retry": 0, "queue": "default", "maxRetries": 0, "args": [], "func": "eb_sqs.tests.worker.tests_rate_limits.rate_limited_task", "kwargs": {}}'
+
+        self.assertEqual(worker.execute(msg), "done")
+        self.assertEqual(worker.execute(msg), "done")
+        with self.assertRaises(TaskRateLimitedException) as context:
+            worker.execute(msg)
+
+        self.assertGreater(context.exception.retry_after, 0)
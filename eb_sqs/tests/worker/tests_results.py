@@ -0,0 +1,198 @@
+from typing import Any
+from unittest import TestCase
+from unittest.mock import Mock
+
+from eb_sqs import settings
+from eb_sqs.decorators import task
+from eb_sqs.worker.queue_client import QueueClient
+from eb_sqs.worker.results import (
+    AsyncResult,
+    CacheResultBackend,
+    InMemoryResultBackend,
+    ResultBackend,
+    TaskState,
+    TaskStatus,
+)
+from eb_sqs.worker.worker import Worker
+from eb_sqs.worker.worker_exceptions import (
+    ExecutionFailedException,
+    MaxRetriesReachedException,
+    PartialBatchFailureException,
+)
+from eb_sqs.worker.worker_task import TaskCall, WorkerTask
+
+
+@task()
+def add_task(a: int, b: int):
+    return a + b
+
+
+@task(max_retries=2)
+def retried_task():
+    retried_task.retry()
+
+
+@task()
+def failing_task():
+    raise RuntimeError("broken")
+
+
+@task(max_retries=2)
+def retried_call_task(value: int):
+    if value < 0:
+        retried_call_task.retry()
+
+
+@task(batch=True, max_retries=2)
+def partially_failing_batch_task(calls: list):
+    failures = [index for index, call in enumerate(calls) if call.args[0] < 0]
+    if failures:
+        raise PartialBatchFailureException(failures)
+
+
+class ResultBackendTest(TestCase):
+    def _test_backend(self, backend: ResultBackend):
+        backend.set_status("id-1", TaskStatus(TaskState.SUCCESS, 3), 60)
+        backend.set_status("id-2", TaskStatus(TaskState.FAILURE, error="broken"), 60)
+
+        statuses = backend.get_statuses(["id-1", "id-2", "id-3"])
+
+        self.assertEqual(set(statuses), {"id-1", "id-2"})
+        self.assertEqual(statuses["id-1"].result, 3)
+        self.assertEqual(statuses["id-2"].error, "broken")
+        self.assertIsNone(backend.get_status("id-3"))
+
+    def test_in_memory_backend(self):
+        self._test_backend(InMemoryResultBackend())
+
+    def test_in_memory_backend_expires(self):
+        backend = InMemoryResultBackend()
+        backend.set_status("id-1", TaskStatus(TaskState.SUCCESS), 0)
+
+        self.assertIsNone(backend.get_status("id-1"))
+
+    def test_cache_backend(self):
+        self._test_backend(CacheResultBackend())
+
+
+class AsyncResultTest(TestCase):
+    def setUp(self):
+        self.backend = InMemoryResultBackend()
+
+    def test_unknown_task_is_pending(self):
+        result = AsyncResult("id-1", self.backend)
+
+        self.assertEqual(result.state, TaskState.PENDING)
+        self.assertFalse(result.ready())
+        with self.assertRaises(TimeoutError):
+            result.get(timeout_s=0.1, interval_s=0.05)
+
+    def test_get(self):
+        self.backend.set_status("id-1", TaskStatus(TaskState.SUCCESS, 3), 60)
+        self.backend.set_status("id-2", TaskStatus(TaskState.FAILURE, error="x"), 60)
+
+        self.assertEqual(AsyncResult("id-1", self.backend).get(), 3)
+        self.assertTrue(AsyncResult("id-1", self.backend).successful())
+        with self.assertRaises(RuntimeError):
+            AsyncResult("id-2", self.backend).get()
+
+    def test_get_statuses(self):
+        self.backend.set_status("id-1", TaskStatus(TaskState.STARTED), 60)
+
+        statuses = AsyncResult.get_statuses(
+            [AsyncResult("id-1"), "id-2"], self.backend
+        )
+
+        self.assertEqual(list(statuses), ["id-1"])
+        self.assertEqual(statuses["id-1"].state, TaskState.STARTED)
+
+
+class WorkerResultTest(TestCase):
+    def setUp(self):
+        settings.RESULT_BACKEND = InMemoryResultBackend()
+        settings.EXECUTE_INLINE = False
+        self.queue_mock = Mock(autospec=QueueClient)
+        self.worker = Worker(self.queue_mock)
+
+    def tearDown(self):
+        settings.RESULT_BACKEND = None
+
+    def _msg(self, func: str, args: str = "[]", retry: int = 0, max_retries: int = 0):
+        return (
+            f'{{"id": "id-1", "retry": {retry}, "queue": "default", "maxRetries": {max_retries},'
+            f' "args": {args}, "func": "eb_sqs.tests.worker.tests_results.{func}", "kwargs": {{}}}}'
+        )
+
+    def test_delay_returns_async_result(self):
+        result = add_task.delay(1, 2)
+
+        self.assertIsInstance(result, AsyncResult)
+        self.assertEqual(result.state, TaskState.PENDING)
+
+    def test_delay_without_backend_returns_none(self):
+        settings.RESULT_BACKEND = None
+
+        self.assertIsNone(add_task.delay(1, 2))
+
+    def test_success(self):
+        self.worker.execute(self._msg("add_task", "[1, 2]"))
+
+        result = AsyncResult("id-1")
+        self.assertEqual(result.state, TaskState.SUCCESS)
+        self.assertEqual(result.get(), 3)
+
+    def test_failure(self):
+        with self.assertRaises(ExecutionFailedException):
+            self.worker.execute(self._msg("failing_task"))
+
+        status = AsyncResult("id-1").status
+        assert status is not None
+        self.assertEqual(status.state, TaskState.FAILURE)
+        self.assertIn("broken", status.error or "")
+
+    def test_retry(self):
+        self.worker.execute(self._msg("retried_task", max_retries=2))
+
+        self.assertEqual(AsyncResult("id-1").state, TaskState.RETRY)
+
+    def test_max_retries_reached(self):
+        with self.assertRaises(MaxRetriesReachedException):
+            self.worker.execute(self._msg("retried_task", retry=1, max_retries=2))
+
+        self.assertEqual(AsyncResult("id-1").state, TaskState.FAILURE)
+
+    def test_failing_backend_does_not_fail_task(self):
+        settings.RESULT_BACKEND = Mock(autospec=InMemoryResultBackend)
+        settings.RESULT_BACKEND.set_status.side_effect = RuntimeError()
+
+        self.assertEqual(self.worker.execute(self._msg("add_task", "[1, 2]")), 3)
+
+    def _create_msg(self, task_id: str, func: Any, values: list):
+        return WorkerTask(
+            task_id,
+            None,
+            "default",
+            func,
+            (),
+            {},
+            2,
+            0,
+            None,
+            [TaskCall([value], {}) for value in values],
+        ).serialize()
+
+    def test_partially_failed_batch(self):
+        self.worker.execute_batch(
+            [
+                self._create_msg("id-good", partially_failing_batch_task, [1]),
+                self._create_msg("id-bad", partially_failing_batch_task, [-1]),
+            ]
+        )
+
+        self.assertEqual(AsyncResult("id-good").state, TaskState.SUCCESS)
+        self.assertEqual(AsyncResult("id-bad").state, TaskState.RETRY)
+
+    def test_retried_bulk_call(self):
+        self.worker.execute(self._create_msg("id-1", retried_call_task, [1, -1]))
+
+        self.assertEqual(AsyncResult("id-1").state, TaskState.RETRY)
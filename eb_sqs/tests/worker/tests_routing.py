@@ -0,0 +1,100 @@
+import re
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from eb_sqs import settings
+from eb_sqs.decorators import task
+from eb_sqs.worker.queue_client import QueueClient
+from eb_sqs.worker.routing import TaskRoute, TaskRouter
+from eb_sqs.worker.worker import Worker
+from eb_sqs.worker.worker_factory import WorkerFactory
+
+
+@task(queue_name="reports")
+def report_task(num: int):
+    pass
+
+
+class TaskRouterTest(TestCase):
+    def test_first_matching_route(self):
+        router = TaskRouter(
+            [
+                ("app.reports.daily", "daily"),
+                ("app.reports.*", "reports"),
+                (re.compile(r"app\.(mail|sms)\..+"), "notifications"),
+            ]
+        )
+
+        routes = [
+            router.get_route(func_name)
+            for func_name in ["app.reports.daily", "app.reports.weekly", "app.sms.send"]
+        ]
+        self.assertEqual(
+            [route.get_queue() if route else None for route in routes],
+            ["daily", "reports", "notifications"],
+        )
+        self.assertIsNone(router.get_route("app.reporting.daily"))
+
+    def test_weighted_shards(self):
+        route = TaskRoute("*", {"shard-1": 1, "shard-2": 3})
+
+        with patch("eb_sqs.worker.routing.random.random", side_effect=[0.2, 0.3]):
+            self.assertEqual(route.get_queue(), "shard-1")
+            self.assertEqual(route.get_queue(), "shard-2")
+
+    def test_shards(self):
+        route = TaskRoute("*", ["shard-1", "shard-2"])
+
+        queues = {route.get_queue() for _ in range(100)}
+
+        self.assertEqual(queues, {"shard-1", "shard-2"})
+
+    def test_invalid_route(self):
+        with self.assertRaises(ValueError):
+            TaskRoute("*", {"shard-1": 0})
+        with self.assertRaises(ValueError):
+            TaskRoute("*", [])
+
+
+class TaskRoutingTest(TestCase):
+    def setUp(self):
+        settings.EXECUTE_INLINE = False
+        self.queue_mock = Mock(autospec=QueueClient)
+        self.queue_mock.add_messages.return_value = []
+
+        factory_mock = Mock(autospec=WorkerFactory)
+        factory_mock.create.return_value = Worker(self.queue_mock)
+        settings.WORKER_FACTORY = factory_mock
+
+    def tearDown(self):
+        settings.TASK_ROUTES = []
+
+    def test_delay_without_route(self):
+        report_task.delay(1)
+
+        self.assertEqual(self.queue_mock.add_message.call_args[0][0], "reports")
+
+    def test_delay_routed(self):
+        settings.TASK_ROUTES = [("eb_sqs.tests.worker.tests_routing.*", "isolated")]
+
+        report_task.delay(1)
+
+        self.assertEqual(self.queue_mock.add_message.call_args[0][0], "isolated")
+
+    def test_delay_queue_name_overrides_route(self):
+        settings.TASK_ROUTES = [("eb_sqs.tests.worker.tests_routing.*", "isolated")]
+
+        report_task.delay(1, queue_name="explicit")
+
+        self.assertEqual(self.queue_mock.add_message.call_args[0][0], "explicit")
+
+    def test_map_spreads_chunks_across_shards(self):
+        settings.TASK_ROUTES = [
+            ("eb_sqs.tests.worker.tests_routing.report_task", ["shard-1", "shard-2"])
+        ]
+
+        result = report_task.map(range(200), chunk_size=1)
+
+        queues = {call[0][0] for call in self.queue_mock.add_messages.call_args_list}
+        self.assertEqual(queues, {"shard-1", "shard-2"})
+        self.assertEqual(result.sent, 200)
@@ -0,0 +1,110 @@
+from unittest import TestCase
+
+from django.core.cache import cache
+
+from eb_sqs.worker.sharding import (
+    CacheMembershipBackend,
+    ConsistentHashRing,
+    InMemoryMembershipBackend,
+    QueueSharder,
+)
+
+
+class ConsistentHashRingTest(TestCase):
+    def test_members_distinct(self):
+        ring = ConsistentHashRing(["w1", "w2", "w3"], 100)
+
+        members = ring.get_members("tenant-1", 2)
+
+        self.assertEqual(len(set(members)), 2)
+
+    def test_members_limited_to_ring(self):
+        ring = ConsistentHashRing(["w1"], 100)
+
+        self.assertEqual(ring.get_members("tenant-1", 3), ["w1"])
+
+    def test_rebalancing_moves_few_keys(self):
+        keys = [f"tenant-{i}" for i in range(1000)]
+        ring = ConsistentHashRing(["w1", "w2", "w3", "w4"], 100)
+        grown_ring = ConsistentHashRing(["w1", "w2", "w3", "w4", "w5"], 100)
+
+        moved = [
+            key for key in keys if ring.get_members(key, 1) != grown_ring.get_members(key, 1)
+        ]
+
+        # about a fifth of the keys move to the new member
+        self.assertLess(len(moved), 350)
+        self.assertTrue(all(grown_ring.get_members(key, 1) == ["w5"] for key in moved))
+
+
+class QueueSharderTest(TestCase):
+    def setUp(self):
+        self.backend = InMemoryMembershipBackend()
+
+    def _sharders(self, count: int, replicas: int) -> list:
+        sharders = [
+            QueueSharder("group", replicas, self.backend, member_id=f"w{i}")
+            for i in range(count)
+        ]
+        for sharder in sharders:
+            sharder.heartbeat(force=True)
+        for sharder in sharders:
+            sharder.heartbeat(force=True)
+        return sharders
+
+    def test_queues_assigned_to_replicas(self):
+        sharders = self._sharders(4, 2)
+
+        for i in range(100):
+            assigned = [s for s in sharders if s.is_assigned(f"tenant-{i}")]
+            self.assertEqual(len(assigned), 2)
+
+    def test_rebalance_on_leave(self):
+        sharders = self._sharders(2, 1)
+
+        sharders[1].leave()
+
+        self.assertTrue(sharders[0].heartbeat(force=True))
+        self.assertTrue(all(sharders[0].is_assigned(f"tenant-{i}") for i in range(100)))
+
+    def test_single_worker_polls_all_queues(self):
+        sharder = QueueSharder("group", 1, self.backend, member_id="w1")
+
+        self.assertTrue(sharder.is_assigned("tenant-1"))
+
+
+class CacheMembershipBackendTest(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    def test_members(self):
+        backend = CacheMembershipBackend()
+
+        backend.heartbeat("group", "w1", 30)
+        backend.heartbeat("group", "w2", 30)
+        backend.heartbeat("other", "w3", 30)
+        backend.leave("group", "w2")
+
+        self.assertEqual(backend.get_members("group"), ["w1"])
+
+    def test_member_dropped_from_index(self):
+        backend = CacheMembershipBackend()
+
+        backend.heartbeat("group", "w1", 30)
+        backend.heartbeat("group", "w2", 30)
+        # a concurrent index update lost w2
+        cache.set(backend._index_key("group"), ["w1"])
+        backend.heartbeat("group", "w1", 30)
+
+        self.assertEqual(backend.get_members("group"), ["w1"])
+
+        backend.heartbeat("group", "w2", 30)
+
+        self.assertEqual(backend.get_members("group"), ["w1", "w2"])
+
+    def test_expired_members(self):
+        backend = CacheMembershipBackend()
+
+        backend.heartbeat("group", "w1", -1)
+
+        self.assertEqual(backend.get_members("group"), [])
@@ -0,0 +1,28 @@
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from eb_sqs.worker.sqs_worker_factory import SqsWorkerFactory
+
+
+class SqsWorkerFactoryTest(TestCase):
+    def test_worker_per_thread(self):
+        workers = []
+
+        thread = threading.Thread(
+            target=lambda: workers.append(SqsWorkerFactory().create())
+        )
+        thread.start()
+        thread.join()
+
+        worker = SqsWorkerFactory().create()
+        self.assertIs(worker, SqsWorkerFactory().create())
+        self.assertIsNot(worker, workers[0])
+
+    def test_worker_rebuilt_after_fork(self):
+        worker = SqsWorkerFactory().create()
+
+        with patch("eb_sqs.worker.sqs_worker_factory.os.getpid", return_value=-1):
+            forked_worker = SqsWorkerFactory().create()
+
+        self.assertIsNot(worker, forked_worker)
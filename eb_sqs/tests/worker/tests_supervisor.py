@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import signal
+import time
+from unittest import TestCase, skipUnless
+from unittest.mock import Mock, patch
+
+from eb_sqs.worker.commons import get_process_rss_mb
+from eb_sqs.worker.service import WorkerService
+from eb_sqs.worker.supervisor import WorkerSupervisor
+
+
+class ExitingService(WorkerService):
+    def __init__(
+        self,
+        max_tasks: int | None = None,
+        max_memory_mb: int | None = None,
+        health_file_name: str | None = None,
+    ) -> None:
+        self.max_tasks = max_tasks
+        self.max_memory_mb = max_memory_mb
+
+    def process_queues(self, queue_names: list) -> None:
+        pass
+
+
+class CrashingService(ExitingService):
+    def process_queues(self, queue_names: list) -> None:
+        raise Exception("Crash")
+
+
+class SleepingService(ExitingService):
+    def process_queues(self, queue_names: list) -> None:
+        time.sleep(30)
+
+
+class WorkerSupervisorTest(TestCase):
+    def _wait_for_children(self, supervisor: WorkerSupervisor) -> None:
+        deadline = time.monotonic() + 5
+        while supervisor._children and time.monotonic() < deadline:
+            supervisor._reap_children()
+            time.sleep(0.01)
+
+    def test_child_exit_is_reaped(self):
+        supervisor = WorkerSupervisor(["queue"], 1, service_factory=ExitingService)
+
+        supervisor._spawn_child()
+        self.assertEqual(len(supervisor._children), 1)
+
+        self._wait_for_children(supervisor)
+
+        self.assertEqual(len(supervisor._children), 0)
+        self.assertIsNone(supervisor._last_crash_time)
+        self.assertTrue(supervisor._can_spawn())
+
+    def test_child_crash_delays_restart(self):
+        supervisor = WorkerSupervisor(["queue"], 1, service_factory=CrashingService)
+
+        supervisor._spawn_child()
+        self._wait_for_children(supervisor)
+
+        self.assertEqual(len(supervisor._children), 0)
+        self.assertIsNotNone(supervisor._last_crash_time)
+        self.assertFalse(supervisor._can_spawn())
+
+    def test_stop_children(self):
+        supervisor = WorkerSupervisor(["queue"], 2, service_factory=SleepingService)
+
+        supervisor._spawn_child()
+        supervisor._spawn_child()
+        supervisor._stop_children()
+
+        self.assertEqual(len(supervisor._children), 0)
+
+    def test_recycle_children_over_memory(self):
+        supervisor = WorkerSupervisor(
+            ["queue"], 1, max_memory_per_child_mb=10, service_factory=SleepingService
+        )
+        supervisor._children.add(12345)
+
+        with patch(
+            "eb_sqs.worker.supervisor.get_process_rss_mb", return_value=20
+        ), patch("eb_sqs.worker.supervisor.os.kill", Mock()) as kill_mock:
+            supervisor._recycle_children()
+            supervisor._recycle_children()
+
+        kill_mock.assert_called_once_with(12345, signal.SIGTERM)
+
+    @skipUnless(os.path.exists("/proc/self/statm"), "requires procfs")
+    def test_process_rss(self):
+        rss_mb = get_process_rss_mb(os.getpid())
+
+        assert rss_mb is not None
+        self.assertGreater(rss_mb, 0)
+
+    def test_scale_down_drains_children(self):
+        supervisor = WorkerSupervisor(["queue"], 3, service_factory=SleepingService)
+        supervisor._children.update({1, 2, 3})
+
+        with patch("eb_sqs.worker.supervisor.os.kill", Mock()) as kill_mock:
+            supervisor._scale(2)
+
+        kill_mock.assert_called_once_with(3, signal.SIGTERM)
+        self.assertEqual(supervisor._draining, {3})
@@ -0,0 +1,143 @@
+import threading
+from time import sleep
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import boto3
+from moto import mock_aws
+
+from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
+from eb_sqs.decorators import task
+from eb_sqs.worker.queue_client import QueueClient
+from eb_sqs.worker.service import WorkerService
+from eb_sqs.worker.time_limits import (
+    HARD_TIME_LIMIT_EXIT_CODE,
+    TimeLimits,
+    get_time_limits,
+)
+from eb_sqs.worker.worker import Worker
+from eb_sqs.worker.worker_exceptions import (
+    ExecutionFailedException,
+    SoftTimeLimitExceededException,
+)
+
+
+@task(soft_time_limit=0.1)
+def slow_task():
+    sleep(2)
+
+
+@task(soft_time_limit=0.1)
+def cleaning_up_task():
+    try:
+        sleep(2)
+    except SoftTimeLimitExceededException:
+        return "cleaned up"
+
+
+class GetTimeLimitsTest(TestCase):
+    def tearDown(self):
+        settings.SOFT_TIME_LIMIT_S = None
+        settings.HARD_TIME_LIMIT_S = None
+
+    def test_defaults(self):
+        settings.SOFT_TIME_LIMIT_S = 10
+        settings.HARD_TIME_LIMIT_S = 20
+
+        self.assertEqual(get_time_limits(Mock(spec=[])), (10, 20))
+        self.assertEqual(
+            get_time_limits(Mock(soft_time_limit=1, hard_time_limit=None)), (1, 20)
+        )
+
+    def test_task_opts_out_of_defaults(self):
+        settings.SOFT_TIME_LIMIT_S = 10
+        settings.HARD_TIME_LIMIT_S = 20
+
+        self.assertEqual(
+            get_time_limits(Mock(soft_time_limit=0, hard_time_limit=0)), (0, 0)
+        )
+
+
+class SoftTimeLimitTest(TestCase):
+    def setUp(self):
+        self.worker = Worker(Mock(autospec=QueueClient))
+
+    def _msg(self, func: str) -> str:
+        return (
+            '{"id": "id-1", "retry": 0, "queue": "default", "maxRetries": 0, "args": [],'
+            f' "func": "eb_sqs.tests.worker.tests_time_limits.{func}", "kwargs": {{}}}}'
+        )
+
+    def test_soft_time_limit_fails_task(self):
+        with self.assertRaises(ExecutionFailedException) as context:
+            self.worker.execute(self._msg("slow_task"))
+
+        self.assertIsInstance(context.exception.caught, SoftTimeLimitExceededException)
+
+    def test_task_handles_soft_time_limit(self):
+        self.assertEqual(self.worker.execute(self._msg("cleaning_up_task")), "cleaned up")
+
+
+@patch("eb_sqs.worker.time_limits.logging.shutdown")
+@patch("eb_sqs.worker.time_limits.os._exit")
+class HardTimeLimitTest(TestCase):
+    def test_hard_time_limit_exits(self, exit_mock: Mock, shutdown_mock: Mock):
+        time_limits = TimeLimits()
+        time_limits.on_hard_time_limit = Mock()
+
+        with time_limits.limit(None, 0.1):
+            sleep(0.5)
+
+        time_limits.on_hard_time_limit.assert_called_once()
+        exit_mock.assert_called_once_with(HARD_TIME_LIMIT_EXIT_CODE)
+
+    def test_hard_time_limit_of_concurrent_tasks(self, exit_mock: Mock, shutdown_mock: Mock):
+        time_limits = TimeLimits()
+
+        def short_task():
+            with time_limits.limit(None, 5):
+                sleep(0.05)
+
+        with time_limits.limit(None, 0.2):
+            # a task of another thread finishing doesn't lift the limit
+            thread = threading.Thread(target=short_task)
+            thread.start()
+            thread.join()
+            sleep(0.5)
+
+        exit_mock.assert_called_once_with(HARD_TIME_LIMIT_EXIT_CODE)
+
+    def test_task_within_hard_time_limit(self, exit_mock: Mock, shutdown_mock: Mock):
+        time_limits = TimeLimits()
+
+        for _ in range(3):
+            with time_limits.limit(None, 0.2):
+                sleep(0.1)
+        sleep(0.3)
+
+        exit_mock.assert_not_called()
+
+
+class ReleaseStuckBatchTest(TestCase):
+    @mock_aws()
+    def test_release_stuck_batch(self):
+        SqsConnection.reset_default()
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(
+            QueueName="eb-sqs-default", Attributes={"VisibilityTimeout": "300"}
+        )
+        for i in range(4):
+            queue.send_message(MessageBody=f"msg-{i}")
+        messages = queue.receive_messages(MaxNumberOfMessages=10)
+
+        WorkerService()._release_stuck_batch(
+            queue,
+            messages,
+            [{"Id": messages[0].message_id, "ReceiptHandle": messages[0].receipt_handle}],
+            [(messages[1], 60)],
+        )
+
+        queue.reload()
+        self.assertEqual(queue.attributes["ApproximateNumberOfMessages"], "2")
+        self.assertEqual(queue.attributes["ApproximateNumberOfMessagesNotVisible"], "1")
@@ -1,12 +1,14 @@
+import threading
 from unittest import TestCase
 from unittest.mock import Mock
 
 from eb_sqs import settings
 from eb_sqs.decorators import task
-from eb_sqs.worker.queue_client import QueueClient
+from eb_sqs.worker.queue_client import QueueClient, QueueClientException
 from eb_sqs.worker.worker import Worker
 from eb_sqs.worker.worker_exceptions import MaxRetriesReachedException
 from eb_sqs.worker.worker_factory import WorkerFactory
+from eb_sqs.worker.worker_task import WorkerTask
 
 
 class TestException(Exception):  # noqa: N818
@@ -53,12 +55,36 @@ def max_retries_group_task():
     max_retries_group_task.retry(execute_inline=True)
 
 
+concurrent_retry_barrier = threading.Barrier(2)
+concurrent_retry_nums: list = []
+
+
+@task(max_retries=5)
+def concurrent_retry_task(value: int):
+    # both threads execute the task before either retries it
+    concurrent_retry_barrier.wait(5)
+    concurrent_retry_nums.append((value, concurrent_retry_task.get_retry_num()))
+    concurrent_retry_task.retry()
+
+
 global_group_mock = Mock()
 
 
+class LegacyQueueClient(QueueClient):
+    # implemented before message attributes were added
+    def __init__(self) -> None:
+        self.msgs: list = []
+
+    def add_message(  # type: ignore[override]
+        self, queue_name: str, msg: str, delay: int
+    ) -> None:
+        self.msgs.append(msg)
+
+
 class WorkerTest(TestCase):
     def setUp(self):
         settings.DEAD_LETTER_MODE = False
+        settings.EXECUTE_INLINE = False
 
         self.queue_mock = Mock(autospec=QueueClient)
         self.worker = Worker(self.queue_mock)
@@ -83,6 +109,24 @@ class WorkerTest(TestCase):
 
         self.assertIsNone(result)
 
+    def test_worker_execution_dead_letter_queue_reads_attributes(self):
+        settings.DEAD_LETTER_MODE = True
+
+        result = self.worker.execute(
+            "invalid", {"taskId": "id-1", "func": "unknown.module.task"}
+        )
+
+        self.assertIsNone(result)
+
+    def test_last_tasks_per_thread(self):
+        msg = '{"id": "id-1", "retry": 0, "queue": "default", "maxRetries": 5, "args": [], "func": "eb_sqs.tests.worker.tests_worker.dummy_task", "kwargs": {"msg": "Hello World!"}}'
+
+        thread = threading.Thread(target=self.worker.execute, args=(msg,))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(self.worker.last_tasks, [])
+
     def test_delay(self):
         self.worker.delay(
             None, "queue", dummy_task, (), {"msg": "Hello World!"}, 5, 3, False
@@ -92,6 +136,23 @@ class WorkerTest(TestCase):
         queue_delay = self.queue_mock.add_message.call_args[0][2]
         self.assertEqual(queue_delay, 3)
 
+        attributes = self.queue_mock.add_message.call_args[1]["attributes"]
+        self.assertEqual(
+            attributes["func"], "eb_sqs.tests.worker.tests_worker.dummy_task"
+        )
+        self.assertEqual(attributes["retry"], 0)
+
+    def test_delay_legacy_queue_client(self):
+        queue_client = LegacyQueueClient()
+        worker = Worker(queue_client)
+
+        worker.delay(None, "queue", dummy_task, (), {"msg": "Hello World!"}, 5, 0, False)
+        worker.delay_many(
+            None, "queue", dummy_task, [("a",), ("b",)], {}, 5, 0, False, 10, 1
+        )
+
+        self.assertEqual(len(queue_client.msgs), 3)
+
     def test_delay_inline(self):
         result = self.worker.delay(
             None, "queue", dummy_task, (), {"msg": "Hello World!"}, 5, 0, True
@@ -100,10 +161,84 @@ class WorkerTest(TestCase):
         self.queue_mock.add_message.assert_not_called()
         self.assertEqual(result, "Hello World!")
 
+    def test_delay_many(self):
+        self.queue_mock.add_messages.return_value = []
+        progress = Mock()
+
+        result = dummy_task.map(
+            (f"msg-{i}" for i in range(25)),
+            chunk_size=10,
+            max_in_flight=2,
+            progress=progress,
+        )
+
+        self.assertEqual(self.queue_mock.add_messages.call_count, 3)
+        self.assertEqual(result.sent, 25)
+        self.assertEqual(result.failed, [])
+        self.assertEqual(progress.call_count, 3)
+
+        msgs = [
+            msg for call in self.queue_mock.add_messages.call_args_list for msg in call[0][1]
+        ]
+        self.assertEqual(len(msgs), 25)
+        self.assertEqual(len({WorkerTask.deserialize(msg).id for msg in msgs}), 25)
+        self.assertEqual(WorkerTask.deserialize(msgs[24]).args, ["msg-24"])
+
+    def test_delay_many_failures(self):
+        self.queue_mock.add_messages.side_effect = [[1], QueueClientException()]
+
+        result = dummy_task.starmap(
+            [("msg-1",), ("msg-2",), ("msg-3",), ("msg-4",)], chunk_size=2
+        )
+
+        self.assertEqual(result.sent, 1)
+        self.assertEqual(result.failed, [1, 2, 3])
+
+    def test_delay_many_inline(self):
+        result = dummy_task.map(["msg-1", "msg-2"], execute_inline=True)
+
+        self.queue_mock.add_messages.assert_not_called()
+        self.assertEqual(result.sent, 2)
+
     def test_retry_max_reached_execution(self):
         with self.assertRaises(MaxRetriesReachedException):
             max_retries_task.delay(execute_inline=True)
 
+    def test_retry_in_concurrent_threads(self):
+        concurrent_retry_nums.clear()
+        msgs = [
+            WorkerTask(
+                f"id-{value}",
+                None,
+                "default",
+                concurrent_retry_task,
+                (value,),
+                {},
+                5,
+                value,
+                None,
+            ).serialize()
+            for value in (1, 2)
+        ]
+
+        threads = [
+            threading.Thread(target=self.worker.execute, args=(msg,)) for msg in msgs
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        retried = sorted(
+            (worker_task.args[0], worker_task.retry)
+            for worker_task in (
+                WorkerTask.deserialize(call[0][1])
+                for call in self.queue_mock.add_message.call_args_list
+            )
+        )
+        self.assertEqual(retried, [(1, 2), (2, 3)])
+        self.assertEqual(sorted(concurrent_retry_nums), [(1, 1), (2, 2)])
+
     def test_retry_no_limit(self):
         retries_task.delay(10, execute_inline=True)
 
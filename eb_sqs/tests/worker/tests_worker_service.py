@@ -0,0 +1,315 @@
+import signal
+import threading
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import boto3
+from moto import mock_aws
+
+from eb_sqs import settings
+from eb_sqs.aws.sqs_connection import SqsConnection
+from eb_sqs.worker.service import WorkerService
+from eb_sqs.worker.worker import Worker
+from eb_sqs.worker.worker_exceptions import TaskRateLimitedException
+from eb_sqs.worker.worker_factory import WorkerFactory
+
+
+class WorkerServiceTest(TestCase):
+    def setUp(self):
+        settings.SHUTDOWN_TIMEOUT_S = 0
+        SqsConnection.reset_default()
+
+        self.service = WorkerService()
+        self.worker_mock = Mock(autospec=Worker)
+        self.worker_mock.parse_batch_name.return_value = (None, None)
+
+    def _create_queue(self, num_of_messages: int):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(
+            QueueName="eb-sqs-default", Attributes={"VisibilityTimeout": "300"}
+        )
+        for i in range(num_of_messages):
+            queue.send_message(MessageBody=f"msg-{i}")
+        return queue
+
+    def _number_of_messages(self, queue) -> tuple:  # noqa: ANN001
+        queue.reload()
+        return (
+            int(queue.attributes["ApproximateNumberOfMessages"]),
+            int(queue.attributes["ApproximateNumberOfMessagesNotVisible"]),
+        )
+
+    @mock_aws()
+    def test_process_messages(self):
+        queue = self._create_queue(3)
+
+        self.service.process_messages([queue], self.worker_mock, [queue])
+
+        self.assertEqual(self.worker_mock.execute.call_count, 3)
+        self.assertEqual(self._number_of_messages(queue), (0, 0))
+
+    @mock_aws()
+    def test_drain_releases_unprocessed_messages(self):
+        queue = self._create_queue(3)
+
+        self.worker_mock.execute.side_effect = (
+            lambda msg, attributes, worker_task: self.service._exit_called(
+                signal.SIGTERM, None
+            )
+        )
+
+        self.service.process_messages([queue], self.worker_mock, [queue])
+
+        self.assertEqual(self.worker_mock.execute.call_count, 1)
+        self.assertEqual(self._number_of_messages(queue), (2, 0))
+
+    @mock_aws()
+    def test_drain_processes_messages_until_deadline(self):
+        settings.SHUTDOWN_TIMEOUT_S = 60
+        queue = self._create_queue(3)
+
+        def execute(msg, attributes=None, worker_task=None):  # noqa: ANN001
+            if not self.service._exit_gracefully:
+                self.service._exit_called(signal.SIGTERM, None)
+
+        self.worker_mock.execute.side_effect = execute
+
+        self.service.process_messages([queue], self.worker_mock, [queue])
+
+        self.assertTrue(self.service._exit_gracefully)
+        self.assertEqual(self.worker_mock.execute.call_count, 3)
+        self.assertEqual(self._number_of_messages(queue), (0, 0))
+
+    @mock_aws()
+    def test_max_tasks(self):
+        queue = self._create_queue(3)
+        service = WorkerService(max_tasks=2)
+
+        service.process_messages([queue], self.worker_mock, [queue])
+
+        self.assertTrue(service._exit_gracefully)
+
+    @mock_aws()
+    def test_max_memory(self):
+        queue = self._create_queue(3)
+        service = WorkerService(max_memory_mb=100)
+
+        with patch("eb_sqs.worker.service.get_own_rss_mb", return_value=50):
+            service.process_messages([queue], self.worker_mock, [queue])
+        self.assertFalse(service._exit_gracefully)
+
+        queue.send_message(MessageBody="msg")
+        with patch("eb_sqs.worker.service.get_own_rss_mb", return_value=150):
+            service.process_messages([queue], self.worker_mock, [queue])
+
+        self.assertTrue(service._exit_gracefully)
+        self.assertEqual(self._number_of_messages(queue), (0, 0))
+
+    @mock_aws()
+    def test_idle_queue_skipped(self):
+        settings.IDLE_BACKOFF_MAX_S = 20
+        settings.WAIT_TIME_S = 0
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        empty_queue = sqs.create_queue(QueueName="empty")
+        queue = self._create_queue(0)
+
+        try:
+            self.service.process_messages([empty_queue, queue], self.worker_mock, [])
+            queue.send_message(MessageBody="msg")
+            empty_queue.send_message(MessageBody="msg")
+            self.service.process_messages([empty_queue, queue], self.worker_mock, [])
+        finally:
+            settings.IDLE_BACKOFF_MAX_S = 0
+            settings.WAIT_TIME_S = 2
+
+        self.worker_mock.execute.assert_not_called()
+        self.assertEqual(self.service.poll_stats.receives, 2)
+        self.assertEqual(self.service.poll_stats.empty_receives, 2)
+
+    @mock_aws()
+    def test_rate_limited_messages_deferred(self):
+        queue = self._create_queue(3)
+
+        self.worker_mock.execute.side_effect = [
+            None,
+            TaskRateLimitedException("task", 60),
+            TaskRateLimitedException("task", 60),
+        ]
+
+        self.service.process_messages([queue], self.worker_mock, [queue])
+
+        self.assertEqual(self._number_of_messages(queue), (0, 2))
+
+    @mock_aws()
+    def test_priority_lane(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        urgent_queue = sqs.create_queue(QueueName="urgent-1")
+        urgent_queue.send_message(MessageBody="urgent-msg")
+        queue = self._create_queue(1)
+        self.service._queue_discovery = Mock(queues=[urgent_queue, queue])
+
+        def execute(msg, attributes=None, worker_task=None):  # noqa: ANN001
+            self.service._exit_gracefully = True
+
+        self.worker_mock.execute.side_effect = execute
+        factory_mock = Mock(autospec=WorkerFactory)
+        factory_mock.create.return_value = self.worker_mock
+        worker_factory = settings.WORKER_FACTORY
+        settings.WORKER_FACTORY = factory_mock
+        settings.PRIORITY_QUEUES = ["urgent-*"]
+        try:
+            self.assertEqual(self.service._get_lane_queues(priority=False), [queue])
+            self.service._process_priority_lane([])
+        finally:
+            settings.WORKER_FACTORY = worker_factory
+            settings.PRIORITY_QUEUES = []
+
+        self.worker_mock.execute.assert_called_once_with("urgent-msg", {}, None)
+        self.assertEqual(self._number_of_messages(queue), (1, 0))
+
+    def _start_priority_lane(self, urgent_queue, queue) -> threading.Thread:  # noqa: ANN001
+        self.service._queue_discovery = Mock(queues=[urgent_queue, queue])
+        factory_mock = Mock(autospec=WorkerFactory)
+        factory_mock.create.return_value = self.worker_mock
+        worker_factory = settings.WORKER_FACTORY
+        settings.WORKER_FACTORY = factory_mock
+        settings.PRIORITY_QUEUES = ["urgent-*"]
+        self.addCleanup(setattr, settings, "WORKER_FACTORY", worker_factory)
+        self.addCleanup(setattr, settings, "PRIORITY_QUEUES", [])
+
+        lane = threading.Thread(
+            target=self.service._process_priority_lane,
+            args=([],),
+            name="eb-sqs-priority-0",
+            daemon=True,
+        )
+        lane.start()
+        return lane
+
+    @mock_aws()
+    def test_priority_lane_runs_concurrently(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        urgent_queue = sqs.create_queue(QueueName="urgent-1")
+        for i in range(5):
+            urgent_queue.send_message(MessageBody=f"urgent-msg-{i}")
+        queue = self._create_queue(5)
+        lane_executed = threading.Event()
+
+        def execute(msg, attributes=None, worker_task=None):  # noqa: ANN001
+            if msg.startswith("urgent-"):
+                lane_executed.set()
+            else:
+                # the lane processes its messages while the main loop is busy
+                lane_executed.wait(5)
+
+        self.worker_mock.execute.side_effect = execute
+        lane = self._start_priority_lane(urgent_queue, queue)
+        try:
+            while self._number_of_messages(queue) != (0, 0):
+                self.service.process_messages([queue], self.worker_mock, [queue])
+            while self._number_of_messages(urgent_queue) != (0, 0):
+                self.service._sleep(0.1)
+        finally:
+            self.service._exit_gracefully = True
+            lane.join(5)
+
+        self.assertFalse(lane.is_alive())
+        self.assertEqual(self.worker_mock.execute.call_count, 10)
+        self.assertEqual(self.service._processed_tasks, 10)
+        self.assertEqual(self.service.health.processed, 10)
+        self.assertEqual(self.service.health.backlog, 0)
+
+    @mock_aws()
+    def test_hard_time_limit_releases_all_lanes(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        urgent_queue = sqs.create_queue(
+            QueueName="urgent-1", Attributes={"VisibilityTimeout": "300"}
+        )
+        for i in range(2):
+            urgent_queue.send_message(MessageBody=f"urgent-msg-{i}")
+        queue = self._create_queue(2)
+        lane_executing = threading.Event()
+        released = threading.Event()
+        numbers_of_messages = []
+
+        def execute(msg, attributes=None, worker_task=None):  # noqa: ANN001
+            if msg.startswith("urgent-"):
+                lane_executing.set()
+                released.wait(5)
+                return
+
+            lane_executing.wait(5)
+            # as called by the time limits before the process exits
+            self.worker_mock.time_limits.on_hard_time_limit()
+            numbers_of_messages.extend(
+                [self._number_of_messages(urgent_queue), self._number_of_messages(queue)]
+            )
+            self.service._exit_called(signal.SIGTERM, None)
+            self.service._exit_called(signal.SIGTERM, None)
+            released.set()
+
+        self.worker_mock.execute.side_effect = execute
+        lane = self._start_priority_lane(urgent_queue, queue)
+        try:
+            self.service.process_messages([queue], self.worker_mock, [queue])
+        finally:
+            self.service._exit_gracefully = True
+            released.set()
+            lane.join(5)
+
+        self.assertEqual(numbers_of_messages, [(2, 0), (2, 0)])
+        self.assertEqual(self.service._in_flight_batches, {})
+
+    @mock_aws()
+    def test_hard_time_limit_after_lane_batch(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        urgent_queue = sqs.create_queue(QueueName="urgent-1")
+        urgent_queue.send_message(MessageBody="urgent-msg")
+        queue = self._create_queue(2)
+        numbers_of_messages = []
+
+        def execute(msg, attributes=None, worker_task=None):  # noqa: ANN001
+            if msg.startswith("urgent-"):
+                return
+
+            # the lane shares the worker and finishes its batch during the task
+            for _ in range(50):
+                if self._number_of_messages(urgent_queue) == (0, 0):
+                    break
+                self.service._sleep(0.1)
+            self.worker_mock.time_limits.on_hard_time_limit()
+            numbers_of_messages.append(self._number_of_messages(queue))
+            self.service._exit_called(signal.SIGTERM, None)
+            self.service._exit_called(signal.SIGTERM, None)
+
+        self.worker_mock.execute.side_effect = execute
+        lane = self._start_priority_lane(urgent_queue, queue)
+        try:
+            self.service.process_messages([queue], self.worker_mock, [queue])
+        finally:
+            self.service._exit_gracefully = True
+            lane.join(5)
+
+        self.assertEqual(numbers_of_messages, [(2, 0)])
+
+    @mock_aws()
+    def test_deprecated_queue_lookups(self):
+        sqs = boto3.resource("sqs", region_name=settings.AWS_REGION)
+        queue = sqs.create_queue(QueueName="pr1-queue")
+        sqs.create_queue(QueueName="other")
+
+        with self.assertWarns(DeprecationWarning):
+            queues = self.service.get_queues_by_names(sqs, ["pr1-queue"])
+        self.assertEqual([q.url for q in queues], [queue.url])
+
+        with self.assertWarns(DeprecationWarning):
+            queues = self.service.get_queues_by_prefixes(sqs, ["pr1-"])
+        self.assertEqual([q.url for q in queues], [queue.url])
+
+    def test_sleep_past_deadline(self):
+        with patch(
+            "eb_sqs.worker.service.monotonic", side_effect=[0, 0.5, 2]
+        ), patch("eb_sqs.worker.service.sleep") as sleep_mock:
+            self.service._sleep(1)
+
+        sleep_mock.assert_called_once_with(0.5)
@@ -1,7 +1,8 @@
 import json
 from unittest import TestCase
 
-from eb_sqs.worker.worker_task import WorkerTask
+from eb_sqs import settings
+from eb_sqs.worker.worker_task import TaskCall, WorkerTask
 
 
 class TestObject:
@@ -38,3 +39,66 @@ class WorkerTaskTest(TestCase):
         self.assertEqual(worker_task.max_retries, 5)
         self.assertEqual(worker_task.retry, 0)
         self.assertEqual(worker_task.retry_id, "retry-uuid")
+
+
+class LazyPayloadTest(TestCase):
+    def setUp(self):
+        settings.LAZY_PAYLOAD = True
+
+    def tearDown(self):
+        settings.LAZY_PAYLOAD = False
+
+    def test_serialize_nests_arguments(self):
+        worker_task = WorkerTask(
+            "id-1", None, "default", dummy_function, [1], {"a": 2}, 5, 0, None
+        )
+
+        task = json.loads(worker_task.serialize())
+
+        self.assertNotIn("args", task)
+        self.assertDictEqual(
+            json.loads(task["payload"]), {"args": [1], "kwargs": {"a": 2}}
+        )
+
+    def test_deserialize_decodes_arguments_on_access(self):
+        worker_task = WorkerTask(
+            "id-1",
+            None,
+            "default",
+            dummy_function,
+            [1],
+            {},
+            5,
+            0,
+            None,
+            [TaskCall([2], {})],
+        )
+        msg = worker_task.serialize()
+
+        worker_task = WorkerTask.deserialize(msg)
+        self.assertIsNotNone(worker_task._payload)
+        self.assertEqual(worker_task.func, dummy_function)
+
+        self.assertEqual(worker_task.args, [1])
+        self.assertEqual([call.args for call in worker_task.calls or []], [[2]])
+        self.assertIsNone(worker_task._payload)
+
+    def test_undecoded_payload_is_passed_on(self):
+        msg = WorkerTask(
+            "id-1", None, "default", dummy_function, [1], {}, 5, 0, None
+        ).serialize()
+
+        worker_task = WorkerTask.deserialize(msg).copy(False)
+        worker_task.retry = 1
+        task = json.loads(worker_task.serialize())
+
+        self.assertEqual(task["payload"], json.loads(msg)["payload"])
+        self.assertEqual(task["retry"], 1)
+
+    def test_deserialize_without_lazy_payload(self):
+        msg = WorkerTask(
+            "id-1", None, "default", dummy_function, [1], {}, 5, 0, None
+        ).serialize()
+        settings.LAZY_PAYLOAD = False
+
+        self.assertEqual(WorkerTask.deserialize(msg).args, [1])
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+import math
+from time import monotonic
+
+from eb_sqs import settings
+from eb_sqs.aws.queue_discovery import QueueDiscovery
+
+logger = logging.getLogger(__name__)
+
+
+class QueueDepthAutoscaler:
+    _DEPTH_ATTRIBUTES = [
+        "ApproximateNumberOfMessages",
+        "ApproximateNumberOfMessagesNotVisible",
+    ]
+
+    def __init__(
+        self, queue_names: list, min_processes: int, max_processes: int
+    ) -> None:
+        self._min_processes = min_processes
+        self._max_processes = max_processes
+
+        self._queue_names = queue_names
+        self._queue_discovery: QueueDiscovery | None = None
+
+        self._last_update_time: float | None = None
+
+    def desired_processes(self, current: int) -> int:
+        if (
+            self._last_update_time is not None
+            and monotonic() - self._last_update_time < settings.AUTOSCALE_INTERVAL_S
+        ):
+            return current
+
+        self._last_update_time = monotonic()
+
+        try:
+            messages = self.get_number_of_messages()
+        except Exception as exc:
+            logger.warning(
+                "[django-eb-sqs] Error reading queue depth: %s", exc, exc_info=True
+            )
+            return current
+
+        return self.calculate_processes(current, messages)
+
+    def calculate_processes(self, current: int, messages: int) -> int:
+        desired = math.ceil(messages / settings.AUTOSCALE_MESSAGES_PER_PROCESS)
+
+        # grow at once to absorb spikes, shrink one process at a time
+        if desired < current:
+            desired = current - 1
+
+        return max(self._min_processes, min(self._max_processes, desired))
+
+    def get_number_of_messages(self) -> int:
+        if self._queue_discovery is None:
+            self._queue_discovery = QueueDiscovery(self._queue_names)
+        self._queue_discovery.refresh()
+
+        messages = 0
+        for queue in self._queue_discovery.queues:
+            attributes = queue.meta.client.get_queue_attributes(
+                QueueUrl=queue.url, AttributeNames=self._DEPTH_ATTRIBUTES
+            )["Attributes"]
+            messages += sum(
+                int(attributes.get(name, 0)) for name in self._DEPTH_ATTRIBUTES
+            )
+
+        return messages
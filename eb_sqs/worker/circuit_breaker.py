@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections import deque
+from contextlib import contextmanager
+from time import monotonic
+from typing import Generator
+
+from eb_sqs import settings
+from eb_sqs.worker.worker_exceptions import (
+    TaskCircuitOpenException,
+    TaskDeferredException,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.state = self.CLOSED
+
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_time = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def time_until_probe(self) -> float:
+        if self.state != self.OPEN:
+            return 0
+
+        return max(
+            0, self._opened_time + settings.CIRCUIT_BREAKER_COOLDOWN_S - monotonic()
+        )
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.time_until_probe))
+
+    def acquire(self, count: int = 1) -> int:
+        # returns how many of count calls may be made, limited to the probes once half-open
+        with self._lock:
+            if self.state == self.CLOSED:
+                return count
+
+            if self.state == self.OPEN:
+                if self.time_until_probe > 0:
+                    return 0
+
+                logger.info("[django-eb-sqs] Probing circuit breaker %s", self.name)
+                self.state = self.HALF_OPEN
+                self._probes = 0
+                self._probe_successes = 0
+
+            permitted = max(0, min(count, settings.CIRCUIT_BREAKER_PROBES - self._probes))
+            self._probes += permitted
+            return permitted
+
+    def release(self, count: int = 1) -> None:
+        # returns acquired probes which were not used
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probes = max(self._probe_successes, self._probes - count)
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                if not success:
+                    self._open()
+                    return
+
+                self._probe_successes += 1
+                if self._probe_successes >= settings.CIRCUIT_BREAKER_PROBES:
+                    logger.info("[django-eb-sqs] Closing circuit breaker %s", self.name)
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                return
+
+            if self.state == self.OPEN:
+                return
+
+            now = monotonic()
+            self._outcomes.append((now, success))
+            while self._outcomes[0][0] <= now - settings.CIRCUIT_BREAKER_WINDOW_S:
+                self._outcomes.popleft()
+
+            failure_rate = settings.CIRCUIT_BREAKER_FAILURE_RATE
+            if (
+                failure_rate is None
+                or len(self._outcomes) < settings.CIRCUIT_BREAKER_MIN_CALLS
+            ):
+                return
+
+            failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+            if failures / len(self._outcomes) >= failure_rate:
+                self._open()
+
+    def _open(self) -> None:
+        logger.warning(
+            "[django-eb-sqs] Opening circuit breaker %s for %s seconds",
+            self.name,
+            settings.CIRCUIT_BREAKER_COOLDOWN_S,
+        )
+        self.state = self.OPEN
+        self._opened_time = monotonic()
+        self._outcomes.clear()
+
+
+class CircuitBreakers:
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.CIRCUIT_BREAKER_FAILURE_RATE)
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(name, CircuitBreaker(name))
+        return breaker
+
+    def get_time_until_probe(self, name: str) -> float:
+        breaker = self._breakers.get(name)
+        return breaker.time_until_probe if breaker else 0
+
+    @contextmanager
+    def guard(self, name: str) -> Generator[None, None, None]:
+        if not self.enabled:
+            yield
+            return
+
+        breaker = self.get(name)
+        if not breaker.acquire():
+            raise TaskCircuitOpenException(name, breaker.retry_after)
+
+        try:
+            yield
+        except TaskDeferredException:
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record(False)
+            raise
+
+        breaker.record(True)
@@ -1,9 +1,37 @@
 from __future__ import annotations
 
+import os
+import sys
+import threading
 from contextlib import contextmanager
+from time import monotonic
 from typing import Generator
 
-from django.db import close_old_connections, reset_queries
+from django.db import close_old_connections, connections, reset_queries
+
+from eb_sqs import settings
+
+
+def get_process_rss_mb(pid: int) -> float | None:
+    try:
+        with open(f"/proc/{pid}/statm") as file:
+            resident_pages = int(file.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def get_own_rss_mb() -> float:
+    rss_mb = get_process_rss_mb(os.getpid())
+    if rss_mb is not None:
+        return rss_mb
+
+    # without procfs only the peak is known, in KB (Linux) or bytes (macOS)
+    import resource
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
 
 
 @contextmanager
@@ -14,3 +42,65 @@ def django_db_management() -> Generator[None, None, None]:
         yield
     finally:
         close_old_connections()
+
+
+def close_unusable_connections() -> None:
+    # only connections which had errors are checked, as the check is a query
+    for conn in connections.all(initialized_only=True):
+        if (
+            conn.connection is not None
+            and conn.errors_occurred
+            and not conn.in_atomic_block
+            and not conn.is_usable()
+        ):
+            conn.close()
+
+
+class DbConnectionLifecycle:
+    MESSAGE = "message"
+    BATCH = "batch"
+    INTERVAL = "interval"
+
+    def __init__(self, lifecycle: str | None = None) -> None:
+        self.lifecycle = lifecycle or settings.DB_CONNECTION_LIFECYCLE
+        if self.lifecycle not in (self.MESSAGE, self.BATCH, self.INTERVAL):
+            raise ValueError(f"Invalid DB connection lifecycle: {self.lifecycle}")
+
+        # connections belong to threads, so every thread keeps its own interval
+        self._created = monotonic()
+        self._last_cleanup = threading.local()
+
+    @contextmanager
+    def message(self) -> Generator[None, None, None]:
+        if self.lifecycle == self.MESSAGE:
+            with django_db_management():
+                yield
+            return
+
+        # connections are kept between messages, unless a message broke them
+        reset_queries()
+        try:
+            yield
+        finally:
+            close_unusable_connections()
+
+    def start_batch(self) -> None:
+        if self._is_cleanup_due():
+            # also re-enables the health checks (CONN_HEALTH_CHECKS) of reused connections
+            close_old_connections()
+
+    def finish_batch(self) -> None:
+        if self._is_cleanup_due():
+            # closes connections older than CONN_MAX_AGE
+            close_old_connections()
+            self._last_cleanup.time = monotonic()
+
+    def _is_cleanup_due(self) -> bool:
+        if self.lifecycle == self.BATCH:
+            return True
+        if self.lifecycle == self.INTERVAL:
+            return (
+                monotonic() - getattr(self._last_cleanup, "time", self._created)
+                >= settings.DB_CONNECTION_CHECK_INTERVAL_S
+            )
+        return False
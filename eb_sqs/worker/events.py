@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, NamedTuple
+
+import django.dispatch
+from django.db import close_old_connections
+
+from eb_sqs import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MessageOutcome:
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    DEFERRED = "deferred"
+    RELEASED = "released"
+
+
+class MessageEvent(NamedTuple):
+    message_id: str
+    task_id: str | None
+    func_name: str | None
+    outcome: str
+    duration_s: float
+    error: Exception | None = None
+    # the time (epoch seconds) the task was enqueued, if sent with message attributes
+    enqueued_at: float | None = None
+
+
+class BatchEvent(NamedTuple):
+    queue_name: str
+    messages: list[MessageEvent]
+    duration_s: float
+
+    def count(self, outcome: str) -> int:
+        return sum(1 for message in self.messages if message.outcome == outcome)
+
+    @property
+    def succeeded(self) -> int:
+        return self.count(MessageOutcome.SUCCEEDED)
+
+    @property
+    def failed(self) -> int:
+        return self.count(MessageOutcome.FAILED)
+
+    @property
+    def deferred(self) -> int:
+        return self.count(MessageOutcome.DEFERRED)
+
+    @property
+    def released(self) -> int:
+        return self.count(MessageOutcome.RELEASED)
+
+
+class EventDispatcher:
+    # sends signals without the DB connection handling of tasks, optionally from a thread
+    _STOP = object()
+
+    def __init__(self, asynchronous: bool | None = None) -> None:
+        self.asynchronous = (
+            settings.EVENTS_ASYNC if asynchronous is None else asynchronous
+        )
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def dispatch(
+        self, dispatch_signal: django.dispatch.Signal, sender: Any, **kwargs: Any
+    ) -> None:
+        if not dispatch_signal.has_listeners(sender=sender):
+            return
+
+        if not self.asynchronous:
+            self._send(dispatch_signal, sender, kwargs)
+            return
+
+        self._start()
+        try:
+            self._queue.put_nowait((dispatch_signal, sender, kwargs))
+        except queue.Full:
+            # listeners which can't keep up must not slow down the worker
+            self.dropped += 1
+            logger.warning(
+                "[django-eb-sqs] Event queue full, dropped %s events", self.dropped
+            )
+
+    def close(self, timeout_s: float | None = None) -> None:
+        # delivers the queued events before returning
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join(timeout_s)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="eb-sqs-events", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+
+            self._send(*item)
+
+            if self._queue.empty():
+                # listeners' connections belong to this thread
+                close_old_connections()
+
+        close_old_connections()
+
+    @staticmethod
+    def _send(
+        dispatch_signal: django.dispatch.Signal, sender: Any, kwargs: dict
+    ) -> None:
+        # errors of listeners are logged by django.dispatch
+        dispatch_signal.send_robust(sender=sender, **kwargs)
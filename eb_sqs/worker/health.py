@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import suppress
+from time import time
+
+from eb_sqs import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_child_health_file_name(pid: int) -> str:
+    # every worker process of a supervisor writes its own file
+    return f"{settings.HEALTHCHECK_FILE_NAME}.{pid}"
+
+
+def remove_child_health_file(pid: int) -> None:
+    with suppress(FileNotFoundError):
+        os.remove(get_child_health_file_name(pid))
+
+
+def get_health_file_names() -> list[str]:
+    file_name = settings.HEALTHCHECK_FILE_NAME
+    directory, base_name = os.path.split(file_name)
+    child_pattern = re.compile(rf"{re.escape(base_name)}\.\d+")
+    return ([file_name] if os.path.exists(file_name) else []) + [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory or "."))
+        if child_pattern.fullmatch(name)
+    ]
+
+
+class WorkerHealth:
+    # updated by the worker loop, written to the healthcheck file by a thread
+    def __init__(self, file_name: str | None = None) -> None:
+        self.file_name = file_name
+        self.started = time()
+        self.last_loop = time()
+        self.last_polls: dict[str, float] = {}
+        self.last_task_duration_s: float | None = None
+        self.processed = 0
+        self.failed = 0
+
+        # by thread, as every execution lane runs its own tasks
+        self._tasks: dict[str, tuple[str, float]] = {}
+        self._backlogs: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._writer: threading.Thread | None = None
+
+    @property
+    def current_task(self) -> str | None:
+        # the longest running task
+        task = self._get_oldest_task()
+        return task[0] if task else None
+
+    @property
+    def task_started(self) -> float | None:
+        task = self._get_oldest_task()
+        return task[1] if task else None
+
+    @property
+    def backlog(self) -> int:
+        with self._lock:
+            return sum(self._backlogs.values())
+
+    def heartbeat(self) -> None:
+        self.last_loop = time()
+
+    def record_poll(self, queue_name: str, num_messages: int) -> None:
+        with self._lock:
+            self.last_loop = self.last_polls[queue_name] = time()
+            self._backlogs[threading.current_thread().name] = num_messages
+
+    def task_started_now(self, name: str) -> None:
+        with self._lock:
+            self._tasks[threading.current_thread().name] = (name, time())
+
+    def task_finished(self, num_messages: int, num_failed: int) -> None:
+        now = time()
+        thread_name = threading.current_thread().name
+        with self._lock:
+            task = self._tasks.pop(thread_name, None)
+            if task:
+                self.last_task_duration_s = now - task[1]
+            self.last_loop = now
+
+            self._backlogs[thread_name] = max(
+                0, self._backlogs.get(thread_name, 0) - num_messages
+            )
+            self.processed += num_messages
+            self.failed += num_failed
+
+    def _get_oldest_task(self) -> tuple[str, float] | None:
+        with self._lock:
+            return min(self._tasks.values(), key=lambda task: task[1], default=None)
+
+    def to_dict(self) -> dict:
+        task = self._get_oldest_task()
+        with self._lock:
+            last_polls = dict(self.last_polls)
+            tasks = list(self._tasks.values())
+        return {
+            "updated": time(),
+            "pid": os.getpid(),
+            "started": self.started,
+            "last_loop": self.last_loop,
+            "last_polls": last_polls,
+            "current_task": task[0] if task else None,
+            "task_started": task[1] if task else None,
+            "in_flight": [
+                {"task": name, "started": started}
+                for name, started in tasks
+            ],
+            "last_task_duration_s": self.last_task_duration_s,
+            "backlog": self.backlog,
+            "processed": self.processed,
+            "failed": self.failed,
+            "error_rate": self.failed / self.processed if self.processed else 0,
+        }
+
+    def write(self, file_name: str | None = None) -> None:
+        # written to a temporary file and renamed, so readers never see partial files
+        file_name = file_name or self.file_name or settings.HEALTHCHECK_FILE_NAME
+        tmp_file_name = f"{file_name}.{os.getpid()}.tmp"
+        with open(tmp_file_name, "w") as file:
+            json.dump(self.to_dict(), file)
+        os.replace(tmp_file_name, file_name)
+
+    def start(self) -> None:
+        if self._writer is None:
+            self._stopped.clear()
+            self._writer = threading.Thread(
+                target=self._write_periodically, name="eb-sqs-health", daemon=True
+            )
+            self._writer.start()
+
+    def stop(self) -> None:
+        if self._writer is not None:
+            self._stopped.set()
+            self._writer.join()
+            self._writer = None
+
+    def _write_periodically(self) -> None:
+        while not self._stopped.wait(settings.MIN_HEALTHCHECK_WRITE_PERIOD_S):
+            self._try_write()
+
+    def _try_write(self) -> None:
+        try:
+            self.write()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("[django-eb-sqs] Failed writing healthcheck file: %s", exc)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+import threading
+from time import monotonic
+
+from eb_sqs import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_WAIT_TIME_S = 20
+
+
+class IdleBackoff:
+    # shared by the execution lanes of a worker
+    def __init__(self) -> None:
+        self._empty_receives: dict[str, int] = {}
+        self._next_poll_times: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get_backoff_s(self, queue_url: str) -> float:
+        empty_receives = self._empty_receives.get(queue_url, 0)
+        if not settings.IDLE_BACKOFF_MAX_S or empty_receives == 0:
+            return 0
+
+        return min(
+            settings.IDLE_BACKOFF_MAX_S,
+            max(settings.WAIT_TIME_S, 1) * 2 ** (empty_receives - 1),
+        )
+
+    def get_wait_time_s(self, queue_url: str, exclusive: bool) -> int:
+        # a single queue backs off with long polling, which still returns messages at once
+        if not exclusive:
+            return settings.WAIT_TIME_S
+
+        return int(
+            min(MAX_WAIT_TIME_S, max(settings.WAIT_TIME_S, self.get_backoff_s(queue_url)))
+        )
+
+    def is_due(self, queue_url: str) -> bool:
+        return monotonic() >= self._next_poll_times.get(queue_url, 0)
+
+    def get_time_until_due(self, queue_urls: list) -> float:
+        if not queue_urls:
+            return 0
+
+        return max(
+            0,
+            min(self._next_poll_times.get(url, 0) for url in queue_urls) - monotonic(),
+        )
+
+    def record(self, queue_url: str, num_messages: int, exclusive: bool) -> None:
+        if num_messages > 0:
+            self.forget(queue_url)
+            return
+
+        with self._lock:
+            self._empty_receives[queue_url] = self._empty_receives.get(queue_url, 0) + 1
+            if not exclusive:
+                self._next_poll_times[queue_url] = monotonic() + self.get_backoff_s(
+                    queue_url
+                )
+
+    def forget(self, queue_url: str) -> None:
+        with self._lock:
+            self._empty_receives.pop(queue_url, None)
+            self._next_poll_times.pop(queue_url, None)
+
+
+class PollStats:
+    def __init__(self) -> None:
+        self.receives = 0
+        self.empty_receives = 0
+        self._last_log_time = monotonic()
+        self._logged_receives = 0
+        self._logged_empty_receives = 0
+        self._lock = threading.Lock()
+
+    @property
+    def empty_receive_rate(self) -> float:
+        return self.empty_receives / self.receives if self.receives else 0
+
+    def record(self, num_messages: int) -> None:
+        with self._lock:
+            self.receives += 1
+            if num_messages == 0:
+                self.empty_receives += 1
+
+            if monotonic() - self._last_log_time >= settings.POLL_STATS_INTERVAL_S:
+                self.log()
+
+    def log(self) -> None:
+        receives = self.receives - self._logged_receives
+        empty_receives = self.empty_receives - self._logged_empty_receives
+
+        logger.info(
+            "[django-eb-sqs] %s receives, %s empty (%.1f%%) in the last %.0f seconds",
+            receives,
+            empty_receives,
+            100 * empty_receives / receives if receives else 0,
+            monotonic() - self._last_log_time,
+        )
+
+        self._last_log_time = monotonic()
+        self._logged_receives = self.receives
+        self._logged_empty_receives = self.empty_receives
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import inspect
 from abc import ABCMeta, abstractmethod
+from functools import lru_cache
+from typing import Callable
 
 
 class QueueClientException(Exception):  # noqa: N818
@@ -13,7 +16,87 @@ class QueueDoesNotExistException(QueueClientException):
         self.queue_name = queue_name
 
 
+def accepts_attributes(method: Callable) -> bool:
+    # clients implemented before message attributes were added don't accept them
+    return _accepts_attributes(getattr(method, "__func__", method))
+
+
+@lru_cache(maxsize=None)
+def _accepts_attributes(func: Callable) -> bool:
+    try:
+        parameters = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+    return "attributes" in parameters or any(
+        parameter.kind == inspect.Parameter.VAR_KEYWORD
+        for parameter in parameters.values()
+    )
+
+
+def call_add_message(
+    queue_client: QueueClient,
+    queue_name: str,
+    msg: str,
+    delay: int,
+    attributes: dict[str, str | int | float] | None,
+) -> None:
+    if attributes and accepts_attributes(queue_client.add_message):
+        queue_client.add_message(queue_name, msg, delay, attributes=attributes)
+    else:
+        queue_client.add_message(queue_name, msg, delay)
+
+
+def call_add_messages(
+    queue_client: QueueClient,
+    queue_name: str,
+    msgs: list[str],
+    delay: int,
+    attributes: list[dict[str, str | int | float]] | None,
+) -> list[int]:
+    if attributes and accepts_attributes(queue_client.add_messages):
+        return queue_client.add_messages(queue_name, msgs, delay, attributes=attributes)
+    return queue_client.add_messages(queue_name, msgs, delay)
+
+
 class QueueClient(metaclass=ABCMeta):
     @abstractmethod
-    def add_message(self, queue_name: str, msg: str, delay: int) -> None:
+    def add_message(
+        self,
+        queue_name: str,
+        msg: str,
+        delay: int,
+        attributes: dict[str, str | int | float] | None = None,
+    ) -> None:
         pass
+
+    def add_messages(
+        self,
+        queue_name: str,
+        msgs: list[str],
+        delay: int,
+        attributes: list[dict[str, str | int | float]] | None = None,
+    ) -> list[int]:
+        # returns the indexes of the messages which could not be added
+        return [
+            index
+            for index, msg in enumerate(msgs)
+            if not self._try_add_message(
+                queue_name, msg, delay, attributes[index] if attributes else None
+            )
+        ]
+
+    def _try_add_message(
+        self,
+        queue_name: str,
+        msg: str,
+        delay: int,
+        attributes: dict[str, str | int | float] | None,
+    ) -> bool:
+        try:
+            call_add_message(self, queue_name, msg, delay, attributes)
+        except QueueDoesNotExistException:
+            raise
+        except QueueClientException:
+            return False
+        return True
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager, suppress
+from time import monotonic, time
+from typing import Generator
+
+from django.core.cache import cache
+
+from eb_sqs import settings
+from eb_sqs.worker.worker_exceptions import TaskRateLimitedException
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600}
+
+
+class TaskLimits:
+    def __init__(self, rate_limit: str | None, max_concurrency: int | None) -> None:
+        self.rate_limit = rate_limit
+        self.max_concurrency = max_concurrency
+
+        self.rate: tuple[int, int] | None = (
+            self.parse_rate(rate_limit) if rate_limit else None
+        )
+
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"Invalid max concurrency: {max_concurrency}")
+
+    @staticmethod
+    def parse_rate(rate_limit: str) -> tuple[int, int]:
+        try:
+            count, period = rate_limit.split("/")
+            return int(count), _PERIODS[period.strip()]
+        except (KeyError, ValueError) as ex:
+            raise ValueError(
+                f"Invalid rate limit (use e.g. 100/s, 10/m or 5/h): {rate_limit}"
+            ) from ex
+
+
+_TASK_LIMITS: dict[str, TaskLimits] = {}
+
+
+def register_task_limits(
+    name: str, rate_limit: str | None, max_concurrency: int | None
+) -> None:
+    if rate_limit or max_concurrency:
+        _TASK_LIMITS[name] = TaskLimits(rate_limit, max_concurrency)
+    else:
+        _TASK_LIMITS.pop(name, None)
+
+
+def get_task_limits(name: str) -> TaskLimits | None:
+    return _TASK_LIMITS.get(name)
+
+
+class RateLimitBackend(metaclass=ABCMeta):
+    @abstractmethod
+    def acquire_rate(self, name: str, count: int, period_s: int) -> float:
+        # returns 0 if allowed, otherwise the number of seconds to wait
+        pass
+
+    @abstractmethod
+    def acquire_slot(self, name: str, max_concurrency: int) -> bool:
+        pass
+
+    @abstractmethod
+    def release_slot(self, name: str) -> None:
+        pass
+
+
+class LocalRateLimitBackend(RateLimitBackend):
+    def __init__(self) -> None:
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._slots: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire_rate(self, name: str, count: int, period_s: int) -> float:
+        # token bucket allowing bursts of up to count executions
+        rate = count / period_s
+        with self._lock:
+            tokens, last_time = self._buckets.get(name, (count, monotonic()))
+            now = monotonic()
+            tokens = min(count, tokens + (now - last_time) * rate)
+
+            if tokens >= 1:
+                self._buckets[name] = (tokens - 1, now)
+                return 0
+
+            self._buckets[name] = (tokens, now)
+            return (1 - tokens) / rate
+
+    def acquire_slot(self, name: str, max_concurrency: int) -> bool:
+        with self._lock:
+            if self._slots.get(name, 0) >= max_concurrency:
+                return False
+            self._slots[name] = self._slots.get(name, 0) + 1
+            return True
+
+    def release_slot(self, name: str) -> None:
+        with self._lock:
+            self._slots[name] = max(0, self._slots.get(name, 0) - 1)
+
+
+class CacheRateLimitBackend(RateLimitBackend):
+    _KEY_PREFIX = "eb-sqs-limit"
+
+    def acquire_rate(self, name: str, count: int, period_s: int) -> float:
+        # fixed window counter shared by all workers
+        now = time()
+        window = int(now // period_s)
+        key = f"{self._KEY_PREFIX}:rate:{name}:{window}"
+
+        if self._incr(key, period_s * 2) <= count:
+            return 0
+
+        return (window + 1) * period_s - now
+
+    def acquire_slot(self, name: str, max_concurrency: int) -> bool:
+        key = self._slot_key(name)
+        # slots of crashed workers expire with the visibility timeout of their messages
+        if self._incr(key, int(settings.QUEUE_VISIBILITY_TIMEOUT)) <= max_concurrency:
+            return True
+
+        self.release_slot(name)
+        return False
+
+    def release_slot(self, name: str) -> None:
+        # the slot may have expired already
+        with suppress(ValueError):
+            cache.decr(self._slot_key(name))
+
+    def _slot_key(self, name: str) -> str:
+        return f"{self._KEY_PREFIX}:slots:{name}"
+
+    @staticmethod
+    def _incr(key: str, timeout: int) -> int:
+        cache.add(key, 0, timeout)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # expired in between
+            cache.add(key, 1, timeout)
+            return 1
+
+
+class TaskLimiter:
+    _BACKEND: RateLimitBackend | None = None
+
+    def __init__(self, backend: RateLimitBackend | None = None) -> None:
+        self._backend = backend
+
+    @property
+    def backend(self) -> RateLimitBackend:
+        if self._backend:
+            return self._backend
+
+        if settings.RATE_LIMIT_BACKEND:
+            return settings.RATE_LIMIT_BACKEND
+
+        if not TaskLimiter._BACKEND:
+            TaskLimiter._BACKEND = LocalRateLimitBackend()
+        return TaskLimiter._BACKEND
+
+    @contextmanager
+    def limit(self, name: str) -> Generator[None, None, None]:
+        limits = get_task_limits(name)
+        if not limits:
+            yield
+            return
+
+        if limits.rate:
+            wait_s = self.backend.acquire_rate(name, *limits.rate)
+            if wait_s > 0:
+                raise TaskRateLimitedException(name, math.ceil(wait_s))
+
+        if not limits.max_concurrency:
+            yield
+            return
+
+        if not self.backend.acquire_slot(name, limits.max_concurrency):
+            raise TaskRateLimitedException(name, settings.RATE_LIMIT_RETRY_DELAY_S)
+
+        try:
+            yield
+        finally:
+            self.backend.release_slot(name)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import threading
+from abc import ABCMeta, abstractmethod
+from time import monotonic, sleep, time
+from typing import Any, Iterable
+
+from django.core.cache import cache
+
+from eb_sqs import settings
+
+
+class TaskState:
+    PENDING = "PENDING"
+    STARTED = "STARTED"
+    RETRY = "RETRY"
+    SUCCESS = "SUCCESS"
+    FAILURE = "FAILURE"
+
+    READY_STATES = frozenset([SUCCESS, FAILURE])
+
+
+class TaskStatus:
+    def __init__(
+        self,
+        state: str,
+        result: Any = None,
+        error: str | None = None,
+        updated: float | None = None,
+    ) -> None:
+        self.state = state
+        self.result = result
+        self.error = error
+        self.updated = updated if updated is not None else time()
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "result": self.result,
+            "error": self.error,
+            "updated": self.updated,
+        }
+
+    @staticmethod
+    def from_dict(status: dict) -> TaskStatus:
+        return TaskStatus(
+            status["state"], status.get("result"), status.get("error"), status.get("updated")
+        )
+
+
+class ResultBackend(metaclass=ABCMeta):
+    @abstractmethod
+    def set_status(self, task_id: str, status: TaskStatus, ttl_s: int) -> None:
+        pass
+
+    @abstractmethod
+    def get_statuses(self, task_ids: Iterable[str]) -> dict[str, TaskStatus]:
+        # returns the statuses of the tasks which are known
+        pass
+
+    def get_status(self, task_id: str) -> TaskStatus | None:
+        return self.get_statuses([task_id]).get(task_id)
+
+
+class InMemoryResultBackend(ResultBackend):
+    def __init__(self) -> None:
+        self._statuses: dict[str, tuple[TaskStatus, float]] = {}
+        self._lock = threading.Lock()
+
+    def set_status(self, task_id: str, status: TaskStatus, ttl_s: int) -> None:
+        with self._lock:
+            self._statuses[task_id] = (status, monotonic() + ttl_s)
+
+    def get_statuses(self, task_ids: Iterable[str]) -> dict[str, TaskStatus]:
+        now = monotonic()
+        with self._lock:
+            return {
+                task_id: self._statuses[task_id][0]
+                for task_id in task_ids
+                if task_id in self._statuses and self._statuses[task_id][1] > now
+            }
+
+
+class CacheResultBackend(ResultBackend):
+    _KEY_PREFIX = "eb-sqs-result"
+
+    def set_status(self, task_id: str, status: TaskStatus, ttl_s: int) -> None:
+        cache.set(self._key(task_id), status.to_dict(), ttl_s)
+
+    def get_statuses(self, task_ids: Iterable[str]) -> dict[str, TaskStatus]:
+        keys = {self._key(task_id): task_id for task_id in task_ids}
+        return {
+            keys[key]: TaskStatus.from_dict(status)
+            for key, status in cache.get_many(list(keys)).items()
+        }
+
+    def _key(self, task_id: str) -> str:
+        return f"{self._KEY_PREFIX}:{task_id}"
+
+
+def get_result_backend() -> ResultBackend | None:
+    return settings.RESULT_BACKEND
+
+
+class AsyncResult:
+    def __init__(self, task_id: str, backend: ResultBackend | None = None) -> None:
+        self.id = task_id
+        self._backend = backend
+
+    def __repr__(self) -> str:
+        return f"AsyncResult({self.id})"
+
+    @property
+    def backend(self) -> ResultBackend:
+        backend = self._backend or get_result_backend()
+        if backend is None:
+            raise ValueError("No result backend (EB_SQS_RESULT_BACKEND) configured")
+        return backend
+
+    @property
+    def status(self) -> TaskStatus | None:
+        return self.backend.get_status(self.id)
+
+    @property
+    def state(self) -> str:
+        status = self.status
+        return status.state if status else TaskState.PENDING
+
+    @property
+    def result(self) -> Any:
+        status = self.status
+        return status.result if status else None
+
+    def ready(self) -> bool:
+        return self.state in TaskState.READY_STATES
+
+    def successful(self) -> bool:
+        return self.state == TaskState.SUCCESS
+
+    def get(self, timeout_s: float | None = None, interval_s: float = 0.5) -> Any:
+        deadline = None if timeout_s is None else monotonic() + timeout_s
+        while True:
+            status = self.status
+            if status and status.state == TaskState.SUCCESS:
+                return status.result
+            if status and status.state == TaskState.FAILURE:
+                raise RuntimeError(f"Task {self.id} failed: {status.error}")
+            if deadline is not None and monotonic() >= deadline:
+                raise TimeoutError(f"Task {self.id} not ready after {timeout_s}s")
+            sleep(interval_s)
+
+    @staticmethod
+    def get_statuses(
+        results: Iterable[AsyncResult | str], backend: ResultBackend | None = None
+    ) -> dict[str, TaskStatus]:
+        # looks up the statuses of many tasks with a single backend call
+        backend = backend or get_result_backend()
+        if backend is None:
+            raise ValueError("No result backend (EB_SQS_RESULT_BACKEND) configured")
+
+        return backend.get_statuses(
+            result.id if isinstance(result, AsyncResult) else result
+            for result in results
+        )
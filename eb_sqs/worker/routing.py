@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+from bisect import bisect
+from fnmatch import translate
+from itertools import accumulate
+from typing import Any
+
+from eb_sqs import settings
+
+
+class TaskRoute:
+    def __init__(self, pattern: str | re.Pattern, queues: Any) -> None:
+        # glob patterns (e.g. "app.reports.*") are matched against the full function name
+        self.pattern = (
+            pattern
+            if isinstance(pattern, re.Pattern)
+            else re.compile(translate(pattern))
+        )
+
+        # a queue name, a list of shard queues or a dict of shard queues and weights
+        if isinstance(queues, str):
+            queues = {queues: 1}
+        elif not isinstance(queues, dict):
+            queues = dict.fromkeys(queues, 1)
+
+        if not queues or any(weight <= 0 for weight in queues.values()):
+            raise ValueError(f"Invalid queues of task route {pattern}: {queues}")
+
+        self.queues: list[str] = list(queues)
+        self._cum_weights = list(accumulate(queues.values()))
+
+    def matches(self, abs_func_name: str) -> bool:
+        return self.pattern.fullmatch(abs_func_name) is not None
+
+    def get_queue(self) -> str:
+        if len(self.queues) == 1:
+            return self.queues[0]
+
+        # spreading load, not security relevant
+        point = random.random() * self._cum_weights[-1]  # noqa: S311
+        index = bisect(self._cum_weights, point)
+        return self.queues[min(index, len(self.queues) - 1)]
+
+
+class TaskRouter:
+    def __init__(self, routes: list) -> None:
+        self.routes = routes
+        self._compiled_routes = [
+            TaskRoute(pattern, queues) for pattern, queues in routes
+        ]
+        # the first matching route (or None) per function, as functions are few
+        self._matches: dict[str, TaskRoute | None] = {}
+        self._lock = threading.Lock()
+
+    def get_route(self, abs_func_name: str) -> TaskRoute | None:
+        try:
+            return self._matches[abs_func_name]
+        except KeyError:
+            pass
+
+        route = next(
+            (route for route in self._compiled_routes if route.matches(abs_func_name)),
+            None,
+        )
+        with self._lock:
+            self._matches[abs_func_name] = route
+        return route
+
+
+_router: TaskRouter | None = None
+
+
+def get_task_router() -> TaskRouter:
+    global _router
+    router = _router
+    if router is None or router.routes is not settings.TASK_ROUTES:
+        router = _router = TaskRouter(settings.TASK_ROUTES)
+    return router
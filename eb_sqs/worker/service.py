@@ -2,66 +2,121 @@ from __future__ import annotations
 
 import logging
 import signal
-from datetime import datetime, timedelta
+import threading
+import warnings
+from fnmatch import fnmatchcase
 from functools import partial
-from time import sleep
-from typing import TYPE_CHECKING, Any, Literal
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Any, Callable, Literal, NamedTuple
 
-import boto3
 import django.dispatch
-from botocore.config import Config
 from botocore.exceptions import ClientError
-from django.utils import timezone
+from django.db import connections
 
 from eb_sqs import settings
-from eb_sqs.worker.commons import django_db_management
+from eb_sqs.aws.queue_discovery import QueueDiscovery
+from eb_sqs.aws.sqs_connection import SqsConnection
+from eb_sqs.worker.circuit_breaker import CircuitBreaker, CircuitBreakers
+from eb_sqs.worker.commons import DbConnectionLifecycle, get_own_rss_mb
+from eb_sqs.worker.events import (
+    BatchEvent,
+    EventDispatcher,
+    MessageEvent,
+    MessageOutcome,
+)
+from eb_sqs.worker.health import WorkerHealth
+from eb_sqs.worker.polling import IdleBackoff, PollStats
+from eb_sqs.worker.sharding import QueueSharder
 from eb_sqs.worker.worker import Worker
-from eb_sqs.worker.worker_exceptions import ExecutionFailedException
+from eb_sqs.worker.worker_exceptions import (
+    ExecutionFailedException,
+    TaskDeferredException,
+)
 from eb_sqs.worker.worker_factory import WorkerFactory
+from eb_sqs.worker.worker_task import WorkerTask
 
 if TYPE_CHECKING:
-    from mypy_boto3_sqs import SQSServiceResource
-    from mypy_boto3_sqs.service_resource import Message, Queue
+    from mypy_boto3_sqs.service_resource import Message, Queue, SQSServiceResource
 
 logger = logging.getLogger(__name__)
 
 MESSAGES_RECEIVED = django.dispatch.Signal()
 MESSAGES_PROCESSED = django.dispatch.Signal()
 MESSAGES_DELETED = django.dispatch.Signal()
+BATCH_PROCESSED = django.dispatch.Signal()
+
+
+class _MessageResult(NamedTuple):
+    succeeded: bool
+    retry_after: int | None = None
+    error: Exception | None = None
+
+
+class _ReceivedBatch:
+    # the messages received from a queue, and how far they were handled
+    def __init__(
+        self,
+        queue: Queue,
+        messages: list[Message],
+        parsed_messages: dict[str, tuple[str | None, WorkerTask | None]],
+    ) -> None:
+        self.queue = queue
+        self.messages = messages
+        self.parsed_messages = parsed_messages
+        self.msg_entries: list[dict] = []
+        self.processed_messages: list[Message] = []
+        self.deferred_messages: list[tuple[Message, int]] = []
+        self.handled_message_ids: set[str] = set()
+        self.num_recorded_results = 0
 
 
 class WorkerService:
-    _PREFIX_STR = "prefix:"
     _RECEIVE_COUNT_ATTRIBUTE: Literal["ApproximateReceiveCount"] = (
         "ApproximateReceiveCount"
     )
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_tasks: int | None = None,
+        max_memory_mb: int | None = None,
+        health_file_name: str | None = None,
+    ) -> None:
         self._exit_gracefully = False
-        self._last_healthcheck_time: datetime | None = None
+        self._max_tasks = max_tasks
+        self._max_memory_mb = max_memory_mb
+        self._processed_tasks = 0
+        # the received batch of every execution lane, released if the process exits
+        self._in_flight_batches: dict[str, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+        self._drain_deadline: float | None = None
+        self._queue_discovery: QueueDiscovery | None = None
+        self._queue_sharder: QueueSharder | None = None
+        self._idle_backoff = IdleBackoff()
+        self._circuit_breakers = CircuitBreakers()
+        self._db_connections = DbConnectionLifecycle()
+        self._events = EventDispatcher()
+        self.poll_stats = PollStats()
+        self.health = WorkerHealth(health_file_name)
 
     def process_queues(self, queue_names: list) -> None:
         signal.signal(signal.SIGTERM, self._exit_called)
+        if signal.getsignal(signal.SIGINT) is not signal.SIG_IGN:
+            signal.signal(signal.SIGINT, self._exit_called)
 
         self.write_healthcheck_file()
-        self._last_healthcheck_time = timezone.now()
+        self.health.start()
 
         logger.debug("[django-eb-sqs] Connecting to SQS: %s", ", ".join(queue_names))
 
-        sqs: SQSServiceResource = boto3.resource(  # pyright: ignore
-            "sqs",
-            region_name=settings.AWS_REGION,
-            config=Config(retries={"max_attempts": settings.AWS_MAX_RETRIES}),
+        self._queue_sharder = (
+            QueueSharder(",".join(sorted(queue_names)), settings.SHARD_REPLICAS)
+            if settings.SHARD_REPLICAS
+            else None
         )
-
-        prefixes = list(filter(lambda qn: qn.startswith(self._PREFIX_STR), queue_names))
-        queues = self.get_queues_by_names(sqs, list(set(queue_names) - set(prefixes)))
-
-        queue_prefixes = [prefix.split(self._PREFIX_STR)[1] for prefix in prefixes]
-        static_queues = queues
-        last_update_time = timezone.now() - timedelta(
-            seconds=settings.REFRESH_PREFIX_QUEUES_S
+        self._queue_discovery = QueueDiscovery(
+            queue_names, sharder=self._queue_sharder
         )
+        static_queues = self._queue_discovery.static_queues
 
         logger.debug("[django-eb-sqs] Connected to SQS: %s", ", ".join(queue_names))
 
@@ -86,72 +141,117 @@ class WorkerService:
             "[django-eb-sqs] REFRESH_PREFIX_QUEUES_S = %s",
             settings.REFRESH_PREFIX_QUEUES_S,
         )
+        logger.info(
+            "[django-eb-sqs] IDLE_BACKOFF_MAX_S = %s", settings.IDLE_BACKOFF_MAX_S
+        )
+        logger.info("[django-eb-sqs] BATCH_LINGER_S = %s", settings.BATCH_LINGER_S)
+        logger.info("[django-eb-sqs] PRIORITY_QUEUES = %s", settings.PRIORITY_QUEUES)
+
+        lanes = [
+            threading.Thread(
+                target=self._process_priority_lane,
+                args=(static_queues,),
+                name=f"eb-sqs-priority-{slot}",
+                daemon=True,
+            )
+            for slot in range(
+                settings.PRIORITY_SLOTS if settings.PRIORITY_QUEUES else 0
+            )
+        ]
+        for lane in lanes:
+            lane.start()
 
         while not self._exit_gracefully:
-            if (
-                len(queue_prefixes) > 0
-                and timezone.now() - timedelta(seconds=settings.REFRESH_PREFIX_QUEUES_S)
-                > last_update_time
-            ):
-                queues = static_queues + self.get_queues_by_prefixes(
-                    sqs, queue_prefixes
-                )
-                last_update_time = timezone.now()
+            self.health.heartbeat()
+            if self._queue_sharder:
+                self._queue_sharder.heartbeat()
+
+            if self._queue_discovery.refresh():
                 logger.debug(
                     "[django-eb-sqs] Updated SQS queues: %s",
-                    ", ".join([queue.url for queue in queues]),
+                    ", ".join([queue.url for queue in self._queue_discovery.queues]),
                 )
 
+            queues = self._get_lane_queues(priority=False)
+
             logger.debug("[django-eb-sqs] Processing %s queues", len(queues))
             if len(queues) == 0:
                 sleep(settings.NO_QUEUES_WAIT_TIME_S)
             else:
                 self.process_messages(queues, worker, static_queues)
+                self._sleep(self._get_time_until_due(queues))
+
+        for lane in lanes:
+            lane.join()
+
+        if self._queue_sharder:
+            self._queue_sharder.leave()
+
+        self._events.close(settings.SHUTDOWN_TIMEOUT_S)
+        self.health.stop()
+
+    def _process_priority_lane(self, static_queues: list) -> None:
+        # reserved for priority queues, so their messages never wait behind other queues
+        worker = WorkerFactory.default().create()
+        try:
+            while not self._exit_gracefully:
+                queues = self._get_lane_queues(priority=True)
+                if len(queues) == 0:
+                    self._sleep(settings.NO_QUEUES_WAIT_TIME_S)
+                else:
+                    self.process_messages(queues, worker, static_queues)
+                    self._sleep(self._get_time_until_due(queues))
+        except Exception as exc:
+            logger.exception("[django-eb-sqs] Priority lane failed, exiting: %s", exc)
+            self._exit_gracefully = True
+        finally:
+            # connections of this thread
+            connections.close_all()
+
+    def _get_lane_queues(self, priority: bool) -> list[Queue]:
+        queues = self._queue_discovery.queues if self._queue_discovery else []
+        return [
+            queue for queue in queues if self._is_priority_queue(queue.url) == priority
+        ]
+
+    @staticmethod
+    def _is_priority_queue(queue_url: str) -> bool:
+        queue_name = SqsConnection.get_queue_name(queue_url)
+        return any(
+            fnmatchcase(queue_name, pattern) for pattern in settings.PRIORITY_QUEUES
+        )
 
     def process_messages(
         self, queues: list, worker: Worker, static_queues: list
     ) -> None:
+        exclusive = len(queues) == 1
         for queue in queues:
             if self._exit_gracefully:
                 return
 
-            try:
-                messages = self.poll_messages(queue)
-                logger.debug("[django-eb-sqs] Polled %s messages", len(messages))
-
-                self._send_signal(MESSAGES_RECEIVED, messages=messages)
-
-                msg_entries = []
-                for msg in messages:
-                    self._execute_user_code(partial(self._process_message, msg, worker))
-                    msg_entries.append(
-                        {"Id": msg.message_id, "ReceiptHandle": msg.receipt_handle}
-                    )
-
-                self._send_signal(MESSAGES_PROCESSED, messages=messages)
+            if not exclusive and not self._idle_backoff.is_due(queue.url):
+                continue
 
-                self.delete_messages(queue, msg_entries)
+            breaker = (
+                self._circuit_breakers.get(queue.url)
+                if self._circuit_breakers.enabled
+                else None
+            )
+            max_messages = (
+                breaker.acquire(settings.MAX_NUMBER_OF_MESSAGES)
+                if breaker
+                else settings.MAX_NUMBER_OF_MESSAGES
+            )
+            if max_messages == 0:
+                continue
 
-                self._send_signal(MESSAGES_DELETED, messages=messages)
+            batch: _ReceivedBatch | None = None
+            try:
+                batch = self._receive_messages(queue, worker, exclusive, max_messages)
+                self._process_received_messages(batch, worker, breaker)
+                self._check_recycling()
             except ClientError as exc:
-                error_code = exc.response.get("Error", {}).get("Code", None)
-                if (
-                    error_code == "AWS.SimpleQueueService.NonExistentQueue"
-                    and queue not in static_queues
-                ):
-                    logger.debug(
-                        "[django-eb-sqs] Queue was already deleted %s: %s",
-                        queue.url,
-                        exc,
-                        exc_info=True,
-                    )
-                else:
-                    logger.warning(
-                        "[django-eb-sqs] Error polling queue %s: %s",
-                        queue.url,
-                        exc,
-                        exc_info=True,
-                    )
+                self._handle_client_error(queue, static_queues, exc)
             except Exception as exc:  # noqa: BLE001
                 logger.warning(
                     "[django-eb-sqs] Error polling queue %s: %s",
@@ -159,14 +259,210 @@ class WorkerService:
                     exc,
                     exc_info=True,
                 )
+            finally:
+                with self._lock:
+                    self._in_flight_batches.pop(threading.current_thread().name, None)
+                if breaker:
+                    breaker.release(
+                        max_messages - (batch.num_recorded_results if batch else 0)
+                    )
+                if batch and batch.messages:
+                    self._db_connections.finish_batch()
+
+    def _receive_messages(
+        self, queue: Queue, worker: Worker, exclusive: bool, max_messages: int
+    ) -> _ReceivedBatch:
+        messages = self.poll_messages(
+            queue,
+            self._idle_backoff.get_wait_time_s(queue.url, exclusive),
+            max_messages,
+        )
+        parsed_messages = self._parse_messages(messages, worker)
+        if (
+            settings.BATCH_LINGER_S
+            and messages
+            and max_messages == settings.MAX_NUMBER_OF_MESSAGES
+            and any(batch_name for batch_name, _ in parsed_messages.values())
+        ):
+            lingered_messages = self.linger_messages(queue, len(messages))
+            parsed_messages.update(self._parse_messages(lingered_messages, worker))
+            messages += lingered_messages
+        logger.debug("[django-eb-sqs] Polled %s messages", len(messages))
+
+        self._idle_backoff.record(queue.url, len(messages), exclusive)
+        self.poll_stats.record(len(messages))
+        self.health.record_poll(SqsConnection.get_queue_name(queue.url), len(messages))
+
+        return _ReceivedBatch(queue, messages, parsed_messages)
+
+    def _process_received_messages(
+        self, batch: _ReceivedBatch, worker: Worker, breaker: CircuitBreaker | None
+    ) -> None:
+        if batch.messages:
+            self._db_connections.start_batch()
+
+        self._send_signal(MESSAGES_RECEIVED, messages=batch.messages)
+
+        collect_events = BATCH_PROCESSED.has_listeners(sender=self.__class__)
+        message_events: list[MessageEvent] = []
+        batch_start = monotonic()
+
+        with self._lock:
+            self._in_flight_batches[threading.current_thread().name] = partial(
+                self._release_stuck_batch,
+                batch.queue,
+                batch.messages,
+                batch.msg_entries,
+                batch.deferred_messages,
+            )
+        # not reset afterwards, as other lanes may share the worker
+        worker.time_limits.on_hard_time_limit = self._release_stuck_batches
+        for group in self._group_messages(batch.messages, batch.parsed_messages):
+            if self._is_drain_deadline_reached():
+                break
+
+            batch.handled_message_ids.update(msg.message_id for msg in group)
+            group_start = monotonic()
+            results = self._execute_group(group, worker, batch.parsed_messages)
+
+            if collect_events:
+                message_events += self._get_message_events(
+                    group, results, worker, monotonic() - group_start
+                )
+
+            self._record_results(batch, group, results, breaker)
+
+        self._send_signal(MESSAGES_PROCESSED, messages=batch.processed_messages)
+
+        self.delete_messages(batch.queue, batch.msg_entries)
+
+        self._send_signal(MESSAGES_DELETED, messages=batch.processed_messages)
+
+        self.defer_messages(batch.queue, batch.deferred_messages)
+
+        released_messages = [
+            msg
+            for msg in batch.messages
+            if msg.message_id not in batch.handled_message_ids
+        ]
+        self.release_messages(batch.queue, released_messages)
+
+        if collect_events:
+            message_events += [
+                MessageEvent(msg.message_id, None, None, MessageOutcome.RELEASED, 0)
+                for msg in released_messages
+            ]
+            self._events.dispatch(
+                BATCH_PROCESSED,
+                sender=self.__class__,
+                event=BatchEvent(
+                    SqsConnection.get_queue_name(batch.queue.url),
+                    message_events,
+                    monotonic() - batch_start,
+                ),
+            )
+
+    def _execute_group(
+        self,
+        group: list[Message],
+        worker: Worker,
+        parsed_messages: dict[str, tuple[str | None, WorkerTask | None]],
+    ) -> list[_MessageResult | None]:
+        results: list[_MessageResult | None] = [None] * len(group)
+        self.health.task_started_now(self._get_task_name(group[0]))
+        try:
+            worker_tasks = [parsed_messages[msg.message_id][1] for msg in group]
+            results = (
+                self._execute_user_code(
+                    partial(self._process_batch, group, worker, worker_tasks)
+                )
+                if len(group) > 1
+                else [
+                    self._execute_user_code(
+                        partial(
+                            self._process_message, group[0], worker, worker_tasks[0]
+                        )
+                    )
+                ]
+            ) or results
+        finally:
+            self.health.task_finished(
+                len(group),
+                sum(
+                    1
+                    for result in results
+                    if not result
+                    or (not result.succeeded and result.retry_after is None)
+                ),
+            )
+        return results
+
+    def _record_results(
+        self,
+        batch: _ReceivedBatch,
+        group: list[Message],
+        results: list[_MessageResult | None],
+        breaker: CircuitBreaker | None,
+    ) -> None:
+        for msg, result in zip(group, results):
+            if result and result.retry_after is not None:
+                batch.deferred_messages.append((msg, result.retry_after))
+                continue
+
+            if breaker and result:
+                breaker.record(result.succeeded)
+                batch.num_recorded_results += 1
+
+            batch.msg_entries.append(
+                {"Id": msg.message_id, "ReceiptHandle": msg.receipt_handle}
+            )
+            batch.processed_messages.append(msg)
+            with self._lock:
+                self._processed_tasks += 1
+
+    def _handle_client_error(
+        self, queue: Queue, static_queues: list, exc: ClientError
+    ) -> None:
+        error_code = exc.response.get("Error", {}).get("Code", None)
+        if (
+            error_code == "AWS.SimpleQueueService.NonExistentQueue"
+            and queue not in static_queues
+        ):
+            logger.debug(
+                "[django-eb-sqs] Queue was already deleted %s: %s",
+                queue.url,
+                exc,
+                exc_info=exc,
+            )
+            if self._queue_discovery:
+                self._queue_discovery.remove(queue)
+            self._idle_backoff.forget(queue.url)
+        else:
+            logger.warning(
+                "[django-eb-sqs] Error polling queue %s: %s",
+                queue.url,
+                exc,
+                exc_info=exc,
+            )
 
-            if (self._last_healthcheck_time is None) or (
-                timezone.now()
-                - timedelta(seconds=settings.MIN_HEALTHCHECK_WRITE_PERIOD_S)
-                > self._last_healthcheck_time
-            ):
-                self.write_healthcheck_file()
-                self._last_healthcheck_time = timezone.now()
+    def _check_recycling(self) -> None:
+        # checked between batches, so no received messages are left behind
+        if self._max_tasks and self._processed_tasks >= self._max_tasks:
+            logger.info(
+                "[django-eb-sqs] Processed %s tasks, exiting for recycling",
+                self._processed_tasks,
+            )
+            self._exit_gracefully = True
+            return
+
+        if self._max_memory_mb:
+            rss_mb = get_own_rss_mb()
+            if rss_mb > self._max_memory_mb:
+                logger.info(
+                    "[django-eb-sqs] Using %.1f MB of memory, exiting for recycling",
+                    rss_mb,
+                )
+                self._exit_gracefully = True
 
     def delete_messages(self, queue: Queue, msg_entries: list) -> None:
         if len(msg_entries) > 0:
@@ -182,13 +478,111 @@ class WorkerService:
                     failed,
                 )
 
-    def poll_messages(self, queue: Queue) -> list[Message]:
+    def _release_stuck_batches(self) -> None:
+        # the whole process exits, so the batches of all lanes are released
+        with self._lock:
+            release_batches = list(self._in_flight_batches.values())
+
+        for release_batch in release_batches:
+            self._try_release_batch(release_batch)
+
+    @staticmethod
+    def _try_release_batch(release_batch: Callable[[], None]) -> None:
+        # one failing release doesn't keep the other lanes' messages hidden
+        try:
+            release_batch()
+        except Exception as exc:
+            logger.warning(
+                "[django-eb-sqs] Failed releasing messages: %s", exc, exc_info=True
+            )
+
+    def _release_stuck_batch(
+        self,
+        queue: Queue,
+        messages: list[Message],
+        msg_entries: list[dict],
+        deferred_messages: list[tuple[Message, int]],
+    ) -> None:
+        # called before the process exits on a task exceeding its hard time limit
+        handled_message_ids = {entry["Id"] for entry in msg_entries} | {
+            msg.message_id for msg, _ in deferred_messages
+        }
+        self.delete_messages(queue, list(msg_entries))
+        self.defer_messages(queue, list(deferred_messages))
+        self.release_messages(
+            queue,
+            [msg for msg in messages if msg.message_id not in handled_message_ids],
+        )
+
+    def release_messages(self, queue: Queue, messages: list[Message]) -> None:
+        if len(messages) > 0:
+            logger.info(
+                "[django-eb-sqs] Releasing %s unprocessed messages", len(messages)
+            )
+
+            self.defer_messages(queue, [(msg, 0) for msg in messages])
+
+    def defer_messages(self, queue: Queue, deferred_messages: list) -> None:
+        if len(deferred_messages) > 0:
+            response = queue.change_message_visibility_batch(
+                Entries=[
+                    {
+                        "Id": msg.message_id,
+                        "ReceiptHandle": msg.receipt_handle,
+                        "VisibilityTimeout": visibility_timeout,
+                    }
+                    for msg, visibility_timeout in deferred_messages
+                ]
+            )
+
+            # logging
+            failed = response.get("Failed", [])
+            num_failed = len(failed)
+            if num_failed > 0:
+                logger.warning(
+                    "[django-eb-sqs] Failed changing visibility of %s messages: %s",
+                    num_failed,
+                    failed,
+                )
+
+    def poll_messages(
+        self,
+        queue: Queue,
+        wait_time_s: int | None = None,
+        max_messages: int | None = None,
+    ) -> list[Message]:
         return queue.receive_messages(
-            MaxNumberOfMessages=settings.MAX_NUMBER_OF_MESSAGES,
-            WaitTimeSeconds=settings.WAIT_TIME_S,
+            MaxNumberOfMessages=max_messages or settings.MAX_NUMBER_OF_MESSAGES,
+            WaitTimeSeconds=settings.WAIT_TIME_S if wait_time_s is None else wait_time_s,
             AttributeNames=[self._RECEIVE_COUNT_ATTRIBUTE],
+            MessageAttributeNames=WorkerTask.ATTRIBUTE_NAMES,
         )
 
+    def linger_messages(self, queue: Queue, num_messages: int) -> list[Message]:
+        # wait a little for more messages, so batch tasks get larger batches
+        messages: list[Message] = []
+        deadline = monotonic() + settings.BATCH_LINGER_S
+        while (
+            not self._exit_gracefully
+            and num_messages + len(messages) < settings.BATCH_MAX_MESSAGES
+            and monotonic() < deadline
+        ):
+            wait_time_s = int(deadline - monotonic())
+            received = self.poll_messages(
+                queue,
+                wait_time_s,
+                min(
+                    settings.MAX_NUMBER_OF_MESSAGES,
+                    settings.BATCH_MAX_MESSAGES - num_messages - len(messages),
+                ),
+            )
+            messages += received
+            self.poll_stats.record(len(received))
+
+            if wait_time_s == 0 and not received:
+                break
+        return messages
+
     def _send_signal(
         self, dispatch_signal: django.dispatch.Signal, messages: list[Message]
     ) -> None:
@@ -197,7 +591,9 @@ class WorkerService:
                 lambda: dispatch_signal.send(sender=self.__class__, messages=messages)
             )
 
-    def _process_message(self, msg: Message, worker: Worker) -> None:
+    def _process_message(
+        self, msg: Message, worker: Worker, worker_task: WorkerTask | None = None
+    ) -> _MessageResult:
         logger.debug("[django-eb-sqs] Read message %s", msg.message_id)
         try:
             receive_count = int(msg.attributes[self._RECEIVE_COUNT_ATTRIBUTE])
@@ -209,43 +605,211 @@ class WorkerService:
                     msg.body,
                 )
 
-            worker.execute(msg.body)
+            worker.execute(msg.body, self._get_attributes(msg), worker_task)
 
             logger.debug("[django-eb-sqs] Processed message %s", msg.message_id)
+        except TaskDeferredException as exc:
+            logger.debug(
+                "[django-eb-sqs] Deferring message %s of task %s by %s seconds (%s)",
+                msg.message_id,
+                exc.task_name,
+                exc.retry_after,
+                exc.__class__.__name__,
+            )
+            return _MessageResult(False, exc.retry_after)
         except ExecutionFailedException as exc:
             logger.warning(
                 "[django-eb-sqs] Handling message %s got error: %r", msg.message_id, exc
             )
+            return _MessageResult(False, error=exc)
+
+        return _MessageResult(True)
+
+    @staticmethod
+    def _get_message_events(
+        msgs: list[Message],
+        results: list[_MessageResult | None],
+        worker: Worker,
+        duration_s: float,
+    ) -> list[MessageEvent]:
+        # the messages of a batch share its duration
+        tasks = worker.last_tasks if len(worker.last_tasks) == len(msgs) else []
+        events = []
+        for index, (msg, result) in enumerate(zip(msgs, results)):
+            attributes = WorkerService._get_attributes(msg)
+            if result is None:
+                outcome = MessageOutcome.FAILED
+            elif result.retry_after is not None:
+                outcome = MessageOutcome.DEFERRED
+            elif result.succeeded:
+                outcome = MessageOutcome.SUCCEEDED
+            else:
+                outcome = MessageOutcome.FAILED
+
+            events.append(
+                MessageEvent(
+                    msg.message_id,
+                    tasks[index].id
+                    if tasks
+                    else attributes.get(WorkerTask.ID_ATTRIBUTE),
+                    tasks[index].abs_func_name
+                    if tasks
+                    else attributes.get(WorkerTask.FUNC_ATTRIBUTE),
+                    outcome,
+                    duration_s / len(msgs),
+                    result.error if result else None,
+                    float(attributes[WorkerTask.ENQUEUED_AT_ATTRIBUTE])
+                    if WorkerTask.ENQUEUED_AT_ATTRIBUTE in attributes
+                    else None,
+                )
+            )
+        return events
+
+    @staticmethod
+    def _get_attributes(msg: Message) -> dict[str, str]:
+        return {
+            name: attribute["StringValue"]
+            for name, attribute in (msg.message_attributes or {}).items()
+            if "StringValue" in attribute
+        }
+
+    @staticmethod
+    def _get_task_name(msg: Message) -> str:
+        return (
+            WorkerService._get_attributes(msg).get(WorkerTask.FUNC_ATTRIBUTE)
+            or f"message {msg.message_id}"
+        )
 
     @staticmethod
-    def _execute_user_code(function: Any) -> None:
+    def _parse_messages(
+        messages: list[Message], worker: Worker
+    ) -> dict[str, tuple[str | None, WorkerTask | None]]:
+        # the batch name of every message, and its task if it had to be parsed for it
+        return {
+            msg.message_id: worker.parse_batch_name(
+                msg.body, WorkerService._get_attributes(msg)
+            )
+            for msg in messages
+        }
+
+    @staticmethod
+    def _group_messages(
+        messages: list[Message],
+        parsed_messages: dict[str, tuple[str | None, WorkerTask | None]],
+    ) -> list[list[Message]]:
+        # messages of the same batch task are executed together
+        groups: list[list[Message]] = []
+        batches: dict[str, list[Message]] = {}
+        for msg in messages:
+            batch_name = parsed_messages[msg.message_id][0]
+            if batch_name is None:
+                groups.append([msg])
+            elif batch_name in batches:
+                batches[batch_name].append(msg)
+            else:
+                batches[batch_name] = [msg]
+                groups.append(batches[batch_name])
+        return groups
+
+    def _process_batch(
+        self,
+        msgs: list[Message],
+        worker: Worker,
+        worker_tasks: list[WorkerTask | None] | None = None,
+    ) -> list[_MessageResult]:
+        logger.debug("[django-eb-sqs] Read batch of %s messages", len(msgs))
         try:
-            with django_db_management():
-                function()
+            outcomes = worker.execute_batch([msg.body for msg in msgs], worker_tasks)
+        except TaskDeferredException as exc:
+            logger.debug(
+                "[django-eb-sqs] Deferring batch of %s messages of task %s by %s seconds (%s)",
+                len(msgs),
+                exc.task_name,
+                exc.retry_after,
+                exc.__class__.__name__,
+            )
+            return [_MessageResult(False, exc.retry_after)] * len(msgs)
+
+        results = []
+        for msg, outcome in zip(msgs, outcomes):
+            if outcome is not None:
+                logger.warning(
+                    "[django-eb-sqs] Handling message %s got error: %r",
+                    msg.message_id,
+                    outcome,
+                )
+            results.append(_MessageResult(outcome is None, error=outcome))
+
+        logger.debug("[django-eb-sqs] Processed batch of %s messages", len(msgs))
+        return results
+
+    def _execute_user_code(self, function: Any) -> Any:
+        try:
+            with self._db_connections.message():
+                return function()
         except Exception as exc:
             logger.exception("[django-eb-sqs] Unhandled error: %s", exc)
+            return None
 
     def get_queues_by_names(
         self, sqs: SQSServiceResource, queue_names: list
     ) -> list[Queue]:
-        return [
-            sqs.get_queue_by_name(QueueName=queue_name) for queue_name in queue_names
-        ]
+        warnings.warn(
+            "WorkerService.get_queues_by_names is deprecated, use QueueDiscovery",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return QueueDiscovery(queue_names).static_queues
 
     def get_queues_by_prefixes(
         self, sqs: SQSServiceResource, prefixes: list
     ) -> list[Queue]:
-        queues: list[Queue] = []
+        warnings.warn(
+            "WorkerService.get_queues_by_prefixes is deprecated, use QueueDiscovery",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        queue_discovery = QueueDiscovery(
+            [f"{QueueDiscovery.PREFIX_STR}{prefix}" for prefix in prefixes]
+        )
+        queue_discovery.refresh(force=True)
+        return queue_discovery.queues
 
-        for prefix in prefixes:
-            queues += sqs.queues.filter(QueueNamePrefix=prefix)
+    def write_healthcheck_file(self) -> None:
+        self.health.write()
 
-        return queues
+    def _sleep(self, seconds: float) -> None:
+        # sleep in short steps to react to termination signals
+        deadline = monotonic() + seconds
+        while not self._exit_gracefully:
+            remaining_s = deadline - monotonic()
+            if remaining_s <= 0:
+                return
+            self.health.heartbeat()
+            sleep(max(0, min(1, remaining_s)))
+
+    def _get_time_until_due(self, queues: list[Queue]) -> float:
+        # time until any of the queues is neither backing off nor paused by its breaker
+        return min(
+            max(
+                self._idle_backoff.get_time_until_due([queue.url])
+                if len(queues) > 1
+                else 0,
+                self._circuit_breakers.get_time_until_probe(queue.url),
+            )
+            for queue in queues
+        )
 
-    def write_healthcheck_file(self) -> None:
-        with open(settings.HEALTHCHECK_FILE_NAME, "w") as file:
-            file.write(timezone.now().isoformat())
+    def _is_drain_deadline_reached(self) -> bool:
+        return self._drain_deadline is not None and monotonic() >= self._drain_deadline
 
     def _exit_called(self, signum: int, frame: Any) -> None:
         logger.info("[django-eb-sqs] Termination signal called: %s", signum)
+
+        if self._exit_gracefully:
+            # a repeated signal releases the remaining messages right away
+            self._drain_deadline = monotonic()
+        else:
+            self._drain_deadline = monotonic() + settings.SHUTDOWN_TIMEOUT_S
+
         self._exit_gracefully = True
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import logging
+import os
+import socket
+import threading
+import uuid
+from abc import ABCMeta, abstractmethod
+from time import monotonic, time
+
+from django.core.cache import cache
+
+from eb_sqs import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), "big"
+    )
+
+
+class MembershipBackend(metaclass=ABCMeta):
+    @abstractmethod
+    def heartbeat(self, group: str, member_id: str, ttl_s: int) -> None:
+        pass
+
+    @abstractmethod
+    def leave(self, group: str, member_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def get_members(self, group: str) -> list[str]:
+        pass
+
+
+class InMemoryMembershipBackend(MembershipBackend):
+    def __init__(self) -> None:
+        self._groups: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def heartbeat(self, group: str, member_id: str, ttl_s: int) -> None:
+        with self._lock:
+            self._groups.setdefault(group, {})[member_id] = time() + ttl_s
+
+    def leave(self, group: str, member_id: str) -> None:
+        with self._lock:
+            self._groups.get(group, {}).pop(member_id, None)
+
+    def get_members(self, group: str) -> list[str]:
+        now = time()
+        with self._lock:
+            return sorted(
+                member_id
+                for member_id, expires in self._groups.get(group, {}).items()
+                if expires > now
+            )
+
+
+class CacheMembershipBackend(MembershipBackend):
+    _KEY_PREFIX = "eb-sqs-members"
+
+    def heartbeat(self, group: str, member_id: str, ttl_s: int) -> None:
+        # every member only writes its own key, the index of the group is just written
+        # when a member is missing from it (a member dropped by a concurrent update
+        # re-adds itself on its next heartbeat)
+        cache.set(self._member_key(group, member_id), True, ttl_s)
+
+        if member_id in self._get_index(group):
+            cache.touch(self._index_key(group), ttl_s * 2)
+        else:
+            cache.set(
+                self._index_key(group), [*self.get_members(group), member_id], ttl_s * 2
+            )
+
+    def leave(self, group: str, member_id: str) -> None:
+        cache.delete(self._member_key(group, member_id))
+
+    def get_members(self, group: str) -> list[str]:
+        member_ids = set(self._get_index(group))
+        alive = cache.get_many(
+            [self._member_key(group, member_id) for member_id in member_ids]
+        )
+        return sorted(
+            member_id
+            for member_id in member_ids
+            if self._member_key(group, member_id) in alive
+        )
+
+    def _get_index(self, group: str) -> list[str]:
+        return cache.get(self._index_key(group)) or []
+
+    def _index_key(self, group: str) -> str:
+        return f"{self._KEY_PREFIX}:{_hash(group):x}"
+
+    def _member_key(self, group: str, member_id: str) -> str:
+        return f"{self._index_key(group)}:{_hash(member_id):x}"
+
+
+class ConsistentHashRing:
+    def __init__(self, members: list[str], virtual_nodes: int) -> None:
+        self.members = sorted(set(members))
+
+        ring = sorted(
+            (_hash(f"{member_id}#{i}"), member_id)
+            for member_id in self.members
+            for i in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in ring]
+        self._member_ids = [member_id for _, member_id in ring]
+
+    def get_members(self, key: str, count: int) -> list[str]:
+        count = min(count, len(self.members))
+        if count == 0:
+            return []
+
+        assigned: list[str] = []
+        index = bisect.bisect(self._hashes, _hash(key))
+        while len(assigned) < count:
+            member_id = self._member_ids[index % len(self._member_ids)]
+            if member_id not in assigned:
+                assigned.append(member_id)
+            index += 1
+
+        return assigned
+
+
+class QueueSharder:
+    def __init__(
+        self,
+        group: str,
+        replicas: int,
+        backend: MembershipBackend | None = None,
+        member_id: str | None = None,
+    ) -> None:
+        self.group = group
+        self.replicas = replicas
+        self.member_id = (
+            member_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.version = 0
+
+        self._backend = backend or settings.SHARD_MEMBERSHIP_BACKEND or (
+            CacheMembershipBackend()
+        )
+        self._ring = ConsistentHashRing([self.member_id], settings.SHARD_VIRTUAL_NODES)
+        self._last_heartbeat_time: float | None = None
+
+    def heartbeat(self, force: bool = False) -> bool:
+        if not (
+            force
+            or self._last_heartbeat_time is None
+            or monotonic() - self._last_heartbeat_time
+            >= settings.SHARD_HEARTBEAT_INTERVAL_S
+        ):
+            return False
+
+        self._last_heartbeat_time = monotonic()
+
+        try:
+            self._backend.heartbeat(
+                self.group, self.member_id, settings.SHARD_MEMBER_TTL_S
+            )
+            members = self._backend.get_members(self.group)
+        except Exception as exc:
+            logger.warning(
+                "[django-eb-sqs] Error updating shard membership: %s",
+                exc,
+                exc_info=True,
+            )
+            return False
+
+        # never drop ourselves, even if the backend lost our heartbeat
+        members = sorted(set(members) | {self.member_id})
+        if members == self._ring.members:
+            return False
+
+        logger.info(
+            "[django-eb-sqs] Rebalancing queues across %s workers", len(members)
+        )
+        self._ring = ConsistentHashRing(members, settings.SHARD_VIRTUAL_NODES)
+        self.version += 1
+        return True
+
+    def leave(self) -> None:
+        try:
+            self._backend.leave(self.group, self.member_id)
+        except Exception as exc:
+            logger.warning(
+                "[django-eb-sqs] Error leaving shard membership: %s", exc, exc_info=True
+            )
+
+    def is_assigned(self, queue_name: str) -> bool:
+        return self.member_id in self._ring.get_members(queue_name, self.replicas)
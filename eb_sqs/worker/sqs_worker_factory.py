@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import os
+import threading
+
 from eb_sqs.aws.sqs_queue_client import SqsQueueClient
 from eb_sqs.worker.worker import Worker
 from eb_sqs.worker.worker_factory import WorkerFactory
 
 
 class SqsWorkerFactory(WorkerFactory):
-    _WORKER: Worker | None = None
+    _WORKERS = threading.local()
 
     def __init__(self) -> None:
         super().__init__()
 
     def create(self) -> Worker:
-        if not SqsWorkerFactory._WORKER:
-            SqsWorkerFactory._WORKER = Worker(SqsQueueClient())
-        return SqsWorkerFactory._WORKER
+        # one worker per thread, rebuilt in forked processes
+        workers = SqsWorkerFactory._WORKERS
+        if getattr(workers, "pid", None) != os.getpid():
+            workers.worker = Worker(SqsQueueClient())
+            workers.pid = os.getpid()
+        return workers.worker
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import contextlib
+import gc
+import logging
+import os
+import signal
+from time import monotonic, sleep
+from typing import Any, Callable
+
+from django.db import connections
+from django.utils.module_loading import autodiscover_modules
+
+from eb_sqs import settings
+from eb_sqs.worker.autoscaler import QueueDepthAutoscaler
+from eb_sqs.worker.commons import get_process_rss_mb
+from eb_sqs.worker.health import get_child_health_file_name, remove_child_health_file
+from eb_sqs.worker.service import WorkerService
+from eb_sqs.worker.time_limits import HARD_TIME_LIMIT_EXIT_CODE
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerSupervisor:
+    def __init__(
+        self,
+        queue_names: list,
+        processes: int,
+        max_tasks_per_child: int | None = None,
+        max_memory_per_child_mb: int | None = None,
+        service_factory: Callable[..., WorkerService] = WorkerService,
+        autoscaler: QueueDepthAutoscaler | None = None,
+    ) -> None:
+        self._queue_names = queue_names
+        self._processes = processes
+        self._max_tasks_per_child = max_tasks_per_child
+        self._max_memory_per_child_mb = max_memory_per_child_mb
+        self._service_factory = service_factory
+        self._autoscaler = autoscaler
+
+        self._children: set[int] = set()
+        self._draining: set[int] = set()
+        self._exit_gracefully = False
+        self._last_crash_time: float | None = None
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._exit_called)
+        signal.signal(signal.SIGINT, self._exit_called)
+
+        self.preload()
+
+        logger.info(
+            "[django-eb-sqs] Starting supervisor with %s processes: %s",
+            self._processes,
+            ", ".join(self._queue_names),
+        )
+
+        while not self._exit_gracefully:
+            self._reap_children()
+            self._recycle_children()
+
+            if self._autoscaler:
+                self._scale(self._autoscaler.desired_processes(self._processes))
+
+            self._spawn_children()
+            sleep(settings.SUPERVISOR_POLL_INTERVAL_S)
+
+        self._stop_children()
+
+    def preload(self) -> None:
+        # import the task modules of all apps so children share them copy-on-write
+        autodiscover_modules("tasks")
+
+        # connections must not be shared between parent and children
+        connections.close_all()
+
+        # keep the garbage collector from touching (and copying) inherited objects
+        gc.freeze()
+
+    def _can_spawn(self) -> bool:
+        return (
+            self._last_crash_time is None
+            or monotonic() - self._last_crash_time
+            > settings.SUPERVISOR_RESTART_BACKOFF_S
+        )
+
+    def _spawn_children(self) -> None:
+        # a signal received while spawning stops spawning further children
+        while (
+            not self._exit_gracefully
+            and len(self._children - self._draining) < self._processes
+            and self._can_spawn()
+        ):
+            self._spawn_child()
+
+    def _spawn_child(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            # the child must never return into the supervisor loop, even on SystemExit
+            code = 1
+            try:
+                code = self._run_child()
+            finally:
+                os._exit(code)
+
+        logger.info("[django-eb-sqs] Started worker process %s", pid)
+        self._children.add(pid)
+
+    def _run_child(self) -> int:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # the supervisor propagates interrupts as SIGTERM
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        try:
+            # children recycle themselves between batches, the supervisor
+            # recycles them if they exceed the memory ceiling within a batch
+            self._service_factory(
+                max_tasks=self._max_tasks_per_child,
+                max_memory_mb=self._max_memory_per_child_mb,
+                health_file_name=get_child_health_file_name(os.getpid()),
+            ).process_queues(self._queue_names)
+        except Exception as exc:
+            logger.exception("[django-eb-sqs] Worker process failed: %s", exc)
+            return 1
+
+        return 0
+
+    def _reap_children(self) -> None:
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                return
+
+            if pid == 0:
+                return
+
+            self._children.discard(pid)
+            remove_child_health_file(pid)
+            stopped = pid in self._draining or self._exit_gracefully
+            self._draining.discard(pid)
+
+            exit_code = (
+                os.WEXITSTATUS(status)
+                if os.WIFEXITED(status)
+                else -os.WTERMSIG(status)
+            )
+            if exit_code == 0 or (stopped and exit_code == -signal.SIGTERM):
+                logger.info("[django-eb-sqs] Worker process %s exited", pid)
+            elif exit_code == HARD_TIME_LIMIT_EXIT_CODE:
+                # not a crash, the process is replaced without backoff
+                logger.warning(
+                    "[django-eb-sqs] Worker process %s exceeded a hard time limit",
+                    pid,
+                )
+            else:
+                logger.warning(
+                    "[django-eb-sqs] Worker process %s crashed with exit code %s",
+                    pid,
+                    exit_code,
+                )
+                self._last_crash_time = monotonic()
+
+    def _recycle_children(self) -> None:
+        if not self._max_memory_per_child_mb:
+            return
+
+        for pid in self._children - self._draining:
+            rss_mb = get_process_rss_mb(pid)
+            if rss_mb is not None and rss_mb > self._max_memory_per_child_mb:
+                logger.info(
+                    "[django-eb-sqs] Recycling worker process %s using %.1f MB",
+                    pid,
+                    rss_mb,
+                )
+                self._draining.add(pid)
+                self._signal_child(pid, signal.SIGTERM)
+
+    def _scale(self, processes: int) -> None:
+        if processes == self._processes:
+            return
+
+        logger.info(
+            "[django-eb-sqs] Scaling from %s to %s worker processes",
+            self._processes,
+            processes,
+        )
+        self._processes = processes
+
+        active_children = sorted(self._children - self._draining)
+        for pid in active_children[processes:]:
+            self._draining.add(pid)
+            self._signal_child(pid, signal.SIGTERM)
+
+    def _stop_children(self) -> None:
+        logger.info("[django-eb-sqs] Stopping %s worker processes", len(self._children))
+
+        for pid in list(self._children):
+            self._signal_child(pid, signal.SIGTERM)
+
+        deadline = monotonic() + settings.SUPERVISOR_SHUTDOWN_TIMEOUT_S
+        while self._children and monotonic() < deadline:
+            self._reap_children()
+            sleep(settings.SUPERVISOR_POLL_INTERVAL_S)
+
+        for pid in list(self._children):
+            logger.warning("[django-eb-sqs] Killing worker process %s", pid)
+            self._signal_child(pid, signal.SIGKILL)
+            self._children.discard(pid)
+            with contextlib.suppress(ChildProcessError):
+                os.waitpid(pid, 0)
+
+    def _signal_child(self, pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            self._children.discard(pid)
+
+    def _exit_called(self, signum: int, frame: Any) -> None:
+        logger.info("[django-eb-sqs] Termination signal called: %s", signum)
+        self._exit_gracefully = True
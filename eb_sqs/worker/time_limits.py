@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import threading
+from contextlib import contextmanager
+from time import monotonic
+from typing import Any, Callable, Generator
+
+from eb_sqs import settings
+from eb_sqs.worker.worker_exceptions import SoftTimeLimitExceededException
+
+logger = logging.getLogger(__name__)
+
+# exit code of worker processes stopped by a hard time limit, the supervisor replaces them at once
+HARD_TIME_LIMIT_EXIT_CODE = 75
+
+
+def get_time_limits(func: Any) -> tuple[float | None, float | None]:
+    # a limit of 0 disables the default limit for the task
+    soft_time_limit = getattr(func, "soft_time_limit", None)
+    hard_time_limit = getattr(func, "hard_time_limit", None)
+    return (
+        settings.SOFT_TIME_LIMIT_S if soft_time_limit is None else soft_time_limit,
+        settings.HARD_TIME_LIMIT_S if hard_time_limit is None else hard_time_limit,
+    )
+
+
+class TimeLimits:
+    def __init__(self) -> None:
+        # called before the process exits, e.g. to release the received messages
+        self.on_hard_time_limit: Callable[[], None] | None = None
+
+        # the deadline and hard time limit of the task of each thread, as execution
+        # lanes may share a worker
+        self._deadlines: dict[int, tuple[float, float]] = {}
+        self._condition = threading.Condition()
+        self._watchdog: threading.Thread | None = None
+
+    @contextmanager
+    def limit(
+        self, soft_time_limit: float | None, hard_time_limit: float | None
+    ) -> Generator[None, None, None]:
+        with self._soft_limit(soft_time_limit), self._hard_limit(hard_time_limit):
+            yield
+
+    @contextmanager
+    def _soft_limit(self, time_limit: float | None) -> Generator[None, None, None]:
+        # signals can only be handled by the main thread
+        if not time_limit or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+
+        def _exceeded(signum: int, frame: Any) -> None:
+            raise SoftTimeLimitExceededException(time_limit)
+
+        previous_handler = signal.signal(signal.SIGALRM, _exceeded)
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+    @contextmanager
+    def _hard_limit(self, time_limit: float | None) -> Generator[None, None, None]:
+        if not time_limit:
+            yield
+            return
+
+        self._start_watchdog()
+        thread_id = threading.get_ident()
+        with self._condition:
+            self._deadlines[thread_id] = (monotonic() + time_limit, time_limit)
+            self._condition.notify()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._deadlines.pop(thread_id, None)
+                self._condition.notify()
+
+    def _start_watchdog(self) -> None:
+        if self._watchdog is None:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="eb-sqs-time-limits", daemon=True
+            )
+            self._watchdog.start()
+
+    def _watch(self) -> None:
+        while True:
+            with self._condition:
+                thread_id, (deadline, time_limit) = self._get_next_deadline()
+                while monotonic() < deadline:
+                    self._condition.wait(
+                        None if deadline == float("inf") else deadline - monotonic()
+                    )
+                    thread_id, (deadline, time_limit) = self._get_next_deadline()
+                del self._deadlines[thread_id]
+
+            self._exceeded(time_limit)
+
+    def _get_next_deadline(self) -> tuple[int, tuple[float, float]]:
+        return min(
+            self._deadlines.items(),
+            key=lambda item: item[1][0],
+            default=(0, (float("inf"), 0.0)),
+        )
+
+    def _exceeded(self, time_limit: float) -> None:
+        # a task stuck in the main thread can't be interrupted, so the whole process exits
+        logger.critical(
+            "[django-eb-sqs] Task exceeded hard time limit of %s seconds, exiting",
+            time_limit,
+        )
+        if self.on_hard_time_limit:
+            try:
+                self.on_hard_time_limit()
+            except Exception as exc:
+                logger.warning(
+                    "[django-eb-sqs] Failed releasing messages: %s", exc, exc_info=True
+                )
+
+        logging.shutdown()
+        os._exit(HARD_TIME_LIMIT_EXIT_CODE)
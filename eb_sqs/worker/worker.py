@@ -1,35 +1,94 @@
 from __future__ import annotations
 
+import itertools
 import logging
+import math
+import threading
 import uuid
-from typing import Any
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable
 
 from eb_sqs import settings
+from eb_sqs.worker.circuit_breaker import CircuitBreakers
 from eb_sqs.worker.queue_client import (
     QueueClient,
     QueueClientException,
     QueueDoesNotExistException,
+    call_add_message,
+    call_add_messages,
 )
+from eb_sqs.worker.rate_limits import TaskLimiter
+from eb_sqs.worker.results import (
+    AsyncResult,
+    TaskState,
+    TaskStatus,
+    get_result_backend,
+)
+from eb_sqs.worker.routing import TaskRoute
+from eb_sqs.worker.time_limits import TimeLimits, get_time_limits
 from eb_sqs.worker.worker_exceptions import (
     ExecutionFailedException,
     InvalidMessageFormatException,
     InvalidQueueException,
     MaxRetriesReachedException,
+    PartialBatchFailureException,
     QueueException,
+    TaskDeferredException,
 )
-from eb_sqs.worker.worker_task import WorkerTask
+from eb_sqs.worker.worker_task import TaskCall, WorkerTask
 
 logger = logging.getLogger("eb_sqs")
 
 
+class TaskMapResult:
+    def __init__(self) -> None:
+        self.sent = 0
+        self.failed: list[int] = []
+
+
 class Worker:
     def __init__(self, queue_client: QueueClient) -> None:
         super().__init__()
         self.queue_client = queue_client
+        self.task_limiter = TaskLimiter()
+        self.circuit_breakers = CircuitBreakers()
+        self.time_limits = TimeLimits()
+        # by thread, as execution lanes may share a worker
+        self._local = threading.local()
+
+    @property
+    def last_tasks(self) -> list[WorkerTask]:
+        # the tasks of the last executed message(s), so callers don't parse them again
+        return getattr(self._local, "last_tasks", [])
+
+    @last_tasks.setter
+    def last_tasks(self, last_tasks: list[WorkerTask]) -> None:
+        self._local.last_tasks = last_tasks
+
+    def execute(
+        self,
+        msg: str,
+        attributes: dict[str, str] | None = None,
+        worker_task: WorkerTask | None = None,
+    ) -> Any:
+        # worker_task is the message if already parsed, e.g. by parse_batch_name
+        self.last_tasks = []
+        if (
+            settings.DEAD_LETTER_MODE
+            and attributes
+            and WorkerTask.ID_ATTRIBUTE in attributes
+        ):
+            # the header is enough to skip the message, the body is not parsed
+            logger.debug(
+                "Task %s (%s) not executed (dead letter queue)",
+                attributes.get(WorkerTask.FUNC_ATTRIBUTE),
+                attributes[WorkerTask.ID_ATTRIBUTE],
+            )
+            return None
 
-    def execute(self, msg: str) -> Any:
         try:
-            worker_task = WorkerTask.deserialize(msg)
+            worker_task = worker_task or WorkerTask.deserialize(msg)
+            self.last_tasks = [worker_task]
         except Exception as ex:
             logger.exception("Message %s is not a valid worker task: %s", msg, ex)
 
@@ -55,12 +114,27 @@ class Worker:
                     worker_task.kwargs,
                 )
 
-                return self._execute_task(worker_task)
+                with self.circuit_breakers.guard(
+                    worker_task.limit_name
+                ), self.task_limiter.limit(worker_task.limit_name):
+                    self._set_status(worker_task.id, TaskState.STARTED)
+                    with self.time_limits.limit(*get_time_limits(worker_task.func)):
+                        result = self._execute_task(worker_task)
+
+                if not worker_task.retried:
+                    self._set_status(worker_task.id, TaskState.SUCCESS, result)
+                return result
+        except TaskDeferredException:
+            raise
+        except PartialBatchFailureException as ex:
+            return self._retry_failed_calls(worker_task, ex)
         except QueueException:
             raise
-        except MaxRetriesReachedException:
+        except MaxRetriesReachedException as ex:
+            self._set_status(worker_task.id, TaskState.FAILURE, error=repr(ex))
             raise
         except Exception as ex:
+            self._set_status(worker_task.id, TaskState.FAILURE, error=repr(ex))
             logger.exception(
                 "Task %s (%s, retry-id: %s) failed to execute with args: %s and kwargs: %s: %s",
                 worker_task.abs_func_name,
@@ -97,6 +171,359 @@ class Worker:
         )
         return self._enqueue_task(worker_task, delay, execute_inline, False, True)
 
+    @staticmethod
+    def get_batch_name(
+        msg: str, attributes: dict[str, str] | None = None
+    ) -> str | None:
+        return Worker.parse_batch_name(msg, attributes)[0]
+
+    @staticmethod
+    def parse_batch_name(
+        msg: str, attributes: dict[str, str] | None = None
+    ) -> tuple[str | None, WorkerTask | None]:
+        # messages of batch tasks with the same name can be executed together, a
+        # message parsed to find out is returned, so it isn't parsed again to execute it
+        worker_task = None
+        try:
+            if attributes and WorkerTask.FUNC_ATTRIBUTE in attributes:
+                abs_func_name = attributes[WorkerTask.FUNC_ATTRIBUTE]
+                func = WorkerTask.import_func(abs_func_name)
+            else:
+                worker_task = WorkerTask.deserialize(msg)
+                abs_func_name, func = worker_task.abs_func_name, worker_task.func
+        except Exception:  # noqa: BLE001
+            return None, worker_task
+
+        return abs_func_name if getattr(func, "batch", False) else None, worker_task
+
+    def execute_batch(
+        self, msgs: list[str], parsed_tasks: list[WorkerTask | None] | None = None
+    ) -> list[Exception | None]:
+        # returns the error of each message, or None if it was executed
+        self.last_tasks = []
+        parsed = [
+            worker_task or self._parse_task(msg)
+            for msg, worker_task in zip(msgs, parsed_tasks or [None] * len(msgs))
+        ]
+        worker_tasks = [
+            worker_task for worker_task in parsed if isinstance(worker_task, WorkerTask)
+        ]
+        self.last_tasks = worker_tasks
+
+        # an invalid message only fails itself, the other messages are executed
+        task_outcomes = iter(
+            self._execute_batch_tasks(worker_tasks) if worker_tasks else []
+        )
+        return [
+            next(task_outcomes) if isinstance(worker_task, WorkerTask) else worker_task
+            for worker_task in parsed
+        ]
+
+    @staticmethod
+    def _parse_task(msg: str) -> WorkerTask | ExecutionFailedException:
+        try:
+            return WorkerTask.deserialize(msg)
+        except Exception as ex:
+            logger.exception("Message %s is not a valid worker task: %s", msg, ex)
+            return ExecutionFailedException(
+                "invalid message", InvalidMessageFormatException(msg, ex)
+            )
+
+    @staticmethod
+    def _get_batch_calls(
+        worker_tasks: list[WorkerTask],
+    ) -> tuple[list[TaskCall], list[tuple[int, int]]]:
+        # the calls of all tasks, and the task and call index of each of them
+        calls: list[TaskCall] = []
+        positions: list[tuple[int, int]] = []
+        for task_index, worker_task in enumerate(worker_tasks):
+            for call_index, call in enumerate(
+                worker_task.calls or [TaskCall(worker_task.args, worker_task.kwargs)]
+            ):
+                calls.append(call)
+                positions.append((task_index, call_index))
+        return calls, positions
+
+    def _execute_batch_tasks(
+        self, worker_tasks: list[WorkerTask]
+    ) -> list[Exception | None]:
+        calls, positions = self._get_batch_calls(worker_tasks)
+        batch_task = worker_tasks[0].copy(False, calls)
+        batch_task.retry = max(worker_task.retry for worker_task in worker_tasks)
+
+        if settings.DEAD_LETTER_MODE:
+            logger.debug(
+                "Batch of %s tasks %s not executed (dead letter queue)",
+                len(worker_tasks),
+                batch_task.abs_func_name,
+            )
+            return [None] * len(worker_tasks)
+
+        try:
+            logger.debug(
+                "Execute batch of %s calls of task %s from %s messages",
+                len(calls),
+                batch_task.abs_func_name,
+                len(worker_tasks),
+            )
+
+            with self.circuit_breakers.guard(
+                batch_task.limit_name
+            ), self.task_limiter.limit(batch_task.limit_name):
+                for worker_task in worker_tasks:
+                    self._set_status(worker_task.id, TaskState.STARTED)
+                with self.time_limits.limit(*get_time_limits(batch_task.func)):
+                    self._execute_task(batch_task)
+        except TaskDeferredException:
+            raise
+        except PartialBatchFailureException as ex:
+            return self._retry_failed_batch_calls(worker_tasks, positions, ex)
+        except Exception as ex:
+            logger.exception(
+                "Batch of %s tasks %s failed to execute: %s",
+                len(worker_tasks),
+                batch_task.abs_func_name,
+                ex,
+            )
+            for worker_task in worker_tasks:
+                self._set_status(worker_task.id, TaskState.FAILURE, error=repr(ex))
+            return [ExecutionFailedException(batch_task.abs_func_name, ex)] * len(
+                worker_tasks
+            )
+
+        if not batch_task.retried:
+            for worker_task in worker_tasks:
+                self._set_status(worker_task.id, TaskState.SUCCESS)
+        return [None] * len(worker_tasks)
+
+    def _retry_failed_batch_calls(
+        self,
+        worker_tasks: list[WorkerTask],
+        positions: list[tuple[int, int]],
+        ex: PartialBatchFailureException,
+    ) -> list[Exception | None]:
+        # the failed calls of the batch are retried with the message they came from
+        failures: dict[int, dict[int, Exception | None]] = {}
+        for index, caught in ex.failures.items():
+            task_index, call_index = positions[index]
+            failures.setdefault(task_index, {})[call_index] = caught
+
+        outcomes: list[Exception | None] = [None] * len(worker_tasks)
+        for task_index, worker_task in enumerate(worker_tasks):
+            if task_index not in failures:
+                self._set_status(worker_task.id, TaskState.SUCCESS)
+                continue
+
+            outcomes[task_index] = self._retry_failed_task_calls(
+                worker_task, PartialBatchFailureException(failures[task_index])
+            )
+        return outcomes
+
+    def _retry_failed_task_calls(
+        self, worker_task: WorkerTask, ex: PartialBatchFailureException
+    ) -> Exception | None:
+        try:
+            self._retry_failed_calls(worker_task, ex)
+        except (ExecutionFailedException, QueueException) as task_ex:
+            return task_ex
+        return None
+
+    def _retry_failed_calls(
+        self, worker_task: WorkerTask, ex: PartialBatchFailureException
+    ) -> None:
+        calls = worker_task.calls or [TaskCall(worker_task.args, worker_task.kwargs)]
+        for index, caught in sorted(ex.failures.items()):
+            call = calls[index]
+            logger.warning(
+                "Task %s (%s, retry-id: %s) failed to execute call %s with args: %s and kwargs: %s: %r",
+                worker_task.abs_func_name,
+                worker_task.id,
+                worker_task.retry_id,
+                index,
+                call.args,
+                call.kwargs,
+                caught,
+            )
+
+        # only the failed calls are retried
+        failed_task = worker_task.copy(
+            False, [calls[index] for index in sorted(ex.failures)]
+        )
+        try:
+            self.retry(failed_task, settings.DEFAULT_DELAY, False, True)
+        except MaxRetriesReachedException as max_ex:
+            self._set_status(worker_task.id, TaskState.FAILURE, error=repr(ex))
+            raise ExecutionFailedException(worker_task.abs_func_name, ex) from max_ex
+
+    def _set_status(
+        self,
+        task_id: str,
+        state: str,
+        result: Any = None,
+        error: str | None = None,
+    ) -> None:
+        backend = get_result_backend()
+        if backend is None:
+            return
+
+        try:
+            backend.set_status(
+                task_id, TaskStatus(state, result, error), settings.RESULT_TTL_S
+            )
+        except Exception as ex:  # noqa: BLE001
+            # the result backend must not fail the task
+            logger.warning("Failed to set status of task %s: %s", task_id, ex)
+
+    def delay_many(
+        self,
+        group_id: str | None,
+        queue_name: str,
+        func: Any,
+        args_iterable: Iterable[tuple],
+        kwargs: dict,
+        max_retries: int,
+        delay: int,
+        execute_inline: bool,
+        chunk_size: int,
+        max_in_flight: int,
+        progress: Callable[[TaskMapResult], None] | None = None,
+        bulk_size: int = 1,
+        route: TaskRoute | None = None,
+    ) -> TaskMapResult:
+        # a route spreads the chunks across its shard queues
+        result = TaskMapResult()
+
+        if execute_inline:
+            for args in args_iterable:
+                self.delay(
+                    group_id, queue_name, func, args, kwargs, max_retries, delay, True
+                )
+                result.sent += 1
+            return result
+
+        # the iterable is consumed lazily, one chunk per request in flight
+        args_iterator = iter(args_iterable)
+        in_flight: dict[Future, tuple[str, int, int]] = {}
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            offset = 0
+            while True:
+                chunk = list(itertools.islice(args_iterator, chunk_size * bulk_size))
+                if not chunk:
+                    break
+
+                if len(in_flight) >= max_in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        chunk_queue, chunk_offset, count = in_flight.pop(future)
+                        self._collect_chunk(
+                            chunk_queue, future, chunk_offset, count, bulk_size, result
+                        )
+                        if progress:
+                            progress(result)
+
+                chunk_queue = route.get_queue() if route else queue_name
+                worker_tasks = [
+                    self._create_task(
+                        group_id,
+                        chunk_queue,
+                        func,
+                        chunk[start : start + bulk_size],
+                        kwargs,
+                        max_retries,
+                        bulk_size > 1,
+                    )
+                    for start in range(0, len(chunk), bulk_size)
+                ]
+                future = executor.submit(
+                    call_add_messages,
+                    self.queue_client,
+                    chunk_queue,
+                    [worker_task.serialize() for worker_task in worker_tasks],
+                    delay,
+                    [worker_task.get_attributes() for worker_task in worker_tasks]
+                    if settings.MESSAGE_ATTRIBUTES
+                    else None,
+                )
+                in_flight[future] = (chunk_queue, offset, len(chunk))
+                offset += len(chunk)
+
+            for future in list(in_flight):
+                chunk_queue, chunk_offset, count = in_flight.pop(future)
+                self._collect_chunk(
+                    chunk_queue, future, chunk_offset, count, bulk_size, result
+                )
+                if progress:
+                    progress(result)
+
+        result.failed.sort()
+        return result
+
+    @staticmethod
+    def _create_task(
+        group_id: str | None,
+        queue_name: str,
+        func: Any,
+        args_list: list[tuple],
+        kwargs: dict,
+        max_retries: int,
+        bulk: bool,
+    ) -> WorkerTask:
+        if not bulk:
+            return WorkerTask(
+                str(uuid.uuid4()),
+                group_id,
+                queue_name,
+                func,
+                args_list[0],
+                kwargs,
+                max_retries,
+                0,
+                None,
+            )
+
+        return WorkerTask(
+            str(uuid.uuid4()),
+            group_id,
+            queue_name,
+            func,
+            (),
+            {},
+            max_retries,
+            0,
+            None,
+            [TaskCall(args, kwargs) for args in args_list],
+        )
+
+    @staticmethod
+    def _collect_chunk(
+        queue_name: str,
+        future: Future,
+        offset: int,
+        count: int,
+        bulk_size: int,
+        result: TaskMapResult,
+    ) -> None:
+        try:
+            failed_msgs = future.result()
+        except QueueDoesNotExistException as ex:
+            raise InvalidQueueException(ex.queue_name) from ex
+        except QueueClientException as ex:
+            logger.warning(
+                "Failed to enqueue %s tasks to %s: %s", count, queue_name, ex
+            )
+            failed_msgs = list(range(math.ceil(count / bulk_size)))
+
+        # positions in the iterable of the tasks in the failed messages
+        failed = [
+            offset + index
+            for msg_index in failed_msgs
+            for index in range(
+                msg_index * bulk_size, min((msg_index + 1) * bulk_size, count)
+            )
+        ]
+        result.sent += count - len(failed)
+        result.failed.extend(failed)
+
     def retry(
         self,
         worker_task: WorkerTask,
@@ -104,6 +531,7 @@ class Worker:
         execute_inline: bool,
         count_retries: bool,
     ) -> Any:
+        worker_task.retried = True
         worker_task = worker_task.copy(settings.FORCE_SERIALIZATION)
         worker_task.retry_id = str(uuid.uuid4())
         return self._enqueue_task(
@@ -139,10 +567,22 @@ class Worker:
             if execute_inline:
                 return self._execute_task(worker_task)
             else:
-                self.queue_client.add_message(
-                    worker_task.queue, worker_task.serialize(), delay
+                call_add_message(
+                    self.queue_client,
+                    worker_task.queue,
+                    worker_task.serialize(),
+                    delay,
+                    worker_task.get_attributes()
+                    if settings.MESSAGE_ATTRIBUTES
+                    else None,
+                )
+
+                # tasks without status are pending
+                if is_retry:
+                    self._set_status(worker_task.id, TaskState.RETRY)
+                return (
+                    AsyncResult(worker_task.id) if get_result_backend() else None
                 )
-                return None
         except QueueDoesNotExistException as ex:
             raise InvalidQueueException(ex.queue_name) from ex
         except QueueClientException as ex:
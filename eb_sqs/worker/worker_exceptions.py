@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Iterable
+
 
 class WorkerException(Exception):  # noqa: N818
     pass
@@ -29,7 +31,40 @@ class QueueException(WorkerException):
     pass
 
 
+class SoftTimeLimitExceededException(WorkerException):
+    # raised within a task exceeding its soft time limit, so it can clean up
+    def __init__(self, time_limit_s: float) -> None:
+        super().__init__(f"Soft time limit of {time_limit_s} seconds exceeded")
+        self.time_limit_s = time_limit_s
+
+
 class InvalidQueueException(QueueException):
     def __init__(self, queue_name: str) -> None:
         super().__init__()
         self.queue_name = queue_name
+
+
+class TaskDeferredException(WorkerException):
+    def __init__(self, task_name: str, retry_after: int) -> None:
+        super().__init__()
+        self.task_name = task_name
+        self.retry_after = retry_after
+
+
+class TaskRateLimitedException(TaskDeferredException):
+    pass
+
+
+class TaskCircuitOpenException(TaskDeferredException):
+    pass
+
+
+class PartialBatchFailureException(WorkerException):
+    # raised with the indexes of the failed calls of a bulk task
+    def __init__(self, failures: dict[int, Exception | None] | Iterable[int]) -> None:
+        super().__init__()
+        self.failures: dict[int, Exception | None] = (
+            dict(failures)
+            if isinstance(failures, dict)
+            else dict.fromkeys(failures)
+        )
@@ -1,28 +1,64 @@
 from __future__ import annotations
 
-import base64
 import importlib
 import json
+import logging
+import threading
 import uuid
-from typing import Any
+from contextlib import contextmanager
+from time import time
+from typing import Any, Generator
 
 from eb_sqs import settings
+from eb_sqs.worker.worker_exceptions import (
+    MaxRetriesReachedException,
+    PartialBatchFailureException,
+)
+
+logger = logging.getLogger("eb_sqs")
+
+
+class TaskCall:
+    def __init__(self, args: tuple | list, kwargs: dict) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self) -> str:
+        return f"TaskCall(args={self.args!r}, kwargs={self.kwargs!r})"
 
 
 class WorkerTask:
+    # SQS message attributes carrying the header, so it can be read without the body
+    FUNC_ATTRIBUTE = "func"
+    ID_ATTRIBUTE = "taskId"
+    RETRY_ATTRIBUTE = "retry"
+    ENQUEUED_AT_ATTRIBUTE = "enqueuedAt"
+    ATTRIBUTE_NAMES = [
+        FUNC_ATTRIBUTE,
+        ID_ATTRIBUTE,
+        RETRY_ATTRIBUTE,
+        ENQUEUED_AT_ATTRIBUTE,
+    ]
+    # the task each thread executes by function, as execution lanes share functions
+    _EXECUTING = threading.local()
+
     def __init__(
         self,
         id: str,  # noqa: A002
         group_id: str | None,
         queue: str,
         func: Any,
-        args: tuple,
+        args: tuple | list,
         kwargs: dict,
         max_retries: int,
         retry: int,
         retry_id: str | None,
+        calls: list[TaskCall] | None = None,
     ) -> None:
         super().__init__()
+        # the encoded args, kwargs and calls of a task, decoded on first access
+        self._payload: str | None = None
+
         self.id = id
         self.group_id = group_id
         self.queue = queue
@@ -32,37 +68,191 @@ class WorkerTask:
         self.max_retries = max_retries
         self.retry = retry
         self.retry_id = retry_id
+        # a bulk task carries many calls of its function in one message
+        self.calls = calls
+        self.retried = False
 
         self.abs_func_name = f"{self.func.__module__}.{self.func.__name__}"
 
+    @property
+    def args(self) -> tuple | list:
+        self._decode_payload()
+        return self._args
+
+    @args.setter
+    def args(self, args: tuple | list) -> None:
+        self._decode_payload()
+        self._args = args
+
+    @property
+    def kwargs(self) -> dict:
+        self._decode_payload()
+        return self._kwargs
+
+    @kwargs.setter
+    def kwargs(self, kwargs: dict) -> None:
+        self._decode_payload()
+        self._kwargs = kwargs
+
+    @property
+    def calls(self) -> list[TaskCall] | None:
+        self._decode_payload()
+        return self._calls
+
+    @calls.setter
+    def calls(self, calls: list[TaskCall] | None) -> None:
+        self._decode_payload()
+        self._calls = calls
+
+    def _decode_payload(self) -> None:
+        if self._payload is None:
+            return
+
+        payload = json.loads(self._payload)
+        self._payload = None
+        self._args, self._kwargs, self._calls = WorkerTask._parse_arguments(payload)
+
+    @property
+    def limit_name(self) -> str:
+        # tasks dispatching to other functions name the limits to apply themselves
+        get_limit_name = getattr(self.func, "get_limit_name", None)
+        if get_limit_name:
+            return get_limit_name(*self.args, **self.kwargs)
+        return self.abs_func_name
+
+    @staticmethod
+    def get_executing(func: Any) -> WorkerTask | None:
+        return getattr(WorkerTask._EXECUTING, "tasks", {}).get(func)
+
+    @contextmanager
+    def _executing(self) -> Generator[None, None, None]:
+        tasks = getattr(WorkerTask._EXECUTING, "tasks", None)
+        if tasks is None:
+            tasks = WorkerTask._EXECUTING.tasks = {}
+
+        # tasks retried inline are executed within the task
+        previous_task = tasks.get(self.func)
+        tasks[self.func] = self
+        try:
+            yield
+        finally:
+            if previous_task is None:
+                del tasks[self.func]
+            else:
+                tasks[self.func] = previous_task
+
     def execute(self) -> Any:
-        from eb_sqs.decorators import func_retry_decorator
+        from eb_sqs.decorators import func_executing_retry_decorator
 
         self.func.retry_num = self.retry
-        self.func.retry = func_retry_decorator(worker_task=self)
-        return self.func(*self.args, **self.kwargs)
+        if not hasattr(self.func, "get_retry_num"):
+            # functions enqueued without the task decorator
+            self.func.retry = func_executing_retry_decorator(self.func)
 
-    def serialize(self) -> str:
-        args = self.args
-        kwargs = self.kwargs
+        with self._executing():
+            if getattr(self.func, "batch", False):
+                return self.func(
+                    self.calls
+                    if self.calls is not None
+                    else [TaskCall(self.args, self.kwargs)]
+                )
+
+            if self.calls is None:
+                return self.func(*self.args, **self.kwargs)
+
+            return self._execute_calls()
 
-        task = {
+    def _execute_calls(self) -> list:
+        results: list = []
+        failures: dict[int, Exception | None] = {}
+        for index, call in enumerate(self.calls or []):
+            # retrying within the function only retries its own call
+            call_task = self.copy(False, [call])
+            try:
+                with call_task._executing():
+                    results.append(self.func(*call.args, **call.kwargs))
+            except MaxRetriesReachedException as ex:
+                logger.warning(
+                    "Task %s (%s) call %s reached max retries (%s)",
+                    self.abs_func_name,
+                    self.id,
+                    index,
+                    ex.retries,
+                )
+                results.append(None)
+            except Exception as ex:  # noqa: BLE001
+                failures[index] = ex
+                results.append(None)
+            finally:
+                # the task isn't successful while one of its calls is retried
+                self.retried = self.retried or call_task.retried
+
+        if failures:
+            raise PartialBatchFailureException(failures)
+
+        return results
+
+    def serialize(self) -> str:
+        task: dict[str, Any] = {
             "id": self.id,
             "groupId": self.group_id,
             "queue": self.queue,
             "func": self.abs_func_name,
-            "args": args,
-            "kwargs": kwargs,
             "maxRetries": self.max_retries,
             "retry": self.retry,
             "retryId": self.retry_id,
         }
 
+        if self._payload is not None:
+            # arguments which were never decoded are passed on as they are
+            task["payload"] = self._payload
+        elif settings.LAZY_PAYLOAD:
+            task["payload"] = json.dumps(self._get_arguments())
+        else:
+            task.update(self._get_arguments())
+
         return json.dumps(task)
 
-    def copy(self, use_serialization: bool) -> WorkerTask:
+    def get_attributes(self) -> dict[str, str | int | float]:
+        return {
+            self.FUNC_ATTRIBUTE: self.abs_func_name,
+            self.ID_ATTRIBUTE: self.id,
+            self.RETRY_ATTRIBUTE: self.retry,
+            self.ENQUEUED_AT_ATTRIBUTE: round(time(), 3),
+        }
+
+    def _get_arguments(self) -> dict[str, Any]:
+        arguments: dict[str, Any] = {"args": self.args, "kwargs": self.kwargs}
+        if self.calls is not None:
+            arguments["calls"] = [
+                {"args": call.args, "kwargs": call.kwargs} for call in self.calls
+            ]
+        return arguments
+
+    def copy(
+        self, use_serialization: bool, calls: list[TaskCall] | None = None
+    ) -> WorkerTask:
+        if calls is not None:
+            worker_task = self.copy(False)
+            worker_task.calls = calls
+            return worker_task.copy(use_serialization)
+
         if use_serialization:
             return WorkerTask.deserialize(self.serialize())
+        elif self._payload is not None:
+            worker_task = WorkerTask(
+                self.id,
+                self.group_id,
+                self.queue,
+                self.func,
+                [],
+                {},
+                self.max_retries,
+                self.retry,
+                self.retry_id,
+            )
+            worker_task._payload = self._payload
+            return worker_task
         else:
             return WorkerTask(
                 self.id,
@@ -74,6 +264,7 @@ class WorkerTask:
                 self.max_retries,
                 self.retry,
                 self.retry_id,
+                self.calls,
             )
 
     @staticmethod
@@ -83,24 +274,25 @@ class WorkerTask:
         id = task.get("id", str(uuid.uuid4()))  # noqa: A001
         group_id = task.get("groupId")
 
-        abs_func_name = task["func"]
-        func_name = abs_func_name.split(".")[-1]
-        func_path = ".".join(abs_func_name.split(".")[:-1])
-        func_module = importlib.import_module(func_path)
-
-        func = getattr(func_module, func_name)
+        func = WorkerTask.import_func(task["func"])
 
         queue = task.get("queue", settings.DEFAULT_QUEUE)
 
-        task_args = task.get("args", [])
-        args = task_args
-
-        kwargs = task["kwargs"]
-
         max_retries = task.get("maxRetries", settings.DEFAULT_MAX_RETRIES)
         retry = task.get("retry", 0)
         retry_id = task.get("retryId")
 
+        payload = task.get("payload")
+        if payload is not None:
+            # the arguments are only decoded if the task is executed
+            worker_task = WorkerTask(
+                id, group_id, queue, func, [], {}, max_retries, retry, retry_id
+            )
+            worker_task._payload = payload
+            return worker_task
+
+        args, kwargs, calls = WorkerTask._parse_arguments(task)
+
         return WorkerTask(
             id,
             group_id,
@@ -111,4 +303,29 @@ class WorkerTask:
             max_retries,
             retry,
             retry_id,
+            calls,
+        )
+
+    @staticmethod
+    def import_func(abs_func_name: str) -> Any:
+        func_name = abs_func_name.split(".")[-1]
+        func_path = ".".join(abs_func_name.split(".")[:-1])
+        func_module = importlib.import_module(func_path)
+
+        return getattr(func_module, func_name)
+
+    @staticmethod
+    def _parse_arguments(
+        task: dict,
+    ) -> tuple[list, dict, list[TaskCall] | None]:
+        args = task.get("args", [])
+        kwargs = task["kwargs"]
+        calls = (
+            [
+                TaskCall(call.get("args", []), call.get("kwargs", {}))
+                for call in task["calls"]
+            ]
+            if task.get("calls") is not None
+            else None
         )
+        return args, kwargs, calls